@@ -2,7 +2,12 @@ import streamlit as st
 import os
 import sys
 import datetime
+import html
 import json
+import inspect
+import uuid
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 # Add the project root to the path so we can import modules
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -11,10 +16,94 @@ sys.path.append(parent_dir)
 
 # Import modules (use relative imports)
 try:
-    from utils.data_utils import load_sample_data, save_data
+    from utils.data_utils import load_sample_data, save_data, paginate_frame
+    from utils.project_store import ProjectConflictError
+    from utils.resources import get_resource_frame, query_resources, resource_cards_html, BAND_OVER, UTILIZATION_BANDS
+    from utils.visualization import create_resource_allocation_chart
+    from utils.render_cache import prerender_project, rendered_assets
+    from utils.metrics import get_dashboard_metrics
+    from utils.milestones import get_milestone_frame, query_milestones, milestone_table_html, MILESTONE_STATUSES
+    from utils.llm_client import build_messages, stream_chat
+    from utils.response_cache import get_response_cache
+    from utils.knowledge_index import get_knowledge_index
+    from utils.context_builder import build_project_context
+    from utils.chat_history import get_chat_history
+    from utils.llm_pool import INSIGHT_KINDS, get_insight_store, run_insight_batch
+    from utils.tracing import TRACING_ENABLED, SpanStats, export_jsonl, process_stats, set_session_resolver, span, traced
+    from utils.session_memory import check_session, memory_registry
+    from utils.warmup import start_warmup, warmup_status
+    from utils.analytics import get_analytics_worker
+    from utils.api_server import start_api_server
+    from utils.activity_log import append_activity, get_activity_log
+    from utils.project_search import SEARCH_KINDS, get_project_search, snippet
 except ImportError:
     # Also try to import from local directory (for cloud deployment)
-    from utils.data_utils import load_sample_data, save_data
+    from utils.data_utils import load_sample_data, save_data, paginate_frame
+    from utils.project_store import ProjectConflictError
+    from utils.resources import get_resource_frame, query_resources, resource_cards_html, BAND_OVER, UTILIZATION_BANDS
+    from utils.visualization import create_resource_allocation_chart
+    from utils.render_cache import prerender_project, rendered_assets
+    from utils.metrics import get_dashboard_metrics
+    from utils.milestones import get_milestone_frame, query_milestones, milestone_table_html, MILESTONE_STATUSES
+    from utils.llm_client import build_messages, stream_chat
+    from utils.response_cache import get_response_cache
+    from utils.knowledge_index import get_knowledge_index
+    from utils.context_builder import build_project_context
+    from utils.chat_history import get_chat_history
+    from utils.llm_pool import INSIGHT_KINDS, get_insight_store, run_insight_batch
+    from utils.tracing import TRACING_ENABLED, SpanStats, export_jsonl, process_stats, set_session_resolver, span, traced
+    from utils.session_memory import check_session, memory_registry
+    from utils.warmup import start_warmup, warmup_status
+    from utils.analytics import get_analytics_worker
+    from utils.api_server import start_api_server
+    from utils.activity_log import append_activity, get_activity_log
+    from utils.project_search import SEARCH_KINDS, get_project_search, snippet
+
+# Number of resources shown per page on the Resource Status tab
+RESOURCE_PAGE_SIZE = 30
+
+# Number of milestones shown per page on the Key Milestones tab
+MILESTONE_PAGE_SIZE = 25
+
+# Due-date filters of the milestone table as (min, max) days remaining
+MILESTONE_DUE_WINDOWS = {
+    "Any time": None,
+    "Past due date": (None, -1),
+    "Next 7 days": (0, 7),
+    "Next 30 days": (0, 30),
+    "Next 90 days": (0, 90),
+}
+
+# Period filters of the activity history in days back from today
+ACTIVITY_PERIODS = {
+    "All time": None,
+    "Last 7 days": 7,
+    "Last 30 days": 30,
+    "Last 90 days": 90,
+}
+
+# Number of search results shown per page
+SEARCH_PAGE_SIZE = 20
+
+# Number of chat messages rendered at first and added per "Load older messages" click
+CHAT_PAGE_SIZE = 20
+
+CHAT_GREETING = "Hello! I'm your AI PM Assistant. What can I help you with today? You can ask me about project management concepts, request analysis on your current project, or get help drafting project documents."
+
+DASHBOARD_TABS = ["Overview", "Key Milestones", "Resource Status", "AI Insight Summary"]
+
+# Fragments rerun only their own function when a widget inside them changes
+# (st.fragment was st.experimental_fragment before Streamlit 1.37)
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+# Streamlit versions whose st.tabs reports the open tab (via key/on_change)
+LAZY_TABS_SUPPORTED = "on_change" in inspect.signature(st.tabs).parameters
+
+# Build the shared caches in the background, once per process
+start_warmup()
+
+# Serve the read-only JSON API alongside the app when API_PORT is set
+start_api_server()
 
 # Set page config
 st.set_page_config(
@@ -97,17 +186,79 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def render_pager(key, total_items, page_size):
+    """
+    Render a compact pager and return the selected 1-based page number.
+    
+    Args:
+        key: Widget key for the page selector
+        total_items: Number of items being paged
+        page_size: Items per page
+        
+    Returns:
+        int: Selected page number
+    """
+    page_count = max(1, -(-total_items // page_size))
+    if page_count == 1:
+        return 1
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page = st.number_input(
+            f"Page (of {page_count})",
+            min_value=1,
+            max_value=page_count,
+            value=1,
+            step=1,
+            key=key
+        )
+    with col2:
+        first = (page - 1) * page_size + 1
+        last = min(total_items, page * page_size)
+        st.caption(f"Showing {first}-{last} of {total_items}")
+    return page
+
+def render_lazy_tabs(labels, renderers, key):
+    """
+    Render tabs, running only the renderer of the open tab.
+    
+    Plain st.tabs runs the body of every tab on each rerun. Here the tab
+    widget reruns the app when the user switches tabs and only the open tab's
+    renderer is called. Older Streamlit versions fall back to a horizontal
+    selector with the same behavior.
+    
+    Args:
+        labels: Tab labels
+        renderers: One callable per tab that renders its content
+        key: Widget key holding the open tab
+    """
+    if LAZY_TABS_SUPPORTED:
+        tabs = st.tabs(labels, key=key, on_change="rerun")
+        for tab, render in zip(tabs, renderers):
+            if tab.open:
+                with tab:
+                    render()
+    else:
+        selected = st.radio(key, options=labels, horizontal=True, key=key, label_visibility="collapsed")
+        renderers[labels.index(selected)]()
+
 def show_dashboard():
     """Display the main dashboard with project overview."""
     
-    # Load sample data if not in session state
-    if 'project_data' not in st.session_state:
-        st.session_state.project_data = load_sample_data()
-        save_data(st.session_state.project_data)
-    
-    project_data = st.session_state.project_data
-    current_project = project_data["selected_project"]
-    project = project_data["projects"][current_project]
+    with span("dashboard.load_data"):
+        # Load sample data if not in session state
+        if 'project_data' not in st.session_state:
+            st.session_state.project_data = load_sample_data()
+            save_data(st.session_state.project_data)
+            # Pre-render static chart assets for exports in the background
+            for loaded_project in st.session_state.project_data.projects.values():
+                prerender_project(loaded_project)
+        
+        project_data = st.session_state.project_data
+        # Pick up projects saved by other sessions since the last rerun
+        project_data.refresh()
+        current_project = project_data.selected_project
+        project = project_data.project(current_project)
     
     st.title(f"📊 AI PM Buddy v2.0")
     
@@ -116,335 +267,468 @@ def show_dashboard():
     with col1:
         selected_project = st.selectbox(
             "Project",
-            options=list(project_data["projects"].keys()),
-            index=list(project_data["projects"].keys()).index(current_project)
+            options=list(project_data.projects.keys()),
+            index=list(project_data.projects.keys()).index(current_project)
         )
         if selected_project != current_project:
-            project_data["selected_project"] = selected_project
-            save_data(project_data)
+            # The selection belongs to this session; the projects stay shared
+            project_data.selected_project = selected_project
+            prerender_project(project_data.project(selected_project))
             # Force a rerun to update the UI
             st.rerun()
     
-    # Project status and metrics
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.markdown(f"""
-            <div class="metric-container">
-                <p class="metric-value">{project['progress']}%</p>
-                <p class="metric-label">Progress</p>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    with col2:
-        # Days remaining
-        today = datetime.datetime.now().date()
-        end_date = datetime.datetime.strptime(project['end_date'], "%Y-%m-%d").date()
-        days_remaining = (end_date - today).days
-        
-        status_color = "status-on-track"
-        if days_remaining < 0:
-            status_color = "status-delayed"
-        elif days_remaining < 14:
-            status_color = "status-at-risk"
-            
-        st.markdown(f"""
-            <div class="metric-container">
-                <p class="metric-value {status_color}">{days_remaining}</p>
-                <p class="metric-label">Days Remaining</p>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    with col3:
-        # Calculate tasks completed
-        total_tasks = len(project['wbs'])
-        completed_tasks = len([t for t in project['wbs'] if t['progress'] == 100])
-        
-        st.markdown(f"""
-            <div class="metric-container">
-                <p class="metric-value">{completed_tasks}/{total_tasks}</p>
-                <p class="metric-label">Tasks Completed</p>
-            </div>
-            """, unsafe_allow_html=True)
+    # All dashboard metrics, memoized by project version and date
+    with span("dashboard.metrics"):
+        metrics = get_dashboard_metrics(project)
     
-    with col4:
-        # Calculate risks
-        high_risks = len([r for r in project['raid']['risks'] if r['severity'] == 'High'])
-        
-        risk_color = "status-on-track"
-        if high_risks > 3:
-            risk_color = "status-delayed"
-        elif high_risks > 1:
-            risk_color = "status-at-risk"
-            
-        st.markdown(f"""
-            <div class="metric-container">
-                <p class="metric-value {risk_color}">{high_risks}</p>
-                <p class="metric-label">High Risks</p>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    # Dashboard tabs
-    tabs = st.tabs(["Overview", "Key Milestones", "Resource Status", "AI Insight Summary"])
-    
-    with tabs[0]:  # Overview
-        col1, col2 = st.columns([2, 1])
+    # Project status and metrics
+    with span("dashboard.header_html"):
+        col1, col2, col3, col4 = st.columns(4)
         with col1:
-            # Project health indicators
-            st.subheader("Project Health")
-            health_col1, health_col2, health_col3, health_col4 = st.columns(4)
-            
-            with health_col1:
-                schedule_status = "On Track"
-                schedule_color = "status-on-track"
-                if days_remaining < 0:
-                    schedule_status = "Delayed"
-                    schedule_color = "status-delayed"
-                elif project['progress'] < 50 and project['elapsed_pct'] > 60:
-                    schedule_status = "At Risk"
-                    schedule_color = "status-at-risk"
-                
-                st.markdown(f"""
-                <div class="card">
-                    <h4>Schedule</h4>
-                    <h2 class="{schedule_color}">{schedule_status}</h2>
+            st.markdown(f"""
+                <div class="metric-container">
+                    <p class="metric-value">{metrics['progress']}%</p>
+                    <p class="metric-label">Progress</p>
                 </div>
                 """, unsafe_allow_html=True)
-            
-            with health_col2:
-                budget_status = "On Track"
-                budget_color = "status-on-track"
-                if project['budget_spent_pct'] > project['progress'] + 15:
-                    budget_status = "Over Budget"
-                    budget_color = "status-delayed"
-                elif project['budget_spent_pct'] > project['progress'] + 5:
-                    budget_status = "At Risk"
-                    budget_color = "status-at-risk"
-                
-                st.markdown(f"""
-                <div class="card">
-                    <h4>Budget</h4>
-                    <h2 class="{budget_color}">{budget_status}</h2>
+        
+        with col2:
+            st.markdown(f"""
+                <div class="metric-container">
+                    <p class="metric-value {metrics['days_remaining_class']}">{metrics['days_remaining']}</p>
+                    <p class="metric-label">Days Remaining</p>
                 </div>
                 """, unsafe_allow_html=True)
-            
-            with health_col3:
-                scope_status = "On Track"
-                scope_color = "status-on-track"
-                if len(project.get('scope_changes', [])) > 5:
-                    scope_status = "Significant Changes"
-                    scope_color = "status-delayed"
-                elif len(project.get('scope_changes', [])) > 2:
-                    scope_status = "Minor Changes"
-                    scope_color = "status-at-risk"
-                
-                st.markdown(f"""
-                <div class="card">
-                    <h4>Scope</h4>
-                    <h2 class="{scope_color}">{scope_status}</h2>
+        
+        with col3:
+            st.markdown(f"""
+                <div class="metric-container">
+                    <p class="metric-value">{metrics['completed_tasks']}/{metrics['total_tasks']}</p>
+                    <p class="metric-label">Tasks Completed</p>
                 </div>
                 """, unsafe_allow_html=True)
-            
-            with health_col4:
-                quality_status = "High"
-                quality_color = "status-on-track"
-                if len(project.get('defects', [])) > 10:
-                    quality_status = "Low"
-                    quality_color = "status-delayed"
-                elif len(project.get('defects', [])) > 5:
-                    quality_status = "Medium"
-                    quality_color = "status-at-risk"
-                
-                st.markdown(f"""
-                <div class="card">
-                    <h4>Quality</h4>
-                    <h2 class="{quality_color}">{quality_status}</h2>
+        
+        with col4:
+            st.markdown(f"""
+                <div class="metric-container">
+                    <p class="metric-value {metrics['high_risk_class']}">{metrics['high_risk_count']}</p>
+                    <p class="metric-label">High Risks</p>
                 </div>
                 """, unsafe_allow_html=True)
-            
-            # Recent activities
-            st.subheader("Recent Activities")
-            if 'activities' in project:
-                for activity in project['activities'][:5]:  # Show latest 5 activities
-                    st.markdown(f"""
-                    <div class="info-panel">
-                        <strong>{activity['date']}</strong> - {activity['description']}
-                    </div>
-                    """, unsafe_allow_html=True)
-            else:
-                st.info("No recent activities recorded.")
-        
-        with col2:
-            # Key risks
-            st.subheader("Top Risks")
-            if 'raid' in project and 'risks' in project['raid']:
-                high_risks = [r for r in project['raid']['risks'] if r['severity'] == 'High']
-                if high_risks:
-                    for risk in high_risks[:3]:  # Show top 3 high risks
-                        st.markdown(f"""
-                        <div class="card">
-                            <h4>{risk['title']}</h4>
-                            <p><strong>Impact:</strong> {risk['impact']}</p>
-                            <p><strong>Mitigation:</strong> {risk['mitigation'] if risk['mitigation'] else "Not defined"}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                else:
-                    st.info("No high risks identified.")
-            else:
-                st.info("No risks defined.")
-                
-            # OpenAI API Check
-            st.subheader("OpenAI API Status")
-            openai_key = os.environ.get("OPENAI_API_KEY", "")
-            if openai_key:
+    
+    # Dashboard tabs; only the open tab is computed and rendered
+    render_lazy_tabs(
+        DASHBOARD_TABS,
+        [
+            lambda: render_overview_tab(project, metrics),
+            lambda: render_milestones_tab(project),
+            lambda: render_resources_tab(project),
+            lambda: render_insights_tab(project),
+        ],
+        key="dashboard_tab"
+    )
+
+@fragment
+@traced("dashboard.tab.overview")
+def render_overview_tab(project, metrics):
+    """Render the Overview tab: health indicators, activities and top risks."""
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        # Project health indicators
+        st.subheader("Project Health")
+        health_cols = st.columns(4)
+    
+        for health_col, (indicator, (status, status_class)) in zip(health_cols, metrics['health'].items()):
+            with health_col:
                 st.markdown(f"""
                 <div class="card">
-                    <h4 class="status-on-track">✅ OpenAI API Configured</h4>
-                    <p>AI features are available</p>
+                    <h4>{indicator}</h4>
+                    <h2 class="{status_class}">{status}</h2>
                 </div>
                 """, unsafe_allow_html=True)
+    
+        # Schedule and cost analytics are computed by the background worker;
+        # show the latest published results instead of waiting for them
+        analytics = get_analytics_worker().results(project)
+        if analytics is None:
+            st.caption("Schedule and cost analytics are being computed...")
+        else:
+            results = analytics["results"]
+            schedule = results["critical_path"]
+            earned = results["earned_value"]
+            forecast = results["forecast"]
+            ratios = ", ".join(
+                f"{label} {earned[key]:.2f}" for label, key in (("SPI", "spi"), ("CPI", "cpi")) if earned[key] is not None
+            )
+            st.caption(
+                f"Critical path: {len(schedule['critical'])} of {len(schedule['tasks'])} tasks, "
+                f"{schedule['duration']} days. {ratios}"
+                + (f", EAC ${earned['eac']:,.0f}" if earned["eac"] is not None else "") + ". "
+                f"Forecast finish: {forecast['p50']} (P50), {forecast['p80']} (P80); "
+                f"{forecast['on_time_probability']:.0%} chance of finishing by the end date"
+                + ("" if analytics["current"] else " (updating)")
+            )
+    
+        # Recent activities, newest first; older pages are read from the
+        # time-indexed log on demand
+        st.subheader("Recent Activities")
+        activity_log = get_activity_log(project)
+        if len(activity_log):
+            author = None
+            authors = activity_log.authors()
+            filter_col1, filter_col2 = st.columns(2)
+            if authors:
+                with filter_col1:
+                    author = st.selectbox("Author", ["All"] + authors, key="activity_author")
+                    author = None if author == "All" else author
+            with filter_col2:
+                period = st.selectbox("Period", list(ACTIVITY_PERIODS), key="activity_period")
+            days = ACTIVITY_PERIODS[period]
+            if days is None:
+                total = activity_log.count(author)
+            else:
+                start = (datetime.datetime.now().date() - datetime.timedelta(days=days)).isoformat()
+                in_period = activity_log.between(start=start, author=author)
+                total = len(in_period)
+            page = render_pager("activity_page", total, 5)
+            offset = (page - 1) * 5
+            if days is None:
+                shown = activity_log.latest(5, offset=offset, author=author)
             else:
+                shown = in_period[offset:offset + 5]
+            for activity in shown:
+                by = f" <em>({html.escape(activity['author'])})</em>" if activity.get('author') else ""
                 st.markdown(f"""
-                <div class="card">
-                    <h4 class="status-delayed">❌ OpenAI API Not Configured</h4>
-                    <p>Add your OpenAI API key in the Settings tab to enable AI features</p>
+                <div class="info-panel">
+                    <strong>{html.escape(activity['date'])}</strong> - {html.escape(activity['description'])}{by}
                 </div>
                 """, unsafe_allow_html=True)
-    
-    with tabs[1]:  # Key Milestones
-        st.subheader("Project Milestones")
-        
-        # Extract milestones from WBS
-        milestones = [task for task in project['wbs'] if task.get('milestone', False)]
+        else:
+            st.info("No recent activities recorded.")
         
-        if milestones:
-            # Create a table
-            milestone_data = []
-            for ms in milestones:
-                status_class = ""
-                if ms['progress'] == 100:
-                    status = "Completed"
-                    status_class = "status-completed"
+        # New activities are published to all sessions right away
+        with st.form("log_activity", clear_on_submit=True):
+            description = st.text_input("New activity", key="new_activity_description")
+            new_author = st.text_input("Author", key="new_activity_author")
+            if st.form_submit_button("Log activity") and description.strip():
+                project_data = st.session_state.project_data
+                activity = {"date": datetime.datetime.now().date().isoformat(), "description": description.strip()}
+                if new_author.strip():
+                    activity["author"] = new_author.strip()
+                append_activity(project_data, activity, project["name"])
+                try:
+                    save_data(project_data)
+                except ProjectConflictError as error:
+                    project_data.discard(project["name"])
+                    st.error(f"{error}. Please log the activity again.")
                 else:
-                    # Calculate if milestone is delayed
-                    end_date = datetime.datetime.strptime(ms['end_date'], "%Y-%m-%d").date()
-                    if end_date < today and ms['progress'] < 100:
-                        status = "Delayed"
-                        status_class = "status-delayed"
-                    elif (end_date - today).days <= 7 and ms['progress'] < 100:
-                        status = "At Risk"
-                        status_class = "status-at-risk"
-                    else:
-                        status = "On Track"
-                        status_class = "status-on-track"
-                
-                milestone_data.append({
-                    "Name": ms['task'],
-                    "Due Date": ms['end_date'],
-                    "Owner": ms['assigned_to'],
-                    "Progress": f"{ms['progress']}%",
-                    "Status": f'<span class="{status_class}">{status}</span>'
-                })
-            
-            # Create the table with custom formatting
-            milestone_html = '<table style="width:100%">'
-            milestone_html += '<tr><th>Name</th><th>Due Date</th><th>Owner</th><th>Progress</th><th>Status</th></tr>'
-            
-            for ms in milestone_data:
-                milestone_html += f'<tr>'
-                milestone_html += f'<td>{ms["Name"]}</td>'
-                milestone_html += f'<td>{ms["Due Date"]}</td>'
-                milestone_html += f'<td>{ms["Owner"]}</td>'
-                milestone_html += f'<td>{ms["Progress"]}</td>'
-                milestone_html += f'<td>{ms["Status"]}</td>'
-                milestone_html += f'</tr>'
-            
-            milestone_html += '</table>'
-            
-            st.markdown(milestone_html, unsafe_allow_html=True)
-        else:
-            st.info("No milestones defined in the project.")
+                    st.rerun()
     
-    with tabs[2]:  # Resource Status
-        st.subheader("Team Resources")
-        
-        team_resources = project.get('resources', [])
-        if team_resources:
-            # Create columns for resource cards
-            cols = st.columns(3)
-            
-            for i, resource in enumerate(team_resources):
-                utilization = resource['allocated'] / resource['availability'] * 100
-                
-                # Determine utilization status
-                util_status = "status-on-track"
-                if utilization > 100:
-                    util_status = "status-delayed"
-                elif utilization > 90:
-                    util_status = "status-at-risk"
-                
-                # Create a card for each resource
-                with cols[i % 3]:
+    with col2:
+        # Key risks
+        st.subheader("Top Risks")
+        if 'raid' in project and 'risks' in project['raid']:
+            high_risks = metrics['high_risks']
+            if high_risks:
+                for risk in high_risks[:3]:  # Show top 3 high risks
                     st.markdown(f"""
                     <div class="card">
-                        <h3>{resource['name']}</h3>
-                        <p><strong>Role:</strong> {resource['role']}</p>
-                        <p><strong>Utilization:</strong> <span class="{util_status}">{utilization:.0f}%</span></p>
-                        <div style="background-color: #f0f0f0; height: 10px; border-radius: 5px; margin-top: 10px;">
-                            <div style="background-color: {'#F44336' if utilization > 100 else '#4CAF50'}; width: {min(100, utilization)}%; height: 10px; border-radius: 5px;"></div>
-                        </div>
-                        <p><strong>Allocated:</strong> {resource['allocated']} hrs / <strong>Available:</strong> {resource['availability']} hrs</p>
+                        <h4>{risk['title']}</h4>
+                        <p><strong>Impact:</strong> {risk['impact']}</p>
+                        <p><strong>Mitigation:</strong> {risk['mitigation'] if risk['mitigation'] else "Not defined"}</p>
                     </div>
                     """, unsafe_allow_html=True)
+            else:
+                st.info("No high risks identified.")
         else:
-            st.info("No resource information available.")
-    
-    with tabs[3]:  # AI Insight Summary
-        st.subheader("AI Project Insights")
-        
-        # Check if OpenAI API is configured
+            st.info("No risks defined.")
+    
+        # Pre-rendered charts for status packs
+        chart_assets = rendered_assets(project)
+        if chart_assets:
+            with st.expander("Status Pack Charts"):
+                for chart_name, path in chart_assets.items():
+                    st.image(path, caption=chart_name.replace("_", " ").title(), width="stretch")
+                    with open(path, "rb") as f:
+                        st.download_button(
+                            "Download",
+                            data=f.read(),
+                            file_name=f"{project['name']} - {chart_name}.png",
+                            mime="image/png",
+                            key=f"download_{chart_name}"
+                        )
+    
+        # OpenAI API Check
+        st.subheader("OpenAI API Status")
         openai_key = os.environ.get("OPENAI_API_KEY", "")
-        if not openai_key:
-            st.warning("OpenAI API key not configured. Please add your API key to use AI insights.")
-            st.markdown("""
-            To configure the OpenAI API key:
-            1. Create an account at [OpenAI](https://platform.openai.com)
-            2. Generate an API key
-            3. Add it to your environment variables or .env file
-            """)
+        if openai_key:
+            st.markdown(f"""
+            <div class="card">
+                <h4 class="status-on-track">✅ OpenAI API Configured</h4>
+                <p>AI features are available</p>
+            </div>
+            """, unsafe_allow_html=True)
         else:
-            # Placeholder for AI insights
-            st.markdown("""
-            <div class="info-panel">
-                <h4>Schedule Risk Analysis</h4>
-                <p>Based on current progress and resource allocation, there's a moderate risk of schedule slippage in the Implementation phase. Consider reviewing task assignments for team members with high utilization.</p>
+            st.markdown(f"""
+            <div class="card">
+                <h4 class="status-delayed">❌ OpenAI API Not Configured</h4>
+                <p>Add your OpenAI API key in the Settings tab to enable AI features</p>
             </div>
+            """, unsafe_allow_html=True)
+
+@fragment
+@traced("dashboard.tab.milestones")
+def render_milestones_tab(project):
+    """Render the Key Milestones tab."""
+    
+    st.subheader("Project Milestones")
+    
+    milestones_df = get_milestone_frame(project)
+    
+    if not milestones_df.empty:
+        # Server-side filtering and sorting
+        filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
+        with filter_col1:
+            statuses = st.multiselect("Status", options=MILESTONE_STATUSES, key="milestone_statuses")
+        with filter_col2:
+            owners = st.multiselect("Owner", options=sorted(milestones_df["Owner"].unique()), key="milestone_owners")
+        with filter_col3:
+            due_window = st.selectbox("Due", options=list(MILESTONE_DUE_WINDOWS), key="milestone_due")
+        with filter_col4:
+            sort_by = st.selectbox("Sort by", options=["Due Date", "Status", "Name", "Owner", "Progress"], key="milestone_sort")
+        
+        filtered = query_milestones(
+            milestones_df,
+            statuses=statuses,
+            owners=owners,
+            due_within=MILESTONE_DUE_WINDOWS[due_window],
+            sort_by=sort_by
+        )
+        
+        if filtered.empty:
+            st.info("No milestones match the selected filters.")
+        else:
+            # Only the visible page is serialized
+            page = render_pager("milestone_page", len(filtered), MILESTONE_PAGE_SIZE)
+            page_df, page, _ = paginate_frame(filtered, page, MILESTONE_PAGE_SIZE)
+            st.markdown(milestone_table_html(page_df), unsafe_allow_html=True)
+    else:
+        st.info("No milestones defined in the project.")
+
+@fragment
+@traced("dashboard.tab.resources")
+def render_resources_tab(project):
+    """Render the Resource Status tab."""
+    
+    st.subheader("Team Resources")
+    
+    resources_df = get_resource_frame(project)
+    if not resources_df.empty:
+        # Server-side search, filtering and sorting
+        filter_col1, filter_col2, filter_col3, filter_col4 = st.columns([2, 2, 2, 1])
+        with filter_col1:
+            search = st.text_input("Search", placeholder="Name, role or skill", key="resource_search")
+        with filter_col2:
+            roles = st.multiselect("Role", options=sorted(resources_df["Role"].unique()), key="resource_roles")
+        with filter_col3:
+            bands = st.multiselect("Utilization", options=UTILIZATION_BANDS, key="resource_bands")
+        with filter_col4:
+            sort_order = st.selectbox("Sort", options=["Highest utilization", "Lowest utilization", "Name"], key="resource_sort")
+        
+        if sort_order == "Name":
+            filtered = query_resources(resources_df, roles, bands, search, sort_by="Name", ascending=True)
+        else:
+            filtered = query_resources(resources_df, roles, bands, search, ascending=sort_order == "Lowest utilization")
+        
+        if filtered.empty:
+            st.info("No resources match the selected filters.")
+        else:
+            page = render_pager("resource_page", len(filtered), RESOURCE_PAGE_SIZE)
+            page_df, page, _ = paginate_frame(filtered, page, RESOURCE_PAGE_SIZE)
             
-            <div class="info-panel">
-                <h4>Budget Forecast</h4>
-                <p>Current spending rate suggests the project may exceed budget by approximately 8% if current trends continue. Early cost-control measures are recommended.</p>
-            </div>
+            st.plotly_chart(create_resource_allocation_chart(page_df), width="stretch")
             
+            # One payload for the whole page of resource cards
+            st.markdown(resource_cards_html(page_df), unsafe_allow_html=True)
+    else:
+        st.info("No resource information available.")
+
+@fragment
+@traced("dashboard.tab.insights")
+def render_insights_tab(project):
+    """Render the AI Insight Summary tab from the stored insights of the project."""
+    
+    st.subheader("AI Project Insights")
+    
+    # Check if OpenAI API is configured
+    openai_key = os.environ.get("OPENAI_API_KEY", "")
+    if not openai_key:
+        st.warning("OpenAI API key not configured. Please add your API key to use AI insights.")
+        st.markdown("""
+        To configure the OpenAI API key:
+        1. Create an account at [OpenAI](https://platform.openai.com)
+        2. Generate an API key
+        3. Add it to your environment variables or .env file
+        """)
+    else:
+        # Insights of every project are generated concurrently and stored
+        if st.button("Generate insights for all projects", key="generate_insights"):
+            projects = list(st.session_state.project_data.projects.values())
+            with st.spinner(f"Generating insights for {len(projects)} projects..."):
+                batch = run_insight_batch(projects)
+            failed = [
+                f"{name} ({kind})"
+                for name, results in batch["insights"].items()
+                for kind, result in results.items() if "error" in result
+            ]
+            if failed:
+                st.warning(f"Some insights could not be generated: {', '.join(failed)}")
+            st.caption(
+                f"Generated in {batch['elapsed_s']:.1f} s with {batch['stats']['requests']} requests "
+                f"({batch['stats']['retries']} retries)"
+            )
+    
+        insights = get_insight_store().get(project)
+        if not insights:
+            st.info("No insights have been generated for this project yet.")
+        for kind, (title, _) in INSIGHT_KINDS.items():
+            insight = insights.get(kind)
+            if insight is None:
+                continue
+            generated = datetime.datetime.fromtimestamp(insight["generated"]).strftime("%Y-%m-%d %H:%M")
+            note = "" if insight["current"] else " (project data has changed since)"
+            st.markdown(f"""
             <div class="info-panel">
-                <h4>Risk Pattern Detection</h4>
-                <p>Several technical risks related to integration components have been identified. A technical review session with the architecture team is recommended.</p>
+                <h4>{title}</h4>
+                <p>{html.escape(insight["content"])}</p>
+                <p><small>Generated {generated}{note}</small></p>
             </div>
             """, unsafe_allow_html=True)
-            
-            with st.expander("AI Analysis Details"):
-                st.markdown("""
-                **Performance Metrics:**
-                - Schedule Performance Index (SPI): 0.92
-                - Cost Performance Index (CPI): 0.94
-                - Estimate at Completion (EAC): 108% of budget
-                
-                **Critical Path Analysis:**
-                - 3 tasks on the critical path are currently delayed
-                - Bottleneck identified in the "System Integration" phase
-                
-                **Resource Management:**
-                - 2 team members are over-allocated
-                - QA resources are under-allocated for upcoming testing phase
-                """)
+    
+        with st.expander("AI Analysis Details"):
+            st.markdown(analysis_details_markdown(project))
+
+def analysis_details_markdown(project):
+    """
+    Summarize the computed earned value, critical path and resource figures of a project.
+    
+    Args:
+        project: Project dictionary
+        
+    Returns:
+        str: Markdown with performance, critical path and resource sections
+    """
+    lines = []
+    analytics = get_analytics_worker().results(project)
+    if analytics is None:
+        lines.append("Schedule and cost analytics are being computed...")
+    else:
+        earned = analytics["results"]["earned_value"]
+        schedule = analytics["results"]["critical_path"]
+        
+        def ratio(value):
+            return f"{value:.2f}" if value is not None else "n/a"
+        
+        eac = "n/a"
+        if earned["eac"] is not None:
+            eac = f"${earned['eac']:,.0f}"
+            if earned["bac"]:
+                eac += f" ({earned['eac'] / earned['bac']:.0%} of budget)"
+        lines += [
+            "**Performance Metrics:**" + ("" if analytics["current"] else " (updating)"),
+            f"- Schedule Performance Index (SPI): {ratio(earned['spi'])}",
+            f"- Cost Performance Index (CPI): {ratio(earned['cpi'])}",
+            f"- Estimate at Completion (EAC): {eac}",
+            "",
+            "**Critical Path Analysis:**",
+            f"- {len(schedule['critical'])} of {len(schedule['tasks'])} tasks are on the critical path ({schedule['duration']} days)"
+        ]
+        # Critical tasks past their end date without being complete
+        today = datetime.datetime.now().date().isoformat()
+        tasks = {task["id"]: task for task in project.get("wbs", [])}
+        delayed = [
+            tasks[task_id] for task_id in schedule["critical"]
+            if task_id in tasks and tasks[task_id]["end_date"] < today and tasks[task_id].get("progress", 0) < 100
+        ]
+        lines.append(f"- {len(delayed)} tasks on the critical path are currently delayed")
+        if delayed:
+            lines.append(f"- Most overdue: {html.escape(min(delayed, key=lambda task: task['end_date'])['task'])}")
+    
+    resources_df = get_resource_frame(project)
+    if not resources_df.empty:
+        over = resources_df[resources_df["Band"] == BAND_OVER]
+        under = resources_df[resources_df["Utilization"] < 50]
+        lines += ["", "**Resource Management:**", f"- {len(over)} team members are over-allocated"]
+        if len(over):
+            lines.append(f"- Most over-allocated: {', '.join(html.escape(name) for name in over.sort_values('Utilization', ascending=False)['Name'].head(3))}")
+        lines.append(f"- {len(under)} team members are below 50% utilization")
+    return "\n".join(lines)
+
+def get_chat_session():
+    """
+    Return the id of the browser session's assistant conversation.
+    
+    The id is kept in the page URL so that reloading the page resumes the
+    persisted conversation.
+    
+    Returns:
+        str: Chat session id
+    """
+    if 'chat_session' not in st.session_state:
+        chat_session = st.query_params.get("chat")
+        if not chat_session:
+            chat_session = uuid.uuid4().hex
+            st.query_params["chat"] = chat_session
+        st.session_state.chat_session = chat_session
+    return st.session_state.chat_session
+
+def show_search():
+    """Search the RAID logs, decisions, activities, scope changes and feedback of all projects."""
+    st.title("🔍 Search")
+    
+    search_col, scope_col, kinds_col = st.columns([3, 1, 2])
+    with search_col:
+        query = st.text_input(
+            "Search",
+            placeholder='legacy api, "legacy api" or integ*',
+            help='All terms must match. Quote a phrase to match it exactly; end a term with * to match any word starting with it.',
+            key="search_query"
+        )
+    with scope_col:
+        scope_options = ["All projects"]
+        if 'project_data' in st.session_state:
+            scope_options.append(st.session_state.project_data.selected_project)
+        scope = st.selectbox("Projects", options=scope_options, key="search_scope")
+    with kinds_col:
+        labels = {label: kind for kind, (label, _) in SEARCH_KINDS.items()}
+        selected_labels = st.multiselect("Item types", options=list(labels), key="search_kinds")
+    
+    if not query.strip():
+        st.info("Search risks, issues, assumptions, dependencies, decisions, activities, scope changes and team feedback across all projects.")
+        return
+    
+    # Only the requested page and the ones before it are ranked out of the index
+    index = get_project_search()
+    projects = None if scope == "All projects" else {scope}
+    kinds = {labels[label] for label in selected_labels} or None
+    page = st.session_state.get("search_page", 1)
+    found = index.search(query, k=page * SEARCH_PAGE_SIZE, projects=projects, kinds=kinds)
+    if not found["total"]:
+        st.info("No items match the search.")
+        return
+    
+    st.caption(f"{found['total']:,} matching items in {len(index):,} indexed ({found['ms']:.1f} ms)")
+    page = render_pager("search_page", found["total"], SEARCH_PAGE_SIZE)
+    for result in found["results"][(page - 1) * SEARCH_PAGE_SIZE:page * SEARCH_PAGE_SIZE]:
+        item = result["item"]
+        heading = " ".join(part for part in (result["label"], item.get("id", "")) if part)
+        st.markdown(f"""
+        <div class="card">
+            <h4>{html.escape(heading)} · {html.escape(result['project'])}</h4>
+            <p>{html.escape(snippet(item, query))}</p>
+        </div>
+        """, unsafe_allow_html=True)
 
 def show_ai_assistant():
     """Display the AI Personal Assistant module."""
@@ -467,116 +751,112 @@ def show_ai_assistant():
         st.session_state.project_data = load_sample_data()
         save_data(st.session_state.project_data)
     
-    if 'assistant_messages' not in st.session_state:
-        st.session_state.assistant_messages = [
-            {"role": "assistant", "content": "Hello! I'm your AI PM Assistant. What can I help you with today? You can ask me about project management concepts, request analysis on your current project, or get help drafting project documents."}
-        ]
+    chat_history = get_chat_history()
+    chat_session = get_chat_session()
+    
+    if 'assistant_visible' not in st.session_state:
+        st.session_state.assistant_visible = CHAT_PAGE_SIZE
+    
+    # Only the most recent messages are rendered; older ones load on demand
+    hidden_messages = chat_history.count(chat_session) - st.session_state.assistant_visible
+    if hidden_messages > 0 and st.button(f"Load older messages ({hidden_messages} more)", key="load_older_messages"):
+        st.session_state.assistant_visible += CHAT_PAGE_SIZE
+        hidden_messages -= CHAT_PAGE_SIZE
     
     # Display chat messages
-    for message in st.session_state.assistant_messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
+    with span("assistant.history"):
+        if hidden_messages <= 0:
+            with st.chat_message("assistant"):
+                st.markdown(CHAT_GREETING)
+        for message in chat_history.recent(chat_session, st.session_state.assistant_visible):
+            with st.chat_message(message["role"]):
+                st.markdown(message["content"])
     
     # User input
     user_input = st.chat_input("Ask your PM assistant...")
     
     if user_input:
         # Add user message to chat history
-        st.session_state.assistant_messages.append({"role": "user", "content": user_input})
+        chat_history.append(chat_session, "user", user_input)
         
         # Display user message
         with st.chat_message("user"):
             st.markdown(user_input)
         
-        # For demo purposes, provide canned responses
-        # In a real implementation, this would make a call to OpenAI
+        # Definitional questions ("What is SPI?") are answered from the knowledge base
+        with span("assistant.knowledge_lookup"):
+            knowledge_index = get_knowledge_index()
+            knowledge_entry = knowledge_index.answer(user_input)
+        if knowledge_entry is not None:
+            with st.chat_message("assistant"):
+                st.markdown(knowledge_entry["answer"])
+                st.caption(f"From the {knowledge_entry['source']} knowledge base")
+            chat_history.append(chat_session, "assistant", knowledge_entry["answer"])
+            return
+        
+        project_data = st.session_state.project_data
+        project_data.refresh()
+        project = project_data.project()
+        
+        # Older turns reach the model only through the running summary
+        summary, recent_messages = chat_history.model_history(chat_session)
+        # Answers to follow-up questions depend on the conversation, so only
+        # opening questions are looked up in and stored in the shared cache
+        follow_up = bool(summary) or len(recent_messages) > 1
+        with span("assistant.cache_lookup"):
+            response_cache = get_response_cache()
+            cached_response = None if follow_up else response_cache.get(user_input, project)
+        
+        if cached_response is not None:
+            # Same question about the same project data: no model round-trip
+            with st.chat_message("assistant"):
+                st.markdown(cached_response)
+                st.caption("Answer served from cache")
+            chat_history.append(chat_session, "assistant", cached_response)
+            return
+        
+        # Stream the answer from the model as it is generated
         with st.chat_message("assistant"):
-            if "risk" in user_input.lower():
-                response = """
-                # Risk Analysis
-                
-                Based on your project data, I've identified these key risks:
-                
-                1. **Schedule Risk**: Current progress (65%) is trailing behind elapsed time (70%)
-                2. **Resource Constraint**: Team member "Alex Chen" is currently over-allocated (110%)
-                3. **Technical Risk**: Integration with legacy systems has unresolved dependencies
-                
-                **Recommendations**:
-                - Consider adjusting timeline for the implementation phase
-                - Redistribute tasks from over-allocated resources
-                - Schedule a technical review session for integration components
-                """
-            elif "status report" in user_input.lower() or "report" in user_input.lower():
-                response = """
-                # Project Status Report
-                
-                **Period**: April 15-27, 2023
-                
-                ## Summary
-                Project is currently at 65% completion with moderate schedule risk. Budget spending is on track at 62%.
-                
-                ## Key Achievements
-                - Completed user authentication module
-                - Finalized database schema design
-                - Conducted first round of user acceptance testing
-                
-                ## Issues & Risks
-                - Integration with payment gateway experiencing delays
-                - Resource constraint in QA team
-                
-                ## Next Steps
-                - Complete payment gateway integration
-                - Begin final testing phase
-                - Prepare deployment documentation
-                """
-            elif "milestone" in user_input.lower():
-                response = """
-                # Milestone Status
-                
-                | Milestone | Due Date | Status | Days Remaining |
-                |-----------|----------|--------|---------------|
-                | Requirements Sign-off | 2023-01-15 | Completed | - |
-                | Design Approval | 2023-02-28 | Completed | - |
-                | Alpha Release | 2023-04-15 | Completed | - |
-                | Beta Release | 2023-05-30 | At Risk | 33 |
-                | Final Delivery | 2023-07-15 | On Track | 79 |
-                
-                **Note**: Beta Release milestone is at risk due to delays in the payment integration module. Consider allocating additional resources or adjusting the timeline.
-                """
-            elif "budget" in user_input.lower():
-                response = """
-                # Budget Analysis
-                
-                Current budget status:
-                - Total budget: $450,000
-                - Spent to date: $279,000 (62%)
-                - Remaining: $171,000 (38%)
-                
-                Forecast analysis shows current spending rate might lead to a 5% budget overrun by project completion. Cost control measures recommended for the testing and deployment phases.
-                
-                **Cost Distribution**:
-                - Development: 45%
-                - Testing: 20%
-                - Project Management: 15%
-                - Infrastructure: 12%
-                - Training & Documentation: 8%
-                """
-            else:
-                response = """
-                I understand you're asking about project management insights. Based on the current project data, here are some observations:
-                
-                1. The project is progressing at an acceptable rate with 65% completion
-                2. There are some resource allocation concerns that may need attention
-                3. Several high-priority risks have been identified that should be addressed
-                
-                What specific aspect of the project would you like me to analyze in more detail? For example, I can provide insights on schedule, budget, risks, resource allocation, or help draft project documents.
-                """
+            # Clicking Stop reruns the script, which interrupts the stream
+            st.button("Stop generating", key="stop_generating")
             
-            st.markdown(response)
+            chunks = []
             
-            # Add assistant response to chat history
-            st.session_state.assistant_messages.append({"role": "assistant", "content": response})
+            def collect(stream):
+                for delta in stream:
+                    chunks.append(delta)
+                    yield delta
+            
+            try:
+                with span("assistant.context"):
+                    # Ground the model in a budgeted project summary and the
+                    # closest knowledge base passages
+                    project_context = build_project_context(project)
+                    context = f"Current project state:\n\n{project_context['text']}"
+                    knowledge_context = knowledge_index.context(user_input)
+                    if knowledge_context:
+                        context += f"\n\nReference material from the PM knowledge base:\n\n{knowledge_context}"
+                    if summary:
+                        context += f"\n\nSummary of the earlier conversation:\n\n{summary}"
+                    messages = build_messages(recent_messages, context=context)
+                with span("assistant.stream"):
+                    st.write_stream(collect(stream_chat(messages)))
+                st.caption(
+                    f"Project context: {project_context['tokens']} of {project_context['budget']} tokens, "
+                    f"built in {project_context['build_ms']:.1f} ms"
+                )
+                # Only complete answers are cached
+                if not follow_up:
+                    response_cache.put(user_input, project, "".join(chunks))
+            except Exception as e:
+                if not chunks:
+                    st.error(f"The AI assistant could not answer: {e}")
+            finally:
+                # Keep whatever was received, even when the answer was stopped
+                if chunks:
+                    chat_history.append(chat_session, "assistant", "".join(chunks))
 
+@traced("sidebar")
 def render_sidebar():
     """Render the enhanced sidebar with improved navigation."""
     
@@ -587,7 +867,7 @@ def render_sidebar():
     # Main Navigation
     selected = st.sidebar.radio(
         "Main Menu",
-        options=["Dashboard", "AI Assistant"],
+        options=["Dashboard", "Search", "AI Assistant"],
         index=0,
         key="main_navigation",
         label_visibility="collapsed"
@@ -609,6 +889,13 @@ def render_sidebar():
             st.sidebar.success("API Key set for this session!")
             st.sidebar.button("Reload App", on_click=lambda: st.rerun())
     
+    warmup = warmup_status()
+    if warmup and not warmup["ready"]:
+        st.sidebar.caption("⏳ Warming up shared caches...")
+    
+    if TRACING_ENABLED:
+        st.sidebar.checkbox("Show performance panel", key="show_performance_panel")
+    
     st.sidebar.markdown("---")
     
     # About section
@@ -628,17 +915,106 @@ def render_sidebar():
     
     return selected
 
+def current_trace_stats():
+    """
+    Return the span statistics of the current session.
+    
+    Returns:
+        SpanStats or None: None outside a script run (e.g. in worker threads)
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return None
+    if 'trace_stats' not in st.session_state:
+        st.session_state.trace_stats = SpanStats(label=ctx.session_id[:8])
+    return st.session_state.trace_stats
+
+def render_performance_panel():
+    """Render span timings and session state sizes of this session and of the whole process."""
+    with st.expander("Performance", expanded=True):
+        session_col, process_col = st.columns(2)
+        with session_col:
+            st.markdown("**This session**")
+            st.dataframe(current_trace_stats().summary(), hide_index=True, width="stretch")
+        with process_col:
+            st.markdown("**All sessions**")
+            st.dataframe(process_stats().summary(), hide_index=True, width="stretch")
+        
+        warmup = warmup_status()
+        if warmup:
+            st.markdown(f"**Warm-up** ({'ready' if warmup['ready'] else 'running'}, {warmup['elapsed_s']:.1f} s)")
+            st.dataframe(warmup["steps"], hide_index=True, width="stretch")
+        
+        # Deep size of session state, per key of this session and per session
+        memory = memory_registry().report()
+        ctx = get_script_run_ctx(suppress_warning=True)
+        key_col, sessions_col = st.columns(2)
+        with key_col:
+            st.markdown("**Session state of this session**")
+            st.dataframe(
+                [
+                    {"key": key, "size_mb": round(size / 2 ** 20, 3)}
+                    for key, size in memory_registry().keys(ctx.session_id[:8]).items()
+                ],
+                hide_index=True,
+                width="stretch"
+            )
+        with sessions_col:
+            st.markdown("**Session state of all sessions**")
+            st.dataframe(
+                [
+                    {
+                        "session": row["session"],
+                        "size_mb": round(row["total_bytes"] / 2 ** 20, 3),
+                        "largest_key": row["largest_key"],
+                        "parked_edits": row["offloaded"],
+                        "measure_ms": round(row["measure_ms"], 1)
+                    }
+                    for row in memory["sessions"]
+                ],
+                hide_index=True,
+                width="stretch"
+            )
+        shared = memory["shared_store"]
+        st.caption(
+            f"{len(memory['sessions'])} sessions, {memory['total_bytes'] / 2 ** 20:.1f} MB of session state; "
+            f"shared store: {shared['entries']} values, {shared['compressed_bytes'] / 2 ** 20:.1f} MB compressed, "
+            f"{shared['references']} references"
+        )
+        st.download_button(
+            "Download spans (JSON lines)",
+            data=export_jsonl(),
+            file_name="spans.jsonl",
+            mime="application/jsonl"
+        )
+
 def main():
     """Main application function."""
     
+    # Spans recorded during a rerun are also aggregated per session
+    set_session_resolver(current_trace_stats)
+    
     # Render sidebar and get selected navigation
     selected = render_sidebar()
     
     # Display the appropriate page based on selection
     if selected == "Dashboard":
-        show_dashboard()
+        with span("page.dashboard"):
+            show_dashboard()
+    elif selected == "Search":
+        with span("page.search"):
+            show_search()
     elif selected == "AI Assistant":
-        show_ai_assistant()
+        with span("page.assistant"):
+            show_ai_assistant()
+    
+    # Account for this session's memory and park oversized unsaved edits in the shared store
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is not None:
+        check_session(st.session_state, ctx.session_id[:8])
+    
+    if TRACING_ENABLED and st.session_state.get("show_performance_panel"):
+        render_performance_panel()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,15 @@
+from utils.knowledge_index import get_knowledge_index, tokenize
+
+def test_contractions_are_single_words():
+    assert tokenize("What's a sprint?") == ["sprint"]
+    assert tokenize("What’s the project's SPI?") == ["project", "spi"]
+
+def test_contraction_gets_the_local_answer():
+    index = get_knowledge_index()
+    answer = index.answer("What's a sprint?")
+    assert answer is not None
+    assert answer is index.answer("What is a sprint?")
+    assert answer["question"] == "What is a Sprint?"
+
+def test_project_question_goes_to_the_model():
+    assert get_knowledge_index().answer("What's the status of our sprint?") is None
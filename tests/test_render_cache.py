@@ -0,0 +1,32 @@
+import os
+import time
+
+from utils import render_cache
+
+def write(path, size, age):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+def test_prune_deletes_old_then_oldest_renders(tmp_path, monkeypatch):
+    monkeypatch.setattr(render_cache, "RENDER_DIR", str(tmp_path))
+    write(tmp_path / "expired.png", 10, age=100)
+    write(tmp_path / "old.png", 2 ** 20, age=30)
+    write(tmp_path / "new.png", 2 ** 20, age=10)
+    assert render_cache.prune_renders(max_age=60, max_mb=1.5) == 2
+    assert os.listdir(tmp_path) == ["new.png"]
+
+def test_failed_render_is_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(render_cache, "RENDER_DIR", str(tmp_path))
+    monkeypatch.setattr(render_cache, "_failed", {})
+    project = {"name": "P", "version": None, "team_feedback": ["Great sprint, clear goals"]}
+    path = render_cache.render_path(render_cache.project_render_keys(project)["wordcloud"], "png")
+
+    render_cache._failed[path] = time.time()
+    assert render_cache.prerender_project(project, charts=["wordcloud"], formats=["png"]) == {}
+
+    render_cache._failed[path] = time.time() - render_cache.RENDER_RETRY_SECONDS - 1
+    futures = render_cache.prerender_project(project, charts=["wordcloud"], formats=["png"])
+    assert futures[("wordcloud", "png")].result(timeout=60) == path
+    assert os.path.exists(path)
@@ -0,0 +1,26 @@
+from utils.response_cache import ResponseCache
+
+def make_project(version, budget=100):
+    return {"name": "Sample Project", "version": version, "budget": budget}
+
+def test_sessions_on_different_versions_keep_their_answers():
+    cache = ResponseCache(":memory:")
+    published, edited = make_project(1), make_project(2, budget=200)
+    cache.put("What are the top risks?", published, "published answer")
+    cache.put("What are the top risks?", edited, "edited answer")
+    assert cache.get("What are the top risks?", published) == "published answer"
+    assert cache.get("What are the top risks?", edited) == "edited answer"
+
+def test_rephrased_question_hits_the_cache():
+    cache = ResponseCache(":memory:")
+    project = make_project(1)
+    cache.put("What are the top risks?", project, "answer")
+    assert cache.get("what are the top risks", project) == "answer"
+    assert cache.get("Please, what are our top risks?", project) == "answer"
+
+def test_different_question_misses_the_cache():
+    cache = ResponseCache(":memory:")
+    project = make_project(1)
+    cache.put("What are the current risks?", project, "current risks")
+    assert cache.get("What are the project risks?", project) is None
+    assert cache.get("What are the risks?", project) is None
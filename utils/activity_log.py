@@ -0,0 +1,155 @@
+"""
+Time-indexed, append-only activity log of a project.
+
+Activities are kept sorted by (date, sequence) with a per-author index, so
+the latest N activities, a date range or one author's activities are found
+by binary search instead of sorting the whole history. Projects store their
+activities newest first; activities of the same date keep that order. The
+stored activities are sorted once; appending in date order is O(1) and a
+back-dated activity is inserted in place.
+
+Logs are memoized per project version (see metrics.cached_for_project).
+append_activity records a new activity as an edit of a session's project
+view, so it gets a new version and a fresh log.
+"""
+import bisect
+import math
+
+from utils.metrics import cached_for_project
+
+class ActivityLog:
+    """Activities of one project ordered by date."""
+
+    def __init__(self, activities=()):
+        """
+        Args:
+            activities: Activities in stored order, newest first
+        """
+        # One sort for the stored activities; the sequence numbers count
+        # down the list, so same-date activities keep their stored order
+        count = len(activities)
+        keyed = sorted(
+            (((activity["date"], count - position), activity) for position, activity in enumerate(activities)),
+            key=lambda item: item[0]
+        )
+        self._keys = [key for key, _ in keyed]
+        self._entries = [activity for _, activity in keyed]
+        self._author_keys = {}
+        self._author_entries = {}
+        for key, activity in keyed:
+            author = activity.get("author")
+            if author:
+                self._author_keys.setdefault(author, []).append(key)
+                self._author_entries.setdefault(author, []).append(activity)
+        self._seq = count + 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def append(self, activity):
+        """
+        Add an activity, newer than the logged activities of the same date.
+
+        Args:
+            activity: Dict with date (YYYY-MM-DD), description and optional author
+        """
+        key = (activity["date"], self._seq)
+        self._seq += 1
+        _insert(self._keys, self._entries, key, activity)
+        author = activity.get("author")
+        if author:
+            _insert(
+                self._author_keys.setdefault(author, []),
+                self._author_entries.setdefault(author, []),
+                key,
+                activity
+            )
+
+    def extend(self, activities):
+        """Add several activities."""
+        for activity in activities:
+            self.append(activity)
+
+    def latest(self, n=5, offset=0, author=None):
+        """
+        Return the most recent activities, newest first.
+
+        Args:
+            n: Number of activities
+            offset: Number of more recent activities to skip (for paging)
+            author: Optional author to restrict to
+
+        Returns:
+            list: Activity dicts
+        """
+        entries = self._author_entries.get(author, []) if author else self._entries
+        end = max(len(entries) - offset, 0)
+        return entries[max(end - n, 0):end][::-1]
+
+    def between(self, start=None, end=None, author=None):
+        """
+        Return the activities between two dates (inclusive), newest first.
+
+        Args:
+            start: First date (YYYY-MM-DD), or None for the beginning
+            end: Last date (YYYY-MM-DD), or None for the end
+            author: Optional author to restrict to
+
+        Returns:
+            list: Activity dicts
+        """
+        keys = self._author_keys.get(author, []) if author else self._keys
+        entries = self._author_entries.get(author, []) if author else self._entries
+        low = bisect.bisect_left(keys, (start, -1)) if start else 0
+        high = bisect.bisect_right(keys, (end, math.inf)) if end else len(keys)
+        return entries[low:high][::-1]
+
+    def count(self, author=None):
+        """Return the number of activities, optionally of one author."""
+        return len(self._author_entries.get(author, [])) if author else len(self._entries)
+
+    def authors(self):
+        """Return the authors, most active first."""
+        return sorted(self._author_entries, key=lambda author: -len(self._author_entries[author]))
+
+def _insert(keys, entries, key, entry):
+    if not keys or key >= keys[-1]:
+        keys.append(key)
+        entries.append(entry)
+    else:
+        position = bisect.bisect_right(keys, key)
+        keys.insert(position, key)
+        entries.insert(position, entry)
+
+def get_activity_log(project):
+    """
+    Return the activity log of a project, memoized by project version.
+
+    Args:
+        project: Project dictionary
+
+    Returns:
+        ActivityLog: Shared log (read-only for callers)
+    """
+    return cached_for_project(
+        "activity_log",
+        project,
+        None,
+        lambda project, today: ActivityLog(project.get("activities", []))
+    )
+
+def append_activity(view, activity, name=None):
+    """
+    Record a new activity as an unsaved edit of a project.
+
+    The activity is stored first, as the newest, and the project gets a new
+    version, so the next get_activity_log builds its log.
+
+    Args:
+        view: The session's ProjectView
+        activity: Dict with date (YYYY-MM-DD), description and optional author
+        name: Project name (defaults to the selected project)
+    """
+    project = view.edit(name)
+    project["activities"] = [activity] + project.get("activities", [])
+    view.changed(name)
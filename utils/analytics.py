@@ -0,0 +1,377 @@
+"""
+Schedule and cost analytics of a project and the background worker computing them.
+
+critical_path, earned_value and schedule_forecast (a Monte Carlo simulation
+of the remaining work) are too slow for the request path on large projects.
+The AnalyticsWorker recomputes them in a thread pool whenever the project
+store publishes a new snapshot, and publishes the results per project
+version; the dashboard reads the latest published results and never waits
+for a computation.
+"""
+import datetime
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.metrics import cached_for_project, get_dashboard_metrics
+
+logger = logging.getLogger(__name__)
+
+# Threads of the analytics worker
+ANALYTICS_WORKERS = int(os.environ.get("ANALYTICS_WORKERS", 1))
+
+# Simulated schedules per Monte Carlo forecast
+MONTE_CARLO_ITERATIONS = int(os.environ.get("MONTE_CARLO_ITERATIONS", 2000))
+
+# Number of (project, version, date) results kept
+ANALYTICS_CACHE_SIZE = 128
+
+def _dependency_graph(wbs_data):
+    """
+    Build the dependency graph of a WBS.
+
+    Returns:
+        tuple: (durations, predecessors, successors, order) where the first
+        three map task id -> value and order lists the task ids in
+        topological order; tasks in a dependency cycle are left out of order
+    """
+    durations = {task["id"]: task.get("duration", 0) or 0 for task in wbs_data}
+    predecessors = {
+        task["id"]: [dep for dep in task.get("dependencies", []) if dep in durations and dep != task["id"]]
+        for task in wbs_data
+    }
+    successors = {task_id: [] for task_id in durations}
+    for task_id, deps in predecessors.items():
+        for dep in deps:
+            successors[dep].append(task_id)
+
+    # Kahn's algorithm
+    waiting = {task_id: len(deps) for task_id, deps in predecessors.items()}
+    ready = deque(task_id for task_id, count in waiting.items() if count == 0)
+    order = []
+    while ready:
+        task_id = ready.popleft()
+        order.append(task_id)
+        for successor in successors[task_id]:
+            waiting[successor] -= 1
+            if waiting[successor] == 0:
+                ready.append(successor)
+    return durations, predecessors, successors, order
+
+def critical_path(wbs_data):
+    """
+    Schedule a WBS with the critical path method.
+
+    A forward pass over the dependency graph gives each task's earliest
+    start and finish, a backward pass its latest start and finish; tasks
+    without slack form the critical path. Durations are in days and the
+    schedule starts at day 0. Dependencies on unknown tasks are ignored.
+
+    Args:
+        wbs_data: List of WBS task dictionaries with id, duration and dependencies
+
+    Returns:
+        dict: duration (project length in days), critical (ids of the critical
+        tasks in schedule order), tasks (id -> {"es", "ef", "ls", "lf", "slack"})
+        and cycle (ids of tasks in a dependency cycle, which are not scheduled)
+    """
+    durations, predecessors, successors, order = _dependency_graph(wbs_data)
+
+    # Forward pass
+    earliest_finish = {}
+    schedule = {}
+    for task_id in order:
+        start = max((earliest_finish[dep] for dep in predecessors[task_id]), default=0)
+        earliest_finish[task_id] = start + durations[task_id]
+        schedule[task_id] = {"es": start, "ef": earliest_finish[task_id]}
+    project_duration = max(earliest_finish.values(), default=0)
+
+    # Backward pass
+    latest_start = {}
+    for task_id in reversed(order):
+        finish = min((latest_start[s] for s in successors[task_id] if s in latest_start), default=project_duration)
+        latest_start[task_id] = finish - durations[task_id]
+        schedule[task_id].update(ls=latest_start[task_id], lf=finish, slack=latest_start[task_id] - schedule[task_id]["es"])
+
+    return {
+        "duration": project_duration,
+        "critical": [task_id for task_id in order if abs(schedule[task_id]["slack"]) < 1e-9],
+        "tasks": schedule,
+        "cycle": [task_id for task_id in durations if task_id not in schedule]
+    }
+
+def get_critical_path(project):
+    """
+    Return the critical path schedule of a project, memoized by project version.
+
+    Args:
+        project: Project dictionary
+
+    Returns:
+        dict: Result of critical_path for the project's WBS (read-only)
+    """
+    return cached_for_project(
+        "critical_path",
+        project,
+        None,
+        lambda project, today: critical_path(project.get("wbs", []))
+    )
+
+def _parse_date(value):
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+def earned_value(project, today=None):
+    """
+    Earned value figures of a project.
+
+    Planned value assumes each task progresses linearly between its start
+    and end dates; task progress is weighted by duration.
+
+    Args:
+        project: Project dictionary with budget, budget_spent and wbs
+        today: Reference date (defaults to the current date)
+
+    Returns:
+        dict: bac, pv, ev, ac, spi, cpi, eac, etc and vac (ratios are None
+        when their denominator is zero)
+    """
+    today = today or datetime.datetime.now().date()
+    total_duration = 0
+    planned = 0.0
+    earned = 0.0
+    for task in project.get("wbs", []):
+        duration = task.get("duration", 0) or 0
+        start, end = _parse_date(task["start_date"]), _parse_date(task["end_date"])
+        span_days = max((end - start).days, 1)
+        planned_share = min(max((today - start).days / span_days, 0.0), 1.0)
+        total_duration += duration
+        planned += duration * planned_share
+        earned += duration * task.get("progress", 0) / 100
+    bac = project.get("budget", 0)
+    pv = bac * planned / total_duration if total_duration else 0.0
+    ev = bac * earned / total_duration if total_duration else 0.0
+    ac = project.get("budget_spent", 0)
+    cpi = ev / ac if ac else None
+    eac = bac / cpi if cpi else None
+    return {
+        "bac": bac,
+        "pv": pv,
+        "ev": ev,
+        "ac": ac,
+        "spi": ev / pv if pv else None,
+        "cpi": cpi,
+        "eac": eac,
+        "etc": eac - ac if eac is not None else None,
+        "vac": bac - eac if eac is not None else None
+    }
+
+def schedule_forecast(project, today=None, iterations=MONTE_CARLO_ITERATIONS, seed=0):
+    """
+    Forecast the finish date with a Monte Carlo simulation of the remaining work.
+
+    Each iteration draws the remaining duration of every unfinished task from
+    a triangular distribution (90% to 150% of the planned remainder, most
+    likely as planned) and schedules it after its predecessors, starting
+    today. All iterations are simulated at once with NumPy.
+
+    Args:
+        project: Project dictionary
+        today: Reference date (defaults to the current date)
+        iterations: Number of simulated schedules
+        seed: Random seed, so the same project state gives the same forecast
+
+    Returns:
+        dict: p50, p80 and p95 finish dates (ISO strings), the matching
+        remaining days, and on_time_probability of finishing by the end date
+    """
+    import numpy as np
+
+    today = today or datetime.datetime.now().date()
+    rng = np.random.default_rng(seed)
+    progress = {task["id"]: task.get("progress", 0) for task in project.get("wbs", [])}
+    durations, predecessors, successors, order = _dependency_graph(project.get("wbs", []))
+
+    # Only the finish times of tasks with unscheduled successors are kept, so
+    # memory follows the width of the dependency graph, not the task count
+    scheduled = set(order)
+    waiting = {task_id: sum(successor in scheduled for successor in successors[task_id]) for task_id in order}
+    finish = {}
+    total = zero = np.zeros(iterations)
+    for task_id in order:
+        start = zero
+        for dep in predecessors[task_id]:
+            start = np.maximum(start, finish[dep])
+            waiting[dep] -= 1
+            if waiting[dep] == 0:
+                del finish[dep]
+        remaining = durations[task_id] * (1 - progress[task_id] / 100)
+        if remaining > 0:
+            end = start + remaining * rng.triangular(0.9, 1.0, 1.5, iterations)
+        else:
+            end = start
+        total = np.maximum(total, end)
+        if waiting[task_id]:
+            finish[task_id] = end
+
+    days_left = (_parse_date(project["end_date"]) - today).days
+    forecast = {"on_time_probability": float(np.mean(total <= days_left))}
+    for percent in (50, 80, 95):
+        days = int(np.ceil(np.percentile(total, percent)))
+        forecast[f"p{percent}_days"] = days
+        forecast[f"p{percent}"] = (today + datetime.timedelta(days=days)).isoformat()
+    return forecast
+
+def compute_analytics(project, today=None):
+    """
+    Compute every background analytic of a project.
+
+    The dashboard metrics (health indicators) are computed as well, so the
+    dashboard finds them in the metrics cache.
+
+    Args:
+        project: Project dictionary
+        today: Reference date (defaults to the current date)
+
+    Returns:
+        dict: critical_path, earned_value and forecast
+    """
+    today = today or datetime.datetime.now().date()
+    get_dashboard_metrics(project, today)
+    return {
+        "critical_path": get_critical_path(project),
+        "earned_value": earned_value(project, today),
+        "forecast": schedule_forecast(project, today)
+    }
+
+class AnalyticsWorker:
+    """
+    Thread pool recomputing project analytics in the background.
+
+    Results are published per (project name, version, date). Readers get the
+    latest published result of a project, which may belong to an older
+    version while the current one is computed.
+    """
+
+    def __init__(self, workers=ANALYTICS_WORKERS, compute=compute_analytics):
+        self.compute = compute
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analytics")
+        self._lock = threading.Lock()
+        self._results = OrderedDict()
+        self._pending = {}
+        self.stats = {"computed": 0, "failed": 0}
+
+    def _key(self, project, today):
+        return (project.get("name"), project.get("version"), today)
+
+    def submit(self, project, today=None):
+        """
+        Schedule the analytics of a project state unless they are published or pending.
+
+        Args:
+            project: Project dictionary; it must not be changed while queued
+            today: Reference date (defaults to the current date)
+
+        Returns:
+            Future or None: The pending computation, or None when the results are published
+        """
+        today = today or datetime.datetime.now().date()
+        key = self._key(project, today)
+        with self._lock:
+            if key in self._results:
+                return None
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(self._run, key, project, today)
+                self._pending[key] = future
+            return future
+
+    def _run(self, key, project, today):
+        start = time.perf_counter()
+        try:
+            results = self.compute(project, today)
+        except Exception:
+            logger.exception("Analytics of %s failed", key[0])
+            with self._lock:
+                self.stats["failed"] += 1
+                self._pending.pop(key, None)
+            return None
+        entry = {
+            "version": key[1],
+            "date": today.isoformat(),
+            "computed": time.time(),
+            "ms": (time.perf_counter() - start) * 1000,
+            "results": results
+        }
+        with self._lock:
+            self.stats["computed"] += 1
+            self._results[key] = entry
+            while len(self._results) > ANALYTICS_CACHE_SIZE:
+                self._results.popitem(last=False)
+            self._pending.pop(key, None)
+        return entry
+
+    def latest(self, project, today=None):
+        """
+        Return the latest published analytics of a project without waiting.
+
+        Args:
+            project: Project dictionary
+            today: Reference date (defaults to the current date)
+
+        Returns:
+            dict or None: version, date, computed, ms, results and current
+            (False when the results belong to another version or date), or
+            None when nothing has been published for the project yet
+        """
+        today = today or datetime.datetime.now().date()
+        key = self._key(project, today)
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                return dict(entry, current=True)
+            # Most recently published result of the same project
+            for (name, _, _), entry in reversed(self._results.items()):
+                if name == key[0]:
+                    return dict(entry, current=False)
+        return None
+
+    def results(self, project, today=None):
+        """Return the latest published analytics of a project and schedule them if outdated."""
+        entry = self.latest(project, today)
+        if entry is None or not entry["current"]:
+            self.submit(project, today)
+        return entry
+
+    def on_snapshot(self, snapshot):
+        """Schedule the analytics of every project of a new project store snapshot."""
+        for project in snapshot.projects.values():
+            self.submit(project)
+
+    def pending(self):
+        """Return the number of queued or running computations."""
+        with self._lock:
+            return len(self._pending)
+
+_analytics_worker = None
+_analytics_worker_lock = threading.Lock()
+
+def get_analytics_worker():
+    """
+    Return the process-wide analytics worker.
+
+    On first use it subscribes to the project store and schedules the
+    analytics of the current snapshot.
+    """
+    global _analytics_worker
+    with _analytics_worker_lock:
+        if _analytics_worker is None:
+            from utils.project_store import get_project_store
+
+            _analytics_worker = AnalyticsWorker()
+            store = get_project_store()
+            store.subscribe(_analytics_worker.on_snapshot)
+            _analytics_worker.on_snapshot(store.snapshot())
+        return _analytics_worker
@@ -0,0 +1,280 @@
+"""
+Read-only JSON API over the shared project data, for wallboards and bots.
+
+    GET /api/projects                        project list
+    GET /api/projects/<name>/metrics         dashboard metrics and health
+    GET /api/projects/<name>/milestones      milestone table
+    GET /api/projects/<name>/raid            RAID summary and open high risks
+    GET /api/projects/<name>/resources       resource utilization
+
+Responses carry an ETag derived from the project version and date (the
+snapshot version for the project list). A request whose If-None-Match
+matches gets a 304 before anything is computed, and serialized bodies are
+cached per ETag, so polling unchanged data costs almost nothing.
+
+The app starts the API in a background thread when API_PORT is set; it can
+also run on its own:
+
+    python -m utils.api_server --port 8502
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from utils.metrics import get_dashboard_metrics
+from utils.milestones import get_milestone_frame
+from utils.project_store import get_project_store
+from utils.resources import get_resource_frame
+
+logger = logging.getLogger(__name__)
+
+# Port of the API started alongside the app (0 disables it)
+API_PORT = int(os.environ.get("API_PORT", 0))
+API_HOST = os.environ.get("API_HOST", "127.0.0.1")
+
+# Number of serialized responses kept
+API_CACHE_SIZE = 256
+
+# Versions restart with the process, so ETags include a per-process token
+_PROCESS_TOKEN = uuid.uuid4().hex[:8]
+
+def _json_default(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        # NumPy scalars
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+def _project_summary(project):
+    return {
+        "name": project["name"],
+        "version": project.get("version"),
+        "status": project.get("status"),
+        "progress": project.get("progress"),
+        "start_date": project.get("start_date"),
+        "end_date": project.get("end_date"),
+        "budget": project.get("budget"),
+        "budget_spent": project.get("budget_spent")
+    }
+
+def _metrics_payload(project, today):
+    metrics = get_dashboard_metrics(project, today)
+    payload = {key: value for key, value in metrics.items() if key != "health" and not key.endswith("_class")}
+    payload["health"] = {indicator: status for indicator, (status, _) in metrics["health"].items()}
+    payload["high_risks"] = [
+        {"id": risk.get("id"), "title": risk["title"], "impact": risk.get("impact"), "status": risk.get("status")}
+        for risk in metrics["high_risks"]
+    ]
+    return payload
+
+def _milestones_payload(project, today):
+    df = get_milestone_frame(project, today)
+    if len(df):
+        df = df.assign(**{"Due Date": df["Due Date"].dt.strftime("%Y-%m-%d")})
+    return {"milestones": df.to_dict(orient="records")}
+
+def _raid_payload(project, today):
+    raid = project.get("raid", {})
+    summary = {}
+    for category, items in raid.items():
+        by_status = {}
+        for item in items:
+            by_status[item.get("status", "Unknown")] = by_status.get(item.get("status", "Unknown"), 0) + 1
+        summary[category] = {"total": len(items), "by_status": by_status}
+    risks = raid.get("risks", [])
+    by_severity = {}
+    for risk in risks:
+        by_severity[risk.get("severity", "Unknown")] = by_severity.get(risk.get("severity", "Unknown"), 0) + 1
+    summary.setdefault("risks", {"total": 0, "by_status": {}})["by_severity"] = by_severity
+    open_high_risks = [
+        {key: risk.get(key) for key in ("id", "title", "owner", "status", "mitigation")}
+        for risk in risks if risk.get("severity") == "High" and risk.get("status") != "Closed"
+    ]
+    return {"summary": summary, "open_high_risks": open_high_risks}
+
+def _resources_payload(project, today):
+    df = get_resource_frame(project, today).drop(columns=["Search Text"])
+    return {"resources": df.to_dict(orient="records")}
+
+# Endpoint below /api/projects/<name>/ -> function (project, today) -> payload
+PROJECT_ENDPOINTS = {
+    "metrics": _metrics_payload,
+    "milestones": _milestones_payload,
+    "raid": _raid_payload,
+    "resources": _resources_payload,
+}
+
+class ResponseCache:
+    """Serialized responses by (path, ETag)."""
+
+    def __init__(self, size=API_CACHE_SIZE):
+        self.size = size
+        self._lock = threading.Lock()
+        self._bodies = OrderedDict()
+        self.stats = {"requests": 0, "not_modified": 0, "hits": 0, "computed": 0}
+
+    def get(self, key):
+        with self._lock:
+            body = self._bodies.get(key)
+            if body is not None:
+                self._bodies.move_to_end(key)
+                self.stats["hits"] += 1
+            return body
+
+    def put(self, key, body):
+        with self._lock:
+            self.stats["computed"] += 1
+            self._bodies[key] = body
+            while len(self._bodies) > self.size:
+                self._bodies.popitem(last=False)
+
+    def count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+def resolve_request(path, today=None):
+    """
+    Find what a request path refers to, without computing the response.
+
+    Args:
+        path: Request path (percent-encoded project names are decoded)
+        today: Reference date (defaults to the current date)
+
+    Returns:
+        tuple: (ETag, function returning the payload), or (None, error message)
+        when the path does not exist
+    """
+    today = today or datetime.datetime.now().date()
+    parts = [unquote(part) for part in urlsplit(path).path.strip("/").split("/")]
+    snapshot = get_project_store().snapshot()
+
+    if parts == ["api", "projects"]:
+        etag = f'"{_PROCESS_TOKEN}-projects-{snapshot.version}"'
+        return etag, lambda: {"projects": [_project_summary(p) for p in snapshot.projects.values()]}
+
+    if len(parts) == 4 and parts[:2] == ["api", "projects"]:
+        name, endpoint = parts[2], parts[3]
+        project = snapshot.projects.get(name)
+        if project is None:
+            return None, f"Unknown project: {name}"
+        if endpoint not in PROJECT_ENDPOINTS:
+            return None, f"Unknown endpoint: {endpoint}"
+        etag = f'"{_PROCESS_TOKEN}-{endpoint}-{project.get("version")}-{today.isoformat()}"'
+        return etag, lambda: PROJECT_ENDPOINTS[endpoint](project, today)
+
+    return None, f"Not found: {path}"
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Serves the read-only JSON endpoints."""
+
+    server_version = "PMBuddyAPI/1.0"
+    cache = ResponseCache()
+
+    def do_GET(self):
+        self.cache.count("requests")
+        etag, payload = resolve_request(self.path)
+        if etag is None:
+            self._send(404, json.dumps({"error": payload}).encode("utf-8"))
+            return
+
+        # Conditional request for unchanged data: nothing is computed
+        tags = {tag.strip().removeprefix("W/") for tag in self.headers.get("If-None-Match", "").split(",")}
+        if etag in tags or "*" in tags:
+            self.cache.count("not_modified")
+            self._send(304, None, etag)
+            return
+
+        key = (urlsplit(self.path).path, etag)
+        body = self.cache.get(key)
+        if body is None:
+            body = json.dumps(payload(), default=_json_default).encode("utf-8")
+            self.cache.put(key, body)
+        self._send(200, body, etag)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            # Clients may keep the response but must revalidate it
+            self.send_header("Cache-Control", "no-cache")
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body is not None:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+def create_api_server(host=API_HOST, port=API_PORT):
+    """
+    Create the API server; call serve_forever() on it to handle requests.
+
+    Args:
+        host: Interface to listen on
+        port: Port (0 picks a free one; see server.server_address)
+
+    Returns:
+        ThreadingHTTPServer
+    """
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    return server
+
+_api_server = None
+_api_server_started = False
+_api_server_lock = threading.Lock()
+
+def start_api_server():
+    """
+    Start the API on API_HOST:API_PORT in a background thread, once per process.
+
+    Returns:
+        ThreadingHTTPServer or None: The server, or None when API_PORT is not
+        set or the port is taken (e.g. by another app process)
+    """
+    global _api_server, _api_server_started
+    if not API_PORT:
+        return None
+    with _api_server_lock:
+        if not _api_server_started:
+            _api_server_started = True
+            try:
+                _api_server = create_api_server()
+            except OSError as e:
+                logger.warning("JSON API not started on port %s: %s", API_PORT, e)
+                return None
+            threading.Thread(target=_api_server.serve_forever, name="api-server", daemon=True).start()
+            logger.info("JSON API listening on http://%s:%s/api/projects", API_HOST, API_PORT)
+        return _api_server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the read-only JSON API.")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT or 8502)
+    args = parser.parse_args(argv)
+
+    server = create_api_server(args.host, args.port)
+    print(f"Serving http://{args.host}:{server.server_address[1]}/api/projects")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+Benchmarks for data generation, dashboard metrics and every chart.
+
+Each benchmark runs on synthetic projects of several sizes and records the
+best wall time and the peak traced memory. Results can be saved as a
+baseline and later runs compared against it; regressions beyond the
+tolerance are listed and make the command exit with code 1:
+
+    python -m utils.benchmarks --save-baseline
+    python -m utils.benchmarks --tolerance 0.25
+
+Memory growth over repeated chart renders is checked separately by
+utils.render_memory_check.
+"""
+import argparse
+import copy
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT_DIR, "data", "benchmark_baseline.json")
+
+DEFAULT_SCALES = [100, 1000, 10000, 100000]
+
+# Differences below these are noise, whatever the ratio
+MIN_TIME_DELTA_S = 0.002
+MIN_MEMORY_DELTA_MB = 0.5
+
+def _scaled_benchmarks():
+    """Benchmarks run on every synthetic scale: name -> (function, argument builder)."""
+    from utils import visualization
+    from utils.context_builder import ProjectContextBuilder
+    from utils.data_utils import generate_synthetic_project
+    from utils.metrics import compute_dashboard_metrics
+    from utils.milestones import milestone_frame
+    from utils.resources import resource_frame
+    from utils.wbs_diff import diff_wbs
+
+    today = datetime.datetime.now().date()
+
+    def baseline_wbs(project):
+        # Baseline with 10% fewer tasks and shifted durations on every 7th task
+        wbs = copy.deepcopy(project["wbs"][:len(project["wbs"]) * 9 // 10])
+        for task in wbs[::7]:
+            task["duration"] = max(1, task["duration"] - 2)
+        return wbs
+
+    return {
+        "generate_synthetic_project": (
+            generate_synthetic_project, lambda p: (len(p["wbs"]), today)
+        ),
+        "compute_dashboard_metrics": (compute_dashboard_metrics, lambda p: (p, today)),
+        "milestone_frame": (milestone_frame, lambda p: (p["wbs"], today)),
+        "resource_frame": (resource_frame, lambda p: (p["resources"],)),
+        "diff_wbs": (diff_wbs, lambda p: (baseline_wbs(p), p["wbs"])),
+        # A fresh builder per call, so the summary is built rather than served from its cache
+        "build_project_context": (
+            lambda p: ProjectContextBuilder().build(p, today=today), lambda p: (p,)
+        ),
+        "create_gantt_chart": (visualization.create_gantt_chart, lambda p: (p["wbs"],)),
+        "create_resource_allocation_chart": (
+            visualization.create_resource_allocation_chart, lambda p: (p["resources"],)
+        ),
+        "create_raid_compliance_chart": (visualization.create_raid_compliance_chart, lambda p: (p["raid"],)),
+        "create_decision_status_chart": (visualization.create_decision_status_chart, lambda p: (p["decisions"],)),
+        "create_wordcloud": (visualization.create_wordcloud, lambda p: (p["team_feedback"],)),
+        "create_critical_path_network": (visualization.create_critical_path_network, lambda p: (p["wbs"],)),
+        "create_scope_creep_chart": (
+            visualization.create_scope_creep_chart, lambda p: (baseline_wbs(p), p["wbs"])
+        ),
+    }
+
+def _fixed_benchmarks():
+    """Benchmarks whose input does not scale: name -> (function, argument builder)."""
+    from utils import visualization
+    from utils.data_utils import build_agile_knowledge, generate_sample_project_1, generate_sample_project_2
+
+    today = datetime.datetime.now().date()
+    return {
+        "generate_sample_project_1": (generate_sample_project_1, lambda: (today,)),
+        "generate_sample_project_2": (generate_sample_project_2, lambda: (today,)),
+        "build_agile_knowledge": (build_agile_knowledge, lambda: ()),
+        "create_sentiment_gauge": (visualization.create_sentiment_gauge, lambda: (0.35,)),
+    }
+
+def measure(function, args, repeat=3, slow_s=1.0):
+    """
+    Time a call and trace its peak memory.
+
+    The first call runs under tracemalloc for the peak; timing calls run
+    untraced and the best one is kept. Calls slower than slow_s are timed
+    only once.
+
+    Args:
+        function: Callable to measure
+        args: Positional arguments
+        repeat: Number of timed calls
+        slow_s: Threshold above which the call is not repeated
+
+    Returns:
+        dict: time_s (best wall time) and peak_mb (peak traced allocation)
+    """
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        function(*args)
+        traced_s = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    times = []
+    for _ in range(1 if traced_s > slow_s else repeat):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return {"time_s": min(times), "peak_mb": peak / 2 ** 20}
+
+def run_benchmarks(scales=DEFAULT_SCALES, only=None, repeat=3, time_limit=30.0, log=None):
+    """
+    Run the benchmark suite.
+
+    Scales run in ascending order. When a benchmark's time at one scale,
+    extrapolated linearly, would exceed time_limit at the next, or when it
+    fails, its larger scales are skipped and the reason is recorded.
+
+    Args:
+        scales: Synthetic project sizes in tasks
+        only: Optional list of substrings; benchmarks not matching any are skipped
+        repeat: Number of timed calls per measurement
+        time_limit: Seconds a single call may be expected to take
+        log: Optional callable receiving a progress line per result
+
+    Returns:
+        dict: "<name>@<scale>" -> {"name", "scale", "time_s", "peak_mb"}
+        or {"name", "scale", "skipped"}; fixed-size benchmarks use scale "sample"
+    """
+    from utils.data_utils import generate_synthetic_project
+
+    def selected(name):
+        return not only or any(pattern in name for pattern in only)
+
+    results = {}
+
+    def record(name, scale, result):
+        results[f"{name}@{scale}"] = dict(result, name=name, scale=scale)
+        if log:
+            log(format_result(results[f"{name}@{scale}"]))
+
+    for name, (function, build_args) in _fixed_benchmarks().items():
+        if selected(name):
+            args = build_args()
+            function(*args)
+            record(name, "sample", measure(function, args, repeat))
+
+    scaled = {name: spec for name, spec in _scaled_benchmarks().items() if selected(name)}
+    previous = {}
+    today = datetime.datetime.now().date()
+    for scale in sorted(scales):
+        project = generate_synthetic_project(scale, today)
+        for name, (function, build_args) in scaled.items():
+            if name in previous and isinstance(previous[name], str):
+                record(name, scale, {"skipped": previous[name]})
+                continue
+            if name in previous:
+                last_scale, last_time = previous[name]
+                if last_time * scale / last_scale > time_limit:
+                    previous[name] = f"estimated over {time_limit:g} s from {last_scale} tasks"
+                    record(name, scale, {"skipped": previous[name]})
+                    continue
+
+            args = build_args(project)
+            try:
+                if name not in previous:
+                    # Warm-up call, so lazy imports are not measured
+                    function(*args)
+                result = measure(function, args, repeat)
+            except Exception as error:
+                previous[name] = f"{type(error).__name__}: {error}"
+                record(name, scale, {"skipped": previous[name]})
+                continue
+            previous[name] = (scale, result["time_s"])
+            record(name, scale, result)
+    return results
+
+def compare(results, baseline, tolerance=0.25):
+    """
+    Compare results against a baseline.
+
+    Args:
+        results: Result of run_benchmarks
+        baseline: Results of an earlier run
+        tolerance: Allowed relative increase of time and peak memory
+
+    Returns:
+        list: Rows (key, metric, baseline value, current value, relative
+        change, regressed) for every measurement present in both runs
+    """
+    rows = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous or "skipped" in current or "skipped" in previous:
+            continue
+        for metric, noise in (("time_s", MIN_TIME_DELTA_S), ("peak_mb", MIN_MEMORY_DELTA_MB)):
+            before, after = previous[metric], current[metric]
+            change = (after - before) / before if before else 0.0
+            regressed = change > tolerance and after - before > noise
+            rows.append((key, metric, before, after, change, regressed))
+    return rows
+
+def format_result(result):
+    """Format one benchmark result as a line."""
+    label = f"{result['name']} @ {result['scale']}"
+    if "skipped" in result:
+        return f"{label:<52} skipped ({result['skipped']})"
+    return f"{label:<52} {result['time_s'] * 1000:>11.1f} ms {result['peak_mb']:>9.1f} MB"
+
+def format_comparison(rows):
+    """Format a comparison as a table, regressions first."""
+    lines = [f"{'benchmark':<52} {'metric':<8} {'baseline':>10} {'current':>10} {'change':>8}"]
+    for key, metric, before, after, change, regressed in sorted(rows, key=lambda row: (not row[5], row[0])):
+        scale, label = (1000, "time ms") if metric == "time_s" else (1, "peak MB")
+        lines.append(
+            f"{key:<52} {label:<8} {before * scale:>10.1f} {after * scale:>10.1f} {change:>+7.0%}"
+            + ("  REGRESSION" if regressed else "")
+        )
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark data generation, metrics and charts.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="Synthetic project sizes in tasks")
+    parser.add_argument("--only", nargs="+", help="Run only benchmarks whose name contains one of these")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed calls per measurement")
+    parser.add_argument("--time-limit", type=float, default=30.0, help="Skip scales expected to take longer (seconds)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative increase before a regression")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scales, args.only, args.repeat, args.time_limit, log=print)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    exit_code = 0
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results
+            }, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline["results"], args.tolerance)
+        print(f"\nCompared with the baseline of {baseline['created']} (tolerance {args.tolerance:.0%}):")
+        print(format_comparison(rows))
+        regressions = sum(row[5] for row in rows)
+        if regressions:
+            print(f"\n{regressions} regression(s)")
+            exit_code = 1
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+from utils.context_builder import estimate_tokens
+
+# Location and retention of the persisted assistant conversations
+CHAT_HISTORY_PATH = os.environ.get(
+    "CHAT_HISTORY_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "chat_history.sqlite3")
+)
+CHAT_HISTORY_TTL = float(os.environ.get("CHAT_HISTORY_TTL", 30 * 24 * 3600))
+
+# Number of most recent messages sent to the model verbatim; older ones are
+# folded into the running summary
+CHAT_CONTEXT_MESSAGES = int(os.environ.get("CHAT_CONTEXT_MESSAGES", 8))
+
+# Maximum size of the running summary of older turns
+CHAT_SUMMARY_TOKENS = int(os.environ.get("CHAT_SUMMARY_TOKENS", 400))
+
+# Longest excerpt of a single message kept in the summary
+SUMMARY_EXCERPT_CHARS = 160
+
+def _pack(text):
+    return zlib.compress(text.encode("utf-8"))
+
+def _unpack(blob):
+    return zlib.decompress(blob).decode("utf-8")
+
+def _excerpt(text):
+    """First sentence of a message, without Markdown, shortened to SUMMARY_EXCERPT_CHARS."""
+    text = " ".join(re.sub(r"[#*_`>|]", " ", text).split())
+    sentence = re.split(r"(?<=[.!?])\s", text, maxsplit=1)[0]
+    if len(sentence) > SUMMARY_EXCERPT_CHARS:
+        sentence = sentence[:SUMMARY_EXCERPT_CHARS - 3].rstrip() + "..."
+    return sentence
+
+def summarize_turns(summary, messages, max_tokens=CHAT_SUMMARY_TOKENS):
+    """
+    Fold messages into a running conversation summary.
+
+    Each message becomes one line with the first sentence of its content.
+    When the summary exceeds max_tokens the oldest lines are dropped, so the
+    summary stays bounded however long the conversation gets.
+
+    Args:
+        summary: Current summary text (may be empty)
+        messages: List of {"role", "content"} messages to add, oldest first
+        max_tokens: Maximum summary size
+
+    Returns:
+        str: Updated summary
+    """
+    lines = summary.splitlines() if summary else []
+    for message in messages:
+        speaker = "User" if message["role"] == "user" else "Assistant"
+        lines.append(f"- {speaker}: {_excerpt(message['content'])}")
+
+    tokens = [estimate_tokens(line) + 1 for line in lines]
+    total = sum(tokens)
+    start = 0
+    while total > max_tokens and start < len(lines) - 1:
+        total -= tokens[start]
+        start += 1
+    return "\n".join(lines[start:])
+
+class ChatHistoryStore:
+    """
+    Persistent assistant conversations, one per chat session.
+
+    Messages are stored zlib-compressed in SQLite so session state only has
+    to hold the session id. Each session also keeps a running summary of
+    the messages that no longer fit in the model context window.
+    """
+
+    def __init__(self, path=CHAT_HISTORY_PATH, ttl=CHAT_HISTORY_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS messages (
+                session TEXT,
+                seq INTEGER,
+                role TEXT,
+                content BLOB,
+                created REAL,
+                PRIMARY KEY (session, seq)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                session TEXT PRIMARY KEY,
+                summary TEXT,
+                upto INTEGER,
+                updated REAL
+            )
+        """)
+        self._conn.commit()
+
+    def append(self, session, role, content):
+        """
+        Add a message to a conversation.
+
+        Args:
+            session: Chat session id
+            role: "user" or "assistant"
+            content: Message text
+
+        Returns:
+            int: Sequence number of the message
+        """
+        with self._lock:
+            seq = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM messages WHERE session = ?", (session,)
+            ).fetchone()[0]
+            self._conn.execute(
+                "INSERT INTO messages VALUES (?, ?, ?, ?, ?)",
+                (session, seq, role, _pack(content), time.time())
+            )
+            self._conn.commit()
+            return seq
+
+    def count(self, session):
+        """Return the number of messages in a conversation."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE session = ?", (session,)
+            ).fetchone()[0]
+
+    def recent(self, session, limit):
+        """
+        Return the most recent messages of a conversation.
+
+        Args:
+            session: Chat session id
+            limit: Maximum number of messages
+
+        Returns:
+            list: {"seq", "role", "content"} messages, oldest first
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, role, content FROM messages WHERE session = ? ORDER BY seq DESC LIMIT ?",
+                (session, limit)
+            ).fetchall()
+        return [{"seq": seq, "role": role, "content": _unpack(content)} for seq, role, content in reversed(rows)]
+
+    def summary(self, session):
+        """Return the running summary of a conversation and the last summarized sequence number."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, upto FROM summaries WHERE session = ?", (session,)
+            ).fetchone()
+        return row if row else ("", 0)
+
+    def model_history(self, session, window=CHAT_CONTEXT_MESSAGES, summarize=summarize_turns):
+        """
+        Return what to send to the model for a conversation.
+
+        Messages older than the window are folded into the running summary
+        first; each message is summarized only once.
+
+        Args:
+            session: Chat session id
+            window: Number of recent messages sent verbatim
+            summarize: Function (summary, messages) -> summary
+
+        Returns:
+            tuple: (summary text, list of recent {"role", "content"} messages)
+        """
+        messages = self.recent(session, window)
+        summary, upto = self.summary(session)
+        first_recent = messages[0]["seq"] if messages else upto + 1
+
+        if first_recent - 1 > upto:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT role, content FROM messages WHERE session = ? AND seq > ? AND seq < ? ORDER BY seq",
+                    (session, upto, first_recent)
+                ).fetchall()
+            summary = summarize(summary, [{"role": role, "content": _unpack(content)} for role, content in rows])
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)",
+                    (session, summary, first_recent - 1, time.time())
+                )
+                self._conn.commit()
+
+        return summary, [{"role": m["role"], "content": m["content"]} for m in messages]
+
+    def clear(self, session):
+        """Delete a conversation and its summary."""
+        with self._lock:
+            self._conn.execute("DELETE FROM messages WHERE session = ?", (session,))
+            self._conn.execute("DELETE FROM summaries WHERE session = ?", (session,))
+            self._conn.commit()
+
+    def prune(self):
+        """Delete conversations without activity for longer than the TTL."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            self._conn.execute(
+                """DELETE FROM messages WHERE session IN (
+                    SELECT session FROM messages GROUP BY session HAVING MAX(created) < ?
+                )""",
+                (cutoff,)
+            )
+            self._conn.execute(
+                "DELETE FROM summaries WHERE session NOT IN (SELECT DISTINCT session FROM messages)"
+            )
+            self._conn.commit()
+
+_chat_history = None
+_chat_history_lock = threading.Lock()
+
+def get_chat_history():
+    """Return the process-wide chat history store, opening (and pruning) it on first use."""
+    global _chat_history
+    with _chat_history_lock:
+        if _chat_history is None:
+            _chat_history = ChatHistoryStore()
+            _chat_history.prune()
+        return _chat_history
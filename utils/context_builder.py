@@ -0,0 +1,266 @@
+import datetime
+import hashlib
+import math
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from utils.activity_log import get_activity_log
+from utils.data_utils import project_version
+from utils.metrics import get_dashboard_metrics
+
+# Default number of tokens of project context sent to the model
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("CONTEXT_TOKEN_BUDGET", 1500))
+
+# Maximum number of lines rendered per section before budgeting
+SECTION_LINE_LIMIT = 20
+
+# Number of (project, version) section states kept
+CONTEXT_STATE_SIZE = 64
+
+_encoder = None
+_encoder_loaded = False
+
+def estimate_tokens(text):
+    """
+    Count the tokens of a text.
+
+    Uses tiktoken when it is installed and falls back to ~4 characters per
+    token otherwise.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Token count
+    """
+    global _encoder, _encoder_loaded
+    if not _encoder_loaded:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoder = None
+        _encoder_loaded = True
+    if _encoder is not None:
+        return len(_encoder.encode(text))
+    return math.ceil(len(text) / 4)
+
+def _parse_date(value):
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+def _overview_lines(project, today):
+    metrics = get_dashboard_metrics(project, today)
+    health = ", ".join(f"{name} {status}" for name, (status, _) in metrics["health"].items())
+    return [
+        f"Project: {project['name']} ({project['start_date']} to {project['end_date']}, "
+        f"{metrics['days_remaining']} days remaining)",
+        f"Progress {project['progress']}% with {project['elapsed_pct']}% of time elapsed; "
+        f"budget {project['budget_spent_pct']}% spent of {project['budget']:,}",
+        f"Tasks completed {metrics['completed_tasks']}/{metrics['total_tasks']}; health: {health}",
+    ]
+
+def _milestone_lines(project, today):
+    late = []
+    upcoming = []
+    for task in project.get("wbs", []):
+        if not task.get("milestone") or task["progress"] == 100:
+            continue
+        days = (_parse_date(task["end_date"]) - today).days
+        if days < 0:
+            late.append((days, f"OVERDUE {-days}d: {task['task']} (due {task['end_date']}, {task['progress']}%, {task['assigned_to']})"))
+        elif days <= 14:
+            upcoming.append((days, f"Due in {days}d: {task['task']} ({task['progress']}%, {task['assigned_to']})"))
+    return [line for _, line in sorted(late)] + [line for _, line in sorted(upcoming)]
+
+def _risk_lines(project, today):
+    severity_rank = {"High": 0, "Medium": 1, "Low": 2}
+    risks = [r for r in project.get("raid", {}).get("risks", []) if r.get("status") != "Closed"]
+    risks.sort(key=lambda r: severity_rank.get(r.get("severity"), 3))
+    return [
+        f"{r['severity']} risk {r['id']}: {r['title']} - mitigation: {r.get('mitigation') or 'none'}; "
+        f"owner: {r.get('owner') or 'unassigned'}"
+        for r in risks if r.get("severity") in ("High", "Medium")
+    ]
+
+def _resource_lines(project, today):
+    over = []
+    for r in project.get("resources", []):
+        if r["availability"] and r["allocated"] > r["availability"]:
+            utilization = r["allocated"] / r["availability"] * 100
+            over.append((-utilization, f"Over-allocated: {r['name']} ({r['role']}) at {utilization:.0f}%"))
+    return [line for _, line in sorted(over)]
+
+def _issue_lines(project, today):
+    priority_rank = {"High": 0, "Medium": 1, "Low": 2}
+    raid = project.get("raid", {})
+    issues = [i for i in raid.get("issues", []) if i.get("status") not in ("Closed", "Resolved")]
+    issues.sort(key=lambda i: priority_rank.get(i.get("priority"), 3))
+    lines = [f"{i['priority']} issue {i['id']}: {i['title']} ({i['status']}, {i.get('owner') or 'unassigned'})" for i in issues]
+    lines += [
+        f"Dependency at risk {d['id']}: {d['description']} (due {d['due_date']}, {d['owner']})"
+        for d in raid.get("dependencies", []) if d.get("status") == "At Risk"
+    ]
+    return lines
+
+def _activity_lines(project, today):
+    return [f"{a['date']}: {a['description']}" for a in get_activity_log(project).latest(SECTION_LINE_LIMIT)]
+
+def _decision_lines(project, today):
+    return [
+        f"Open decision {d['id']}: {d['title']} ({d['status']}, {d['owner']})"
+        for d in project.get("decisions", []) if d.get("status") in ("Pending", "Under Review")
+    ]
+
+# Sections in priority order: (name, title, builder, project keys it reads,
+# whether it depends on the current date)
+CONTEXT_SECTIONS = [
+    ("overview", "Overview", _overview_lines, ("name", "start_date", "end_date", "progress", "elapsed_pct", "budget", "budget_spent_pct", "wbs", "raid", "scope_changes", "defects"), True),
+    ("milestones", "Overdue and upcoming milestones", _milestone_lines, ("wbs",), True),
+    ("risks", "High and medium risks", _risk_lines, ("raid",), False),
+    ("resources", "Over-allocated people", _resource_lines, ("resources",), False),
+    ("issues", "Open issues and dependencies", _issue_lines, ("raid",), False),
+    ("activities", "Recent activities", _activity_lines, ("activities",), False),
+    ("decisions", "Pending decisions", _decision_lines, ("decisions",), False),
+]
+
+def _field_hash(project, key):
+    """
+    Hash one top-level project field.
+
+    Pickle is several times faster than JSON on large WBS lists; a
+    different key order only causes an unnecessary rebuild.
+    """
+    return hashlib.sha1(pickle.dumps(project.get(key), protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+class ProjectContextBuilder:
+    """
+    Builds a compact, prioritized project summary for LLM prompts.
+
+    Section lines are kept per project version, so sessions reading
+    different versions of a project (e.g. one with unsaved edits) do not
+    evict each other. A call with a known version and date reuses them as
+    is; for a new version only the sections whose source fields changed
+    since the project's latest built version are rebuilt. The budget is
+    applied per call, filling sections in priority order.
+    """
+
+    def __init__(self, size=CONTEXT_STATE_SIZE):
+        self.size = size
+        self._state = OrderedDict()
+        self._latest = {}
+        self._lock = threading.Lock()
+
+    def _sections(self, project, today):
+        name = project.get("name")
+        version = project_version(project)
+        with self._lock:
+            state = self._state.get((name, version))
+            if state is not None and version is not None and state["today"] == today:
+                self._state.move_to_end((name, version))
+                return state["sections"], 0
+            if state is None:
+                state = self._state.get(self._latest.get(name))
+
+        previous = state["sections"] if state else {}
+        sections = {}
+        rebuilt = 0
+        field_hashes = {}
+        for section, title, builder, keys, dated in CONTEXT_SECTIONS:
+            for key in keys:
+                if key not in field_hashes:
+                    field_hashes[key] = _field_hash(project, key)
+            fingerprint = tuple(field_hashes[key] for key in keys)
+            cached = previous.get(section)
+            if cached and cached["fingerprint"] == fingerprint and not (dated and state["today"] != today):
+                sections[section] = cached
+                continue
+            lines = builder(project, today)[:SECTION_LINE_LIMIT]
+            sections[section] = {
+                "fingerprint": fingerprint,
+                "title": title,
+                "lines": lines,
+                "tokens": [estimate_tokens(line) + 1 for line in lines],
+                "header_tokens": estimate_tokens(f"## {title}") + 1
+            }
+            rebuilt += 1
+
+        with self._lock:
+            self._state[(name, version)] = {"today": today, "sections": sections}
+            self._state.move_to_end((name, version))
+            self._latest[name] = (name, version)
+            while len(self._state) > self.size:
+                evicted, _ = self._state.popitem(last=False)
+                if self._latest.get(evicted[0]) == evicted:
+                    del self._latest[evicted[0]]
+        return sections, rebuilt
+
+    def build(self, project, budget=None, today=None):
+        """
+        Build the project context within a token budget.
+
+        Args:
+            project: Project dictionary
+            budget: Maximum number of tokens (defaults to CONTEXT_TOKEN_BUDGET)
+            today: Reference date (defaults to the current date)
+
+        Returns:
+            dict: text, tokens, budget, per-section token counts (sections),
+            sections cut short (truncated), sections rebuilt by this call
+            (rebuilt) and build time in milliseconds (build_ms)
+        """
+        start = time.perf_counter()
+        budget = budget or CONTEXT_TOKEN_BUDGET
+        today = today or datetime.datetime.now().date()
+        sections, rebuilt = self._sections(project, today)
+
+        parts = []
+        used = 0
+        section_tokens = {}
+        truncated = []
+        for section, _, _, _, _ in CONTEXT_SECTIONS:
+            content = sections[section]
+            if not content["lines"]:
+                continue
+            if used + content["header_tokens"] + content["tokens"][0] > budget:
+                truncated.append(section)
+                continue
+            parts.append(f"## {content['title']}")
+            spent = content["header_tokens"]
+            for line, tokens in zip(content["lines"], content["tokens"]):
+                if used + spent + tokens > budget:
+                    truncated.append(section)
+                    break
+                parts.append(f"- {line}")
+                spent += tokens
+            used += spent
+            section_tokens[section] = spent
+
+        text = "\n".join(parts)
+        return {
+            "text": text,
+            "tokens": used,
+            "budget": budget,
+            "sections": section_tokens,
+            "truncated": truncated,
+            "rebuilt": rebuilt,
+            "build_ms": (time.perf_counter() - start) * 1000
+        }
+
+_context_builder = ProjectContextBuilder()
+
+def build_project_context(project, budget=None, today=None):
+    """
+    Build the prompt context of a project with the process-wide builder.
+
+    Args:
+        project: Project dictionary
+        budget: Maximum number of tokens (defaults to CONTEXT_TOKEN_BUDGET)
+        today: Reference date (defaults to the current date)
+
+    Returns:
+        dict: Result of ProjectContextBuilder.build
+    """
+    return _context_builder.build(project, budget, today)
@@ -1,21 +1,38 @@
 import streamlit as st
-import pandas as pd
 import datetime
 import os
 import json
 
+from utils.project_store import ProjectView, get_project_store
+
 def load_sample_data():
     """
-    Create a sample project data structure.
+    Return this session's view of the sample project data.
+    
+    All sessions read the same snapshot of the projects from the process-wide
+    project store; the view only holds the session's selection and unsaved edits.
+    
     Returns:
-        dict: Sample project data
+        ProjectView: Project data of this session
     """
     # Check if sample data exists in session state
     if 'project_data' in st.session_state:
         return st.session_state.project_data
     
+    return ProjectView(get_project_store())
+
+def build_sample_portfolio(today=None):
+    """
+    Build the sample project data without touching session state.
+    
+    Args:
+        today: Reference date for the relative project dates (defaults to the current date)
+    
+    Returns:
+        dict: Sample project data
+    """
     # Get current date for relative date calculations
-    today = datetime.datetime.now().date()
+    today = today or datetime.datetime.now().date()
     
     # Create sample data structure
     project_data = {
@@ -435,27 +452,33 @@ def generate_sample_project_1(today):
     activities = [
         {
             "date": (today - datetime.timedelta(days=1)).strftime("%Y-%m-%d"),
-            "description": "Daily standup: Team reported progress on user authentication module."
+            "description": "Daily standup: Team reported progress on user authentication module.",
+            "author": "John Smith"
         },
         {
             "date": (today - datetime.timedelta(days=1)).strftime("%Y-%m-%d"),
-            "description": "Risk review meeting: Added new risk related to third-party API integration."
+            "description": "Risk review meeting: Added new risk related to third-party API integration.",
+            "author": "John Smith"
         },
         {
             "date": (today - datetime.timedelta(days=2)).strftime("%Y-%m-%d"),
-            "description": "Completed code review for data access layer components."
+            "description": "Completed code review for data access layer components.",
+            "author": "Alex Chen"
         },
         {
             "date": (today - datetime.timedelta(days=3)).strftime("%Y-%m-%d"),
-            "description": "Client demo of UI prototype, received positive feedback."
+            "description": "Client demo of UI prototype, received positive feedback.",
+            "author": "Sarah Williams"
         },
         {
             "date": (today - datetime.timedelta(days=5)).strftime("%Y-%m-%d"),
-            "description": "Updated project schedule based on current progress and resource availability."
+            "description": "Updated project schedule based on current progress and resource availability.",
+            "author": "John Smith"
         },
         {
             "date": (today - datetime.timedelta(days=7)).strftime("%Y-%m-%d"),
-            "description": "Technical design review for reporting module."
+            "description": "Technical design review for reporting module.",
+            "author": "Michael Chen"
         }
     ]
     
@@ -502,6 +525,7 @@ def generate_sample_project_1(today):
         "progress": round(weighted_progress),
         "status": "On Track",
         "elapsed_pct": elapsed_pct,
+        "version": 1,
         "wbs": wbs,
         "resources": resources,
         "raid": raid,
@@ -515,14 +539,49 @@ def generate_sample_project_1(today):
 
 def save_data(project_data):
     """
-    Save project data to session state.
-    This function would typically save to a database, but for this app we'll use session state.
+    Publish the session's project edits to all sessions and keep the view in session state.
     
     Args:
-        project_data: Dictionary of project data
+        project_data: ProjectView of this session
+        
+    Raises:
+        ProjectConflictError: When another session saved the same project first
     """
+    project_data.save()
     st.session_state.project_data = project_data
 
+def project_version(project):
+    """
+    Return the version counter of a project.
+    
+    The version identifies a state of the project data; caches of derived
+    values (metrics, summaries, indexes) are keyed on it.
+    
+    Args:
+        project: Project dictionary
+        
+    Returns:
+        int or None: Version, or None for projects that are not versioned
+    """
+    return project.get("version")
+
+def paginate_frame(df, page, page_size):
+    """
+    Slice one page out of a DataFrame.
+    
+    Args:
+        df: DataFrame to paginate
+        page: 1-based page number (clamped to the valid range)
+        page_size: Number of rows per page
+        
+    Returns:
+        tuple: (page DataFrame, clamped page number, total page count)
+    """
+    page_count = max(1, -(-len(df) // page_size))
+    page = min(max(1, int(page)), page_count)
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size], page, page_count
+
 def load_agile_knowledge():
     """
     Load Agile knowledge data from CSV or create if it doesn't exist.
@@ -534,6 +593,22 @@ def load_agile_knowledge():
     if 'agile_knowledge' in st.session_state:
         return st.session_state.agile_knowledge
     
+    df = build_agile_knowledge()
+    
+    # Store in session state
+    st.session_state.agile_knowledge = df
+    
+    return df
+
+def build_agile_knowledge():
+    """
+    Build the Agile knowledge data without touching session state.
+    
+    Returns:
+        DataFrame: Agile knowledge data with question and answer columns
+    """
+    import pandas as pd
+    
     # Define sample agile knowledge
     data = {
         "question": [
@@ -583,12 +658,7 @@ def load_agile_knowledge():
     }
     
     # Create DataFrame
-    df = pd.DataFrame(data)
-    
-    # Store in session state
-    st.session_state.agile_knowledge = df
-    
-    return df
+    return pd.DataFrame(data)
 
 def load_pm_knowledge():
     """
@@ -601,6 +671,22 @@ def load_pm_knowledge():
     if 'pm_knowledge' in st.session_state:
         return st.session_state.pm_knowledge
     
+    df = build_pm_knowledge()
+    
+    # Store in session state
+    st.session_state.pm_knowledge = df
+    
+    return df
+
+def build_pm_knowledge():
+    """
+    Build the Project Management knowledge data without touching session state.
+    
+    Returns:
+        DataFrame: PM knowledge data with question and answer columns
+    """
+    import pandas as pd
+    
     # Define sample PM knowledge
     data = {
         "question": [
@@ -650,12 +736,7 @@ def load_pm_knowledge():
     }
     
     # Create DataFrame
-    df = pd.DataFrame(data)
-    
-    # Store in session state
-    st.session_state.pm_knowledge = df
-    
-    return df
+    return pd.DataFrame(data)
 
 def generate_sample_project_2(today):
     """
@@ -890,8 +971,8 @@ def generate_sample_project_2(today):
             "id": "4.4",
             "task": "Integration Development",
             "description": "Develop integrations with existing systems",
-            "start_date": (project_start + datetime.timedelta(days)(160)).strftime("%Y-%m-%d"),
-            "end_date": (project_start + datetime.timedelta(days)(190)).strftime("%Y-%m-%d"),
+            "start_date": (project_start + datetime.timedelta(days=160)).strftime("%Y-%m-%d"),
+            "end_date": (project_start + datetime.timedelta(days=190)).strftime("%Y-%m-%d"),
             "duration": 30,
             "progress": 10,
             "assigned_to": "James Lee",
@@ -1342,27 +1423,33 @@ def generate_sample_project_2(today):
     activities = [
         {
             "date": (today - datetime.timedelta(days=1)).strftime("%Y-%m-%d"),
-            "description": "Weekly status meeting: Reviewed progress on data model design and development tasks."
+            "description": "Weekly status meeting: Reviewed progress on data model design and development tasks.",
+            "author": "Jennifer Adams"
         },
         {
             "date": (today - datetime.timedelta(days=2)).strftime("%Y-%m-%d"),
-            "description": "Technical review meeting for integration approach with CRM system."
+            "description": "Technical review meeting for integration approach with CRM system.",
+            "author": "Robert Kim"
         },
         {
             "date": (today - datetime.timedelta(days=3)).strftime("%Y-%m-%d"),
-            "description": "Stakeholder meeting with Finance department to review requirements for tax calculation."
+            "description": "Stakeholder meeting with Finance department to review requirements for tax calculation.",
+            "author": "Marcus Wright"
         },
         {
             "date": (today - datetime.timedelta(days=5)).strftime("%Y-%m-%d"),
-            "description": "Risk review meeting: Identified new risk related to data migration complexity."
+            "description": "Risk review meeting: Identified new risk related to data migration complexity.",
+            "author": "Jennifer Adams"
         },
         {
             "date": (today - datetime.timedelta(days=7)).strftime("%Y-%m-%d"),
-            "description": "Demo of UI prototype to key users from HR department."
+            "description": "Demo of UI prototype to key users from HR department.",
+            "author": "Lisa Johnson"
         },
         {
             "date": (today - datetime.timedelta(days=8)).strftime("%Y-%m-%d"),
-            "description": "Technical environment setup for development team."
+            "description": "Technical environment setup for development team.",
+            "author": "James Lee"
         }
     ]
     
@@ -1418,6 +1505,7 @@ def generate_sample_project_2(today):
         "progress": round(weighted_progress),
         "status": "On Track",
         "elapsed_pct": elapsed_pct,
+        "version": 1,
         "wbs": wbs,
         "resources": resources,
         "raid": raid,
@@ -1427,4 +1515,186 @@ def generate_sample_project_2(today):
         "scope_changes": scope_changes
     }
     
-    return project
\ No newline at end of file
+    return project
+
+def generate_synthetic_project(task_count, today=None, seed=0):
+    """
+    Generate a project of arbitrary size for benchmarks and load tests.
+    
+    The WBS has task_count tasks with dependencies on earlier tasks, and the
+    other collections grow with it (one resource per 20 tasks, one risk per
+    100 tasks, ...), so every dashboard computation and chart scales.
+    Output is deterministic for a given seed and date.
+    
+    Args:
+        task_count: Number of WBS tasks
+        today: Current date (defaults to the current date)
+        seed: Random seed
+        
+    Returns:
+        dict: Project data with the same structure as the sample projects
+    """
+    import random
+    
+    rng = random.Random(seed)
+    today = today or datetime.datetime.now().date()
+    project_start = today - datetime.timedelta(days=180)
+    project_end = today + datetime.timedelta(days=180)
+    span = (project_end - project_start).days
+    
+    roles = ["Project Manager", "Business Analyst", "Architect", "Developer", "QA Engineer", "Designer"]
+    resource_count = max(5, task_count // 20)
+    resources = [
+        {
+            "name": f"Resource {i + 1}",
+            "role": roles[i % len(roles)],
+            "availability": 160,
+            "allocated": rng.randrange(40, 200, 10),
+            "skills": [roles[i % len(roles)]]
+        }
+        for i in range(resource_count)
+    ]
+    
+    # Tasks depend on up to two of the 50 preceding tasks
+    wbs = []
+    for i in range(task_count):
+        start = project_start + datetime.timedelta(days=rng.randrange(span))
+        duration = rng.randint(1, 20)
+        progress = rng.choice([0, 0, 25, 50, 75, 90, 100, 100])
+        dependencies = sorted({str(rng.randrange(max(0, i - 50), i) + 1) for _ in range(rng.randint(0, 2))}) if i else []
+        wbs.append({
+            "id": str(i + 1),
+            "task": f"Task {i + 1}",
+            "description": f"Synthetic task {i + 1}",
+            "start_date": start.strftime("%Y-%m-%d"),
+            "end_date": (start + datetime.timedelta(days=duration)).strftime("%Y-%m-%d"),
+            "duration": duration,
+            "progress": progress,
+            "assigned_to": resources[rng.randrange(resource_count)]["name"],
+            "dependencies": dependencies,
+            "critical": rng.random() < 0.2,
+            "milestone": rng.random() < 0.1
+        })
+    
+    def owner():
+        return resources[rng.randrange(resource_count)]["name"]
+    
+    def past_date(days):
+        return (today - datetime.timedelta(days=rng.randrange(days))).strftime("%Y-%m-%d")
+    
+    levels = ["Low", "Medium", "High"]
+    raid = {
+        "risks": [
+            {
+                "id": f"R{i + 1}",
+                "title": f"Risk {i + 1}",
+                "description": f"Synthetic risk {i + 1}",
+                "probability": rng.choice(levels),
+                "impact": rng.choice(levels),
+                "severity": rng.choice(levels),
+                "mitigation": rng.choice(["", "Mitigation plan in place."]),
+                "owner": rng.choice(["", owner()]),
+                "status": rng.choice(["Open", "Open", "Closed"])
+            }
+            for i in range(max(4, task_count // 100))
+        ],
+        "assumptions": [
+            {
+                "id": f"A{i + 1}",
+                "description": f"Synthetic assumption {i + 1}",
+                "validation_method": rng.choice(["", "Review with stakeholders."]),
+                "status": rng.choice(["Validated", "Not Validated"])
+            }
+            for i in range(max(3, task_count // 200))
+        ],
+        "issues": [
+            {
+                "id": f"I{i + 1}",
+                "title": f"Issue {i + 1}",
+                "description": f"Synthetic issue {i + 1}",
+                "priority": rng.choice(levels),
+                "raised_date": past_date(60),
+                "owner": owner(),
+                "status": rng.choice(["Open", "In Progress", "Resolved"])
+            }
+            for i in range(max(2, task_count // 100))
+        ],
+        "dependencies": [
+            {
+                "id": f"D{i + 1}",
+                "description": f"Synthetic dependency {i + 1}",
+                "type": rng.choice(["Internal", "External"]),
+                "owner": owner(),
+                "due_date": (today + datetime.timedelta(days=rng.randint(-30, 60))).strftime("%Y-%m-%d"),
+                "status": rng.choice(["Completed", "On Track", "At Risk"])
+            }
+            for i in range(max(3, task_count // 200))
+        ]
+    }
+    
+    phrases = [
+        "The API documentation is incomplete and slows development.",
+        "Test automation is making good progress.",
+        "Design changes keep affecting our velocity.",
+        "Stakeholders are happy with the new features.",
+        "We need more clarity on the integration requirements."
+    ]
+    team_feedback = [
+        {"member": owner(), "date": past_date(30), "content": rng.choice(phrases)}
+        for _ in range(max(4, task_count // 100))
+    ]
+    
+    decisions = [
+        {
+            "id": f"D{i + 1}",
+            "title": f"Decision {i + 1}",
+            "description": f"Synthetic decision {i + 1}",
+            "date": past_date(180),
+            "owner": owner(),
+            "status": rng.choice(["Approved", "Approved", "Pending", "Under Review", "Rejected"]),
+            "impact": "Synthetic impact."
+        }
+        for i in range(max(4, task_count // 100))
+    ]
+    
+    activities = [
+        {"date": past_date(90), "description": f"Synthetic activity {i + 1}", "author": owner()}
+        for i in range(max(6, task_count // 10))
+    ]
+    
+    scope_changes = [
+        {
+            "id": f"SC{i + 1}",
+            "title": f"Scope change {i + 1}",
+            "description": f"Synthetic scope change {i + 1}",
+            "requested_by": owner(),
+            "date": past_date(180),
+            "status": rng.choice(["Approved", "Pending", "Rejected"]),
+            "impact": "Synthetic impact."
+        }
+        for i in range(max(2, task_count // 500))
+    ]
+    
+    total_duration = sum(task["duration"] for task in wbs) or 1
+    progress = round(sum(task["progress"] * task["duration"] for task in wbs) / total_duration)
+    
+    return {
+        "name": f"Synthetic Project ({task_count} tasks)",
+        "description": f"Synthetic project with {task_count} tasks for benchmarks.",
+        "start_date": project_start.strftime("%Y-%m-%d"),
+        "end_date": project_end.strftime("%Y-%m-%d"),
+        "budget": 1000 * task_count,
+        "budget_spent": 500 * task_count,
+        "budget_spent_pct": 50,
+        "progress": progress,
+        "status": "On Track",
+        "elapsed_pct": 50,
+        "version": 1,
+        "wbs": wbs,
+        "resources": resources,
+        "raid": raid,
+        "team_feedback": team_feedback,
+        "decisions": decisions,
+        "activities": activities,
+        "scope_changes": scope_changes
+    }
@@ -0,0 +1,197 @@
+import heapq
+import math
+import re
+import threading
+from collections import defaultdict
+
+# Words ignored when indexing and querying
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "define", "do",
+    "does", "explain", "for", "from", "how", "i", "in", "is", "it", "me",
+    "mean", "meaning", "of", "on", "or", "please", "tell", "that", "the",
+    "this", "to", "what", "whats", "when", "which", "who", "why", "with"
+}
+
+def normalize_term(word):
+    """
+    Drop the plural "s" ending of a lower-case word, so that e.g. "risks" matches "risk".
+
+    Words of up to three letters and "ss" endings are kept as they are.
+    """
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+def tokenize(text):
+    """
+    Split text into lower-case index terms without stop words.
+
+    Apostrophes are dropped first, so "what's" is the stop word "whats" and
+    "project's" the term "project". Terms are normalized with normalize_term.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        list: Terms in order of appearance
+    """
+    text = text.lower().replace("'", "").replace("\u2019", "")
+    return [normalize_term(word) for word in re.findall(r"[a-z0-9]+", text) if word not in STOP_WORDS]
+
+class BM25Index:
+    """
+    Inverted index with Okapi BM25 ranking.
+
+    Document lengths do not change after building, so each posting stores the
+    document's final BM25 weight for its term; a query only sums the weights
+    of the postings of its terms.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+
+    def build(self, documents):
+        """
+        Index documents given as lists of (text, weight) fields.
+
+        Args:
+            documents: Iterable of field lists; a field weight of 2 counts
+                its terms twice (e.g. for questions versus answers)
+
+        Returns:
+            BM25Index: self
+        """
+        frequencies_by_term = defaultdict(list)
+        doc_lengths = []
+        for doc_number, fields in enumerate(documents):
+            frequencies = defaultdict(float)
+            length = 0.0
+            for text, weight in fields:
+                for term in tokenize(text):
+                    frequencies[term] += weight
+                    length += weight
+            for term, frequency in frequencies.items():
+                frequencies_by_term[term].append((doc_number, frequency))
+            doc_lengths.append(length)
+
+        doc_count = len(doc_lengths)
+        avg_doc_length = (sum(doc_lengths) / doc_count) if doc_count else 0.0
+        k1 = self.k1
+        self.postings = {}
+        for term, postings in frequencies_by_term.items():
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            self.postings[term] = [
+                (doc_number, idf * frequency * (k1 + 1) / (
+                    frequency + k1 * (1 - self.b + self.b * doc_lengths[doc_number] / avg_doc_length)
+                ))
+                for doc_number, frequency in postings
+            ]
+        return self
+
+    def search(self, query, k=5):
+        """
+        Rank documents for a query.
+
+        Args:
+            query: Query text
+            k: Number of results
+
+        Returns:
+            list: (score, document number) pairs, best first
+        """
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            for doc_number, weight in self.postings.get(term, ()):
+                scores[doc_number] += weight
+        return heapq.nlargest(k, ((score, doc) for doc, score in scores.items()))
+
+class KnowledgeIndex:
+    """BM25 retriever over question/answer knowledge entries."""
+
+    def __init__(self, entries):
+        """
+        Args:
+            entries: List of dicts with question, answer and source keys
+        """
+        self.entries = entries
+        self.index = BM25Index().build(
+            [(entry["question"], 2.0), (entry["answer"], 1.0)] for entry in entries
+        )
+        # Question terms -> first entry asking it, for exact question lookups
+        self.questions = {}
+        for entry in entries:
+            self.questions.setdefault(frozenset(tokenize(entry["question"])), entry)
+
+    def search(self, query, k=3):
+        """
+        Return the best matching knowledge entries.
+
+        Args:
+            query: Question text
+            k: Number of results
+
+        Returns:
+            list: Entries with an added score, best first
+        """
+        return [
+            dict(self.entries[doc_number], score=score)
+            for score, doc_number in self.index.search(query, k)
+        ]
+
+    def answer(self, query):
+        """
+        Answer a definitional question locally when a knowledge entry asks the same thing.
+
+        An entry is used only when its question has exactly the same terms
+        as the query (e.g. "What is SPI?" and "define spi"), so questions
+        about the user's own project still go to the model.
+
+        Args:
+            query: Question text
+
+        Returns:
+            dict or None: Matching entry, or None when the model should answer
+        """
+        terms = frozenset(tokenize(query))
+        if not terms:
+            return None
+        return self.questions.get(terms)
+
+    def context(self, query, k=3):
+        """
+        Format the top passages for a query as grounding context for the model.
+
+        Args:
+            query: Question text
+            k: Number of passages
+
+        Returns:
+            str: Passages, or an empty string when nothing matches
+        """
+        return "\n\n".join(
+            f"Q: {entry['question']}\nA: {entry['answer']}"
+            for entry in self.search(query, k)
+        )
+
+def knowledge_entries():
+    """Collect the Agile and PM knowledge bases as index entries."""
+    from utils.data_utils import build_agile_knowledge, build_pm_knowledge
+
+    entries = []
+    for source, df in (("Agile", build_agile_knowledge()), ("Project Management", build_pm_knowledge())):
+        for question, answer in zip(df["question"], df["answer"]):
+            entries.append({"question": question, "answer": answer, "source": source})
+    return entries
+
+_knowledge_index = None
+_knowledge_index_lock = threading.Lock()
+
+def get_knowledge_index():
+    """Return the process-wide knowledge index, building it on first use."""
+    global _knowledge_index
+    with _knowledge_index_lock:
+        if _knowledge_index is None:
+            _knowledge_index = KnowledgeIndex(knowledge_entries())
+        return _knowledge_index
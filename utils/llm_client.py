@@ -0,0 +1,138 @@
+import os
+import time
+
+# Model used by the assistant; any OpenAI-compatible endpoint can be used by
+# setting OPENAI_BASE_URL (e.g. the local mock server in utils/mock_llm_server.py)
+DEFAULT_MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
+
+SYSTEM_PROMPT = (
+    "You are AI PM Buddy, an assistant for project managers. Answer concisely "
+    "in Markdown. Use the project context you are given when the question is "
+    "about the current project, and say so when the context does not contain "
+    "the answer."
+)
+
+def get_client(api_key=None, base_url=None, timeout=60.0):
+    """
+    Create an OpenAI-compatible chat client.
+
+    Args:
+        api_key: API key (defaults to OPENAI_API_KEY)
+        base_url: API base URL (defaults to OPENAI_BASE_URL or the OpenAI API)
+        timeout: Request timeout in seconds
+
+    Returns:
+        openai.OpenAI client
+    """
+    from openai import OpenAI
+
+    return OpenAI(
+        api_key=api_key or os.environ.get("OPENAI_API_KEY"),
+        base_url=base_url or os.environ.get("OPENAI_BASE_URL") or None,
+        timeout=timeout
+    )
+
+def build_messages(history, system_prompt=SYSTEM_PROMPT, context=None):
+    """
+    Build the message list sent to the model from the chat history.
+
+    Args:
+        history: List of {"role", "content"} chat messages
+        system_prompt: System instructions prepended to the conversation
+        context: Optional grounding text (knowledge passages, project
+            summary) appended to the system instructions
+
+    Returns:
+        list: Messages in OpenAI chat format
+    """
+    if context:
+        system_prompt = f"{system_prompt}\n\n{context}"
+    messages = [{"role": "system", "content": system_prompt}]
+    messages.extend({"role": m["role"], "content": m["content"]} for m in history)
+    return messages
+
+def stream_chat(messages, model=None, client=None, cancel_event=None, temperature=0.3):
+    """
+    Stream a chat completion token by token.
+
+    The HTTP stream is closed as soon as the generator is closed or garbage
+    collected (e.g. when Streamlit interrupts the script for a rerun) or when
+    cancel_event is set, so a cancelled answer stops consuming tokens.
+
+    Args:
+        messages: Messages in OpenAI chat format
+        model: Model name (defaults to DEFAULT_MODEL)
+        client: Optional client from get_client
+        cancel_event: Optional threading.Event that stops the stream when set
+        temperature: Sampling temperature
+
+    Yields:
+        str: Text deltas as they arrive
+    """
+    client = client or get_client()
+    stream = client.chat.completions.create(
+        model=model or DEFAULT_MODEL,
+        messages=messages,
+        temperature=temperature,
+        stream=True
+    )
+    try:
+        for chunk in stream:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+    finally:
+        stream.close()
+
+def complete_chat(messages, model=None, client=None, temperature=0.3):
+    """
+    Request a chat completion without streaming.
+
+    Args:
+        messages: Messages in OpenAI chat format
+        model: Model name (defaults to DEFAULT_MODEL)
+        client: Optional client from get_client
+        temperature: Sampling temperature
+
+    Returns:
+        str: Completion text
+    """
+    client = client or get_client()
+    response = client.chat.completions.create(
+        model=model or DEFAULT_MODEL,
+        messages=messages,
+        temperature=temperature
+    )
+    return response.choices[0].message.content or ""
+
+def measure_stream(messages, model=None, client=None):
+    """
+    Stream a completion and measure its latency.
+
+    Args:
+        messages: Messages in OpenAI chat format
+        model: Model name (defaults to DEFAULT_MODEL)
+        client: Optional client from get_client
+
+    Returns:
+        dict: ttft_s (time to first token), total_s, chunks and chars
+    """
+    start = time.perf_counter()
+    first_token = None
+    chunks = 0
+    chars = 0
+    for delta in stream_chat(messages, model=model, client=client):
+        if first_token is None:
+            first_token = time.perf_counter() - start
+        chunks += 1
+        chars += len(delta)
+    return {
+        "ttft_s": first_token,
+        "total_s": time.perf_counter() - start,
+        "chunks": chunks,
+        "chars": chars
+    }
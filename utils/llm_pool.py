@@ -0,0 +1,365 @@
+"""
+Concurrent LLM requests for batch insight generation.
+
+AsyncLLMPool runs chat completions on asyncio with bounded concurrency, a
+requests-per-minute limit, retries with jittered exponential backoff and
+de-duplication of identical in-flight requests. generate_insights uses it
+to produce the AI Insight Summary of every project in parallel and stores
+the results in InsightStore for the dashboard.
+
+Against the local mock server:
+
+    python -m utils.llm_pool --projects 20 --concurrency 8 --error-rate 0.2
+"""
+import argparse
+import asyncio
+import datetime
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from utils.context_builder import build_project_context
+from utils.llm_client import DEFAULT_MODEL, build_messages
+from utils.response_cache import project_snapshot_hash
+
+# Pool limits; the rate limit is per process
+LLM_CONCURRENCY = int(os.environ.get("LLM_CONCURRENCY", 4))
+LLM_RATE_LIMIT = float(os.environ.get("LLM_RATE_LIMIT", 60))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", 4))
+
+INSIGHTS_PATH = os.environ.get(
+    "INSIGHTS_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "insights.sqlite3")
+)
+
+# Insight kinds shown on the AI Insight Summary tab: kind -> (title, instruction)
+INSIGHT_KINDS = {
+    "schedule": (
+        "Schedule Risk Analysis",
+        "Assess the schedule: compare progress with elapsed time, name overdue or "
+        "slipping milestones and over-allocated people, and recommend one action."
+    ),
+    "budget": (
+        "Budget Forecast",
+        "Forecast the budget at completion from the spend and progress figures and "
+        "recommend one cost-control measure."
+    ),
+    "risk": (
+        "Risk Pattern Detection",
+        "Identify patterns across the open risks, issues and dependencies and "
+        "recommend one mitigation."
+    ),
+}
+
+INSIGHT_INSTRUCTIONS = "Answer in at most three sentences of plain text, without headings."
+
+class RateLimiter:
+    """Token bucket limiting how many requests start per minute, with bursts of up to 10 seconds' worth."""
+
+    def __init__(self, per_minute):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * 10)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request may start."""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+def _is_retryable(error):
+    """Rate limits, timeouts, connection errors and server errors are worth retrying."""
+    import openai
+
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+class AsyncLLMPool:
+    """
+    Bounded, rate-limited and de-duplicating pool of chat completion requests.
+
+    The pool belongs to one event loop; create it inside the coroutine that
+    uses it (see run_insight_batch).
+    """
+
+    def __init__(self, client=None, concurrency=LLM_CONCURRENCY, rate_per_minute=LLM_RATE_LIMIT,
+                 max_retries=LLM_MAX_RETRIES, base_delay=0.5, max_delay=8.0, model=None):
+        """
+        Args:
+            client: Optional openai.AsyncOpenAI client; retries are done by the
+                pool, so the client's own retries should be disabled
+            concurrency: Maximum number of requests in flight
+            rate_per_minute: Maximum number of requests started per minute
+                (0 disables the limit)
+            max_retries: Retries per request after the first attempt
+            base_delay: Backoff before the first retry, doubled per attempt
+            max_delay: Upper bound of the backoff
+            model: Model name (defaults to DEFAULT_MODEL)
+        """
+        if client is None:
+            from openai import AsyncOpenAI
+
+            client = AsyncOpenAI(
+                api_key=os.environ.get("OPENAI_API_KEY"),
+                base_url=os.environ.get("OPENAI_BASE_URL") or None,
+                max_retries=0
+            )
+        self.client = client
+        self.model = model or DEFAULT_MODEL
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._rate_limiter = RateLimiter(rate_per_minute)
+        self._in_flight = {}
+        self.stats = {"requests": 0, "retries": 0, "deduplicated": 0, "failures": 0}
+
+    async def complete(self, messages, temperature=0.3):
+        """
+        Request a chat completion.
+
+        Identical requests made while one is in flight share its result.
+
+        Args:
+            messages: Messages in OpenAI chat format
+            temperature: Sampling temperature
+
+        Returns:
+            str: Completion text
+
+        Raises:
+            openai.OpenAIError: When the request still fails after max_retries retries
+        """
+        key = hashlib.sha256(
+            json.dumps([self.model, temperature, messages], sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats["deduplicated"] += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(self._complete_with_retries(messages, temperature))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _complete_with_retries(self, messages, temperature):
+        attempt = 0
+        while True:
+            await self._rate_limiter.acquire()
+            async with self._semaphore:
+                self.stats["requests"] += 1
+                try:
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=temperature
+                    )
+                    return response.choices[0].message.content or ""
+                except Exception as error:
+                    if attempt >= self.max_retries or not _is_retryable(error):
+                        self.stats["failures"] += 1
+                        raise
+            # Full jitter: sleep a random share of the exponential backoff
+            attempt += 1
+            self.stats["retries"] += 1
+            await asyncio.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))))
+
+def insight_messages(project, kind):
+    """
+    Build the model request for one insight about a project.
+
+    Args:
+        project: Project dictionary
+        kind: Key of INSIGHT_KINDS
+
+    Returns:
+        list: Messages in OpenAI chat format
+    """
+    title, instruction = INSIGHT_KINDS[kind]
+    context = f"Current project state:\n\n{build_project_context(project)['text']}"
+    return build_messages(
+        [{"role": "user", "content": f"{title}: {instruction} {INSIGHT_INSTRUCTIONS}"}],
+        context=context
+    )
+
+async def generate_insights(projects, pool, kinds=None):
+    """
+    Generate insights for several projects concurrently.
+
+    Args:
+        projects: List of project dictionaries
+        pool: AsyncLLMPool
+        kinds: Insight kinds (defaults to all INSIGHT_KINDS)
+
+    Returns:
+        dict: Project name -> kind -> {"content"} or {"error"}
+    """
+    kinds = kinds or list(INSIGHT_KINDS)
+    jobs = [(project, kind) for project in projects for kind in kinds]
+    results = await asyncio.gather(
+        *(pool.complete(insight_messages(project, kind)) for project, kind in jobs),
+        return_exceptions=True
+    )
+
+    insights = {}
+    for (project, kind), result in zip(jobs, results):
+        if isinstance(result, Exception):
+            insights.setdefault(project["name"], {})[kind] = {"error": str(result)}
+        else:
+            insights.setdefault(project["name"], {})[kind] = {"content": result}
+    return insights
+
+class InsightStore:
+    """
+    Generated insights per project, stored in SQLite.
+
+    Each insight records the snapshot of the project it was generated from,
+    so the dashboard can tell whether it is still current.
+    """
+
+    def __init__(self, path=INSIGHTS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS insights (
+                project TEXT,
+                kind TEXT,
+                snapshot TEXT,
+                content TEXT,
+                generated REAL,
+                PRIMARY KEY (project, kind)
+            )
+        """)
+        self._conn.commit()
+
+    def put(self, project, kind, content):
+        """Store an insight generated from the current state of a project."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO insights VALUES (?, ?, ?, ?, ?)",
+                (project["name"], kind, project_snapshot_hash(project), content, time.time())
+            )
+            self._conn.commit()
+
+    def get(self, project):
+        """
+        Return the stored insights of a project.
+
+        Args:
+            project: Project dictionary
+
+        Returns:
+            dict: Kind -> {"content", "generated", "current"}
+        """
+        snapshot = project_snapshot_hash(project)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, snapshot, content, generated FROM insights WHERE project = ?",
+                (project["name"],)
+            ).fetchall()
+        return {
+            kind: {"content": content, "generated": generated, "current": stored_snapshot == snapshot}
+            for kind, stored_snapshot, content, generated in rows
+        }
+
+def run_insight_batch(projects, store=None, client=None, **pool_options):
+    """
+    Generate and store insights for several projects.
+
+    Blocks until every request has finished; safe to call from a Streamlit
+    script or any other thread without a running event loop.
+
+    Args:
+        projects: List of project dictionaries
+        store: InsightStore (defaults to the process-wide store)
+        client: Optional openai.AsyncOpenAI client
+        **pool_options: AsyncLLMPool options (concurrency, rate_per_minute, ...)
+
+    Returns:
+        dict: insights (see generate_insights), stats of the pool and elapsed_s
+    """
+    store = store or get_insight_store()
+
+    async def run():
+        pool = AsyncLLMPool(client=client, **pool_options)
+        try:
+            return await generate_insights(projects, pool), pool.stats
+        finally:
+            await pool.client.close()
+
+    start = time.perf_counter()
+    insights, stats = asyncio.run(run())
+    projects_by_name = {project["name"]: project for project in projects}
+    for name, results in insights.items():
+        for kind, result in results.items():
+            if "content" in result:
+                store.put(projects_by_name[name], kind, result["content"])
+    return {"insights": insights, "stats": stats, "elapsed_s": time.perf_counter() - start}
+
+_insight_store = None
+_insight_store_lock = threading.Lock()
+
+def get_insight_store():
+    """Return the process-wide insight store, opening it on first use."""
+    global _insight_store
+    with _insight_store_lock:
+        if _insight_store is None:
+            _insight_store = InsightStore()
+        return _insight_store
+
+def main(argv=None):
+    from openai import AsyncOpenAI
+
+    from utils.data_utils import generate_sample_project_1, generate_sample_project_2
+    from utils.mock_llm_server import start_mock_server
+
+    parser = argparse.ArgumentParser(description="Generate insights for sample projects against the mock server.")
+    parser.add_argument("--projects", type=int, default=10, help="Number of projects")
+    parser.add_argument("--concurrency", type=int, default=LLM_CONCURRENCY)
+    parser.add_argument("--rate-limit", type=float, default=0, help="Requests per minute (0 disables)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of mock requests failing with HTTP 429")
+    parser.add_argument("--latency", type=float, default=0.5, help="Mock response latency in seconds")
+    args = parser.parse_args(argv)
+
+    today = datetime.datetime.now().date()
+    generators = [generate_sample_project_1, generate_sample_project_2]
+    projects = []
+    for number in range(args.projects):
+        project = generators[number % 2](today)
+        project["name"] = f"{project['name']} {number + 1}"
+        projects.append(project)
+
+    server, base_url = start_mock_server(first_token_delay=args.latency, error_rate=args.error_rate)
+    try:
+        for concurrency in sorted({1, args.concurrency}):
+            client = AsyncOpenAI(api_key="mock", base_url=base_url, max_retries=0)
+            result = run_insight_batch(
+                projects, store=InsightStore(":memory:"), client=client, concurrency=concurrency,
+                rate_per_minute=args.rate_limit, base_delay=0.05
+            )
+            errors = sum("error" in r for results in result["insights"].values() for r in results.values())
+            print(f"concurrency {concurrency}: {result['elapsed_s']:.2f} s, {result['stats']}, errors {errors}")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
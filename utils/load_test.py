@@ -0,0 +1,282 @@
+"""
+Headless multi-session load test of the Streamlit app.
+
+Drives app_v2.py through Streamlit's AppTest with N simulated sessions on a
+synthetic portfolio. Each session switches projects, changes dashboard tabs,
+moves between pages, edits task progress without saving and chats with the
+assistant (answered by the local mock LLM server). The report covers rerun
+latency percentiles, overall and per action, as well as throughput, resident
+memory and session state size per session:
+
+    python -m utils.load_test --sessions 20 --steps 15 --projects 3 --tasks 1000
+
+AppTest is not thread-safe (it installs a process-wide mock runtime), so
+sessions take turns, one rerun at a time, in round-robin order. All sessions
+share the process, as they do on a real server, so caches and memory are
+shared the same way. CPU-bound reruns are serialized by the GIL on a real
+server too.
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_FILE = os.path.join(ROOT_DIR, "app_v2.py")
+
+DASHBOARD_TABS = ["Overview", "Key Milestones", "Resource Status", "AI Insight Summary"]
+
+QUESTIONS = [
+    "What are the top risks?",
+    "Summarize the budget status",
+    "Which milestones are overdue?",
+    "What is SPI?",
+    "Draft a status report for the steering committee",
+    "Who is over-allocated?",
+    "What is a burndown chart?",
+    "How can we recover the schedule?",
+]
+
+# Relative frequency of the simulated user actions
+ACTION_WEIGHTS = {"tab": 4, "project": 2, "chat": 2, "page": 1, "edit": 1}
+
+def current_rss_mb():
+    """Return the current resident set size of the process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        # Peak instead of current RSS where /proc is not available
+        unit = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2 ** 20
+
+def synthetic_portfolio(projects, tasks, seed=0):
+    """
+    Build a synthetic portfolio.
+
+    Args:
+        projects: Number of projects
+        tasks: Tasks per project
+        seed: Random seed of the first project
+
+    Returns:
+        dict: selected_project and projects (name -> project)
+    """
+    from utils.data_utils import generate_synthetic_project
+
+    today = datetime.datetime.now().date()
+    portfolio = {}
+    for number in range(projects):
+        project = generate_synthetic_project(tasks, today, seed=seed + number)
+        project["name"] = f"Synthetic Project {number + 1}"
+        portfolio[project["name"]] = project
+    return {"selected_project": next(iter(portfolio)), "projects": portfolio}
+
+class SimulatedSession:
+    """One user session driving its own AppTest instance."""
+
+    def __init__(self, number, seed):
+        from streamlit.testing.v1 import AppTest
+
+        self.number = number
+        self.rng = random.Random(seed)
+        self.app = AppTest.from_file(APP_FILE, default_timeout=120)
+        self.page = "Dashboard"
+        self.errors = []
+
+    def _run(self, action, results):
+        start = time.perf_counter()
+        self.app.run()
+        results.append((action, time.perf_counter() - start))
+        for exception in self.app.exception:
+            self.errors.append(f"{action}: {exception.value}")
+
+    def _go_to(self, page, results):
+        if self.page != page:
+            self.app.sidebar.radio[0].set_value(page)
+            self.page = page
+            self._run("page", results)
+
+    def start(self, results):
+        """Open the app on the dashboard."""
+        self._run("open", results)
+
+    def step(self, results):
+        """Perform one random user action, appending (action, seconds) for each rerun."""
+        actions = list(ACTION_WEIGHTS)
+        action = self.rng.choices(actions, weights=[ACTION_WEIGHTS[a] for a in actions])[0]
+
+        if action == "tab":
+            self._go_to("Dashboard", results)
+            self.app.session_state["dashboard_tab"] = self.rng.choice(DASHBOARD_TABS)
+            self._run("tab", results)
+        elif action == "project":
+            self._go_to("Dashboard", results)
+            selectbox = next(s for s in self.app.selectbox if s.label == "Project")
+            selectbox.set_value(self.rng.choice(selectbox.options))
+            self._run("project", results)
+        elif action == "chat":
+            self._go_to("AI Assistant", results)
+            self.app.chat_input[0].set_value(self.rng.choice(QUESTIONS))
+            self._run("chat", results)
+        elif action == "edit":
+            # Unsaved edits stay in the session's view until the memory caps park them
+            self._go_to("Dashboard", results)
+            view = self.app.session_state["project_data"]
+            task = self.rng.choice(view.edit()["wbs"])
+            task["progress"] = self.rng.choice([0, 25, 50, 75, 100])
+            view.changed()
+            self._run("edit", results)
+        else:
+            self._go_to("AI Assistant" if self.page == "Dashboard" else "Dashboard", results)
+
+def _percentiles(values):
+    ordered = sorted(values)
+
+    def at(percent):
+        return ordered[max(0, -(-len(ordered) * percent // 100) - 1)] * 1000
+
+    return {"p50_ms": at(50), "p95_ms": at(95), "p99_ms": at(99), "max_ms": ordered[-1] * 1000}
+
+def run_load_test(sessions=10, steps=15, projects=3, tasks=1000, seed=0, llm_latency=0.05, log=None):
+    """
+    Run the load test.
+
+    Args:
+        sessions: Number of simulated sessions
+        steps: User actions per session
+        projects: Projects in the synthetic portfolio
+        tasks: Tasks per project
+        seed: Random seed
+        llm_latency: Mock LLM time to first token in seconds
+        log: Optional callable receiving progress lines
+
+    Returns:
+        dict: Report with reruns, wall_s, reruns_per_s, latency percentiles
+        (overall and by action), rss_baseline_mb (after a warm-up session),
+        rss_end_mb, rss_per_session_mb, session_state_mb (mean and max deep
+        size), parked_edits, shared_store_mb and errors
+    """
+    from utils.mock_llm_server import start_mock_server
+    from utils.project_store import get_project_store
+    from utils.session_memory import deep_sizeof
+    from utils.shared_store import get_shared_store
+
+    server, base_url = start_mock_server(first_token_delay=llm_latency, token_delay=0)
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["OPENAI_API_KEY"] = "mock"
+    try:
+        # All sessions view the portfolio through the shared project store
+        portfolio = synthetic_portfolio(projects, tasks, seed)
+        get_project_store().publish(portfolio["projects"], portfolio["selected_project"])
+        # A throwaway session imports the app's modules, so the memory
+        # measured afterwards is what each additional session costs
+        SimulatedSession(-1, seed).start([])
+        rss_baseline = current_rss_mb()
+
+        results = []
+        started = time.perf_counter()
+        users = [SimulatedSession(number, seed + number) for number in range(sessions)]
+        for user in users:
+            user.start(results)
+        if log:
+            log(f"{sessions} sessions open, RSS {current_rss_mb():.0f} MB")
+
+        for step in range(steps):
+            for user in users:
+                user.step(results)
+            if log:
+                log(f"step {step + 1}/{steps}: {len(results)} reruns, RSS {current_rss_mb():.0f} MB")
+        wall_s = time.perf_counter() - started
+        rss_end = current_rss_mb()
+    finally:
+        server.shutdown()
+
+    # Session state as the app's memory caps left it
+    states = [user.app.session_state.to_dict() for user in users]
+    state_mb = [deep_sizeof(state) / 2 ** 20 for state in states]
+
+    by_action = {}
+    for action, seconds in results:
+        by_action.setdefault(action, []).append(seconds)
+    return {
+        "sessions": sessions,
+        "steps": steps,
+        "projects": projects,
+        "tasks": tasks,
+        "reruns": len(results),
+        "wall_s": wall_s,
+        "reruns_per_s": len(results) / wall_s,
+        "latency": _percentiles([seconds for _, seconds in results]),
+        "by_action": {action: dict(_percentiles(values), count=len(values)) for action, values in sorted(by_action.items())},
+        "llm_requests": server.request_count,
+        "rss_baseline_mb": rss_baseline,
+        "rss_end_mb": rss_end,
+        "rss_per_session_mb": (rss_end - rss_baseline) / sessions,
+        "session_state_mb": {"mean": sum(state_mb) / len(state_mb), "max": max(state_mb)},
+        "parked_edits": sum(len(getattr(value, "parked", ())) for state in states for value in state.values()),
+        "shared_store_mb": get_shared_store().report()["compressed_bytes"] / 2 ** 20,
+        "errors": [error for user in users for error in user.errors]
+    }
+
+def format_report(report):
+    """Format a load test report as text."""
+    lines = [
+        f"{report['sessions']} sessions x {report['steps']} steps on {report['projects']} projects "
+        f"of {report['tasks']} tasks",
+        f"{report['reruns']} reruns in {report['wall_s']:.1f} s ({report['reruns_per_s']:.1f} reruns/s), "
+        f"{report['llm_requests']} LLM requests",
+        "",
+        f"{'action':<10} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}",
+    ]
+    rows = list(report["by_action"].items()) + [("all", dict(report["latency"], count=report["reruns"]))]
+    for action, stats in rows:
+        lines.append(
+            f"{action:<10} {stats['count']:>6} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} "
+            f"{stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f}"
+        )
+    lines += [
+        "",
+        f"RSS {report['rss_baseline_mb']:.0f} MB -> {report['rss_end_mb']:.0f} MB "
+        f"({report['rss_per_session_mb']:.1f} MB per session)",
+        f"Session state {report['session_state_mb']['mean']:.1f} MB per session "
+        f"(max {report['session_state_mb']['max']:.1f} MB), {report['parked_edits']} unsaved "
+        f"project edits parked in the shared store ({report['shared_store_mb']:.1f} MB compressed)",
+    ]
+    if report["errors"]:
+        lines.append(f"{len(report['errors'])} errors, first: {report['errors'][0]}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the app with simulated sessions.")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--steps", type=int, default=15, help="User actions per session")
+    parser.add_argument("--projects", type=int, default=3, help="Projects in the synthetic portfolio")
+    parser.add_argument("--tasks", type=int, default=1000, help="Tasks per project")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Mock LLM time to first token in seconds")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    # Keep the app's caches and histories out of data/
+    scratch = tempfile.mkdtemp(prefix="pm-buddy-load-")
+    for name, file_name in (("RESPONSE_CACHE_PATH", "responses.sqlite3"),
+                            ("CHAT_HISTORY_PATH", "chat_history.sqlite3"),
+                            ("INSIGHTS_PATH", "insights.sqlite3"),
+                            ("RENDER_DIR", "renders")):
+        os.environ.setdefault(name, os.path.join(scratch, file_name))
+
+    report = run_load_test(
+        args.sessions, args.steps, args.projects, args.tasks, args.seed, args.llm_latency,
+        log=None if args.json else lambda line: print(line, file=sys.stderr)
+    )
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 1 if report["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
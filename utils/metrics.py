@@ -0,0 +1,169 @@
+import datetime
+import threading
+from collections import OrderedDict
+
+from utils.data_utils import project_version
+
+# Number of (kind, project, version, date) entries kept in the metrics cache
+METRICS_CACHE_SIZE = 256
+
+_metrics_cache = OrderedDict()
+_metrics_lock = threading.Lock()
+
+def _parse_date(value):
+    """Parse a YYYY-MM-DD string into a date."""
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+def _classify_milestone(progress, end_date, today):
+    """Return the status of a milestone (same rules as utils.milestones.milestone_frame)."""
+    if progress == 100:
+        return "Completed"
+    if end_date < today:
+        return "Delayed"
+    if (end_date - today).days <= 7:
+        return "At Risk"
+    return "On Track"
+
+def _health(project, days_remaining):
+    """Compute the schedule, budget, scope and quality health indicators."""
+    if days_remaining < 0:
+        schedule = ("Delayed", "status-delayed")
+    elif project['progress'] < 50 and project['elapsed_pct'] > 60:
+        schedule = ("At Risk", "status-at-risk")
+    else:
+        schedule = ("On Track", "status-on-track")
+
+    if project['budget_spent_pct'] > project['progress'] + 15:
+        budget = ("Over Budget", "status-delayed")
+    elif project['budget_spent_pct'] > project['progress'] + 5:
+        budget = ("At Risk", "status-at-risk")
+    else:
+        budget = ("On Track", "status-on-track")
+
+    scope_changes = len(project.get('scope_changes', []))
+    if scope_changes > 5:
+        scope = ("Significant Changes", "status-delayed")
+    elif scope_changes > 2:
+        scope = ("Minor Changes", "status-at-risk")
+    else:
+        scope = ("On Track", "status-on-track")
+
+    defects = len(project.get('defects', []))
+    if defects > 10:
+        quality = ("Low", "status-delayed")
+    elif defects > 5:
+        quality = ("Medium", "status-at-risk")
+    else:
+        quality = ("High", "status-on-track")
+
+    return {"Schedule": schedule, "Budget": budget, "Scope": scope, "Quality": quality}
+
+def compute_dashboard_metrics(project, today=None):
+    """
+    Compute every dashboard metric of a project in a single pass over its data.
+
+    Args:
+        project: Project dictionary
+        today: Reference date (defaults to the current date)
+
+    Returns:
+        dict: Metrics with the keys
+            - progress, days_remaining, days_remaining_class
+            - total_tasks, completed_tasks
+            - high_risks (list), high_risk_count, high_risk_class
+            - health: Indicator name -> (status, CSS class)
+            - milestone_counts: Status -> number of milestones
+    """
+    today = today or datetime.datetime.now().date()
+
+    days_remaining = (_parse_date(project['end_date']) - today).days
+    if days_remaining < 0:
+        days_remaining_class = "status-delayed"
+    elif days_remaining < 14:
+        days_remaining_class = "status-at-risk"
+    else:
+        days_remaining_class = "status-on-track"
+
+    # One pass over the WBS for task completion and milestone status
+    completed_tasks = 0
+    milestone_counts = {}
+    for task in project['wbs']:
+        if task['progress'] == 100:
+            completed_tasks += 1
+        if task.get('milestone', False):
+            status = _classify_milestone(task['progress'], _parse_date(task['end_date']), today)
+            milestone_counts[status] = milestone_counts.get(status, 0) + 1
+
+    # One pass over the risk register
+    high_risks = [r for r in project.get('raid', {}).get('risks', []) if r['severity'] == 'High']
+    if len(high_risks) > 3:
+        high_risk_class = "status-delayed"
+    elif len(high_risks) > 1:
+        high_risk_class = "status-at-risk"
+    else:
+        high_risk_class = "status-on-track"
+
+    return {
+        "progress": project['progress'],
+        "days_remaining": days_remaining,
+        "days_remaining_class": days_remaining_class,
+        "total_tasks": len(project['wbs']),
+        "completed_tasks": completed_tasks,
+        "high_risks": high_risks,
+        "high_risk_count": len(high_risks),
+        "high_risk_class": high_risk_class,
+        "health": _health(project, days_remaining),
+        "milestone_counts": milestone_counts
+    }
+
+def cached_for_project(kind, project, today, compute):
+    """
+    Memoize a derived value of a project by (kind, project name, version, date).
+
+    Results are shared between callers and must be treated as read-only.
+    Projects without a version are recomputed on every call.
+
+    Args:
+        kind: Name of the derived value (e.g. "dashboard", "milestones")
+        project: Project dictionary
+        today: Reference date
+        compute: Callable taking (project, today) that builds the value
+
+    Returns:
+        The cached or freshly computed value
+    """
+    version = project_version(project)
+    if version is None:
+        return compute(project, today)
+
+    key = (kind, project.get('name'), version, today)
+    with _metrics_lock:
+        value = _metrics_cache.get(key)
+        if value is not None:
+            _metrics_cache.move_to_end(key)
+            return value
+
+    value = compute(project, today)
+    with _metrics_lock:
+        _metrics_cache[key] = value
+        while len(_metrics_cache) > METRICS_CACHE_SIZE:
+            _metrics_cache.popitem(last=False)
+    return value
+
+def get_dashboard_metrics(project, today=None):
+    """
+    Return the dashboard metrics of a project, memoized by project version and date.
+
+    Args:
+        project: Project dictionary
+        today: Reference date (defaults to the current date)
+
+    Returns:
+        dict: Result of compute_dashboard_metrics (read-only)
+    """
+    return cached_for_project(
+        "dashboard",
+        project,
+        today or datetime.datetime.now().date(),
+        compute_dashboard_metrics
+    )
@@ -0,0 +1,142 @@
+import datetime
+import html
+
+from utils.metrics import cached_for_project
+
+MILESTONE_STATUSES = ["Delayed", "At Risk", "On Track", "Completed"]
+
+MILESTONE_STATUS_CLASSES = {
+    "Completed": "status-completed",
+    "Delayed": "status-delayed",
+    "At Risk": "status-at-risk",
+    "On Track": "status-on-track"
+}
+
+MILESTONE_COLUMNS = ["Name", "Due Date", "Owner", "Progress", "Status", "Days Remaining"]
+
+def milestone_frame(wbs_data, today):
+    """
+    Build a columnar view of the milestones in a WBS with their status.
+
+    Status is classified vectorized over the due dates: Completed when
+    progress is 100%, Delayed when past due, At Risk when due within 7 days,
+    otherwise On Track.
+
+    Args:
+        wbs_data: List of WBS task dictionaries
+        today: Reference date
+
+    Returns:
+        DataFrame: One row per milestone with the MILESTONE_COLUMNS columns
+    """
+    import numpy as np
+    import pandas as pd
+
+    milestones = [task for task in wbs_data if task.get("milestone", False)]
+    if not milestones:
+        return pd.DataFrame(columns=MILESTONE_COLUMNS)
+
+    df = pd.DataFrame({
+        "Name": [task["task"] for task in milestones],
+        "Due Date": pd.to_datetime([task["end_date"] for task in milestones], format="%Y-%m-%d"),
+        "Owner": [task["assigned_to"] for task in milestones],
+        "Progress": [task["progress"] for task in milestones]
+    })
+
+    days_remaining = (df["Due Date"] - pd.Timestamp(today)).dt.days.to_numpy()
+    completed = df["Progress"].to_numpy() == 100
+    df["Status"] = np.select(
+        [completed, days_remaining < 0, days_remaining <= 7],
+        ["Completed", "Delayed", "At Risk"],
+        default="On Track"
+    )
+    df["Days Remaining"] = days_remaining
+
+    return df[MILESTONE_COLUMNS]
+
+def get_milestone_frame(project, today=None):
+    """
+    Return the milestone frame of a project, memoized by project version and date.
+
+    Args:
+        project: Project dictionary
+        today: Reference date (defaults to the current date)
+
+    Returns:
+        DataFrame: Result of milestone_frame (read-only)
+    """
+    return cached_for_project(
+        "milestones",
+        project,
+        today or datetime.datetime.now().date(),
+        lambda p, day: milestone_frame(p.get("wbs", []), day)
+    )
+
+def query_milestones(df, statuses=None, owners=None, due_within=None, sort_by="Due Date", ascending=True):
+    """
+    Filter and sort a milestone frame.
+
+    Args:
+        df: DataFrame from milestone_frame
+        statuses: Optional list of statuses to keep
+        owners: Optional list of owners to keep
+        due_within: Optional (min_days, max_days) window of days remaining;
+            either bound may be None
+        sort_by: Column to sort by ("Status" sorts by severity)
+        ascending: Sort direction
+
+    Returns:
+        DataFrame: Matching milestones in the requested order
+    """
+    import numpy as np
+
+    mask = np.ones(len(df), dtype=bool)
+    if statuses:
+        mask &= df["Status"].isin(statuses).to_numpy()
+    if owners:
+        mask &= df["Owner"].isin(owners).to_numpy()
+    if due_within:
+        min_days, max_days = due_within
+        days_remaining = df["Days Remaining"].to_numpy()
+        if min_days is not None:
+            mask &= days_remaining >= min_days
+        if max_days is not None:
+            mask &= days_remaining <= max_days
+
+    filtered = df[mask]
+    if sort_by == "Status":
+        severity = {status: rank for rank, status in enumerate(MILESTONE_STATUSES)}
+        return filtered.sort_values(
+            by="Status",
+            key=lambda column: column.map(severity),
+            ascending=ascending,
+            kind="stable"
+        )
+    return filtered.sort_values(by=sort_by, ascending=ascending, kind="stable")
+
+def milestone_table_html(df):
+    """
+    Render a page of milestones as an HTML table.
+
+    Args:
+        df: (Paged) DataFrame from milestone_frame or query_milestones
+
+    Returns:
+        str: HTML table
+    """
+    rows = [
+        f'<tr><td>{html.escape(str(name))}</td>'
+        f'<td>{due.strftime("%Y-%m-%d")}</td>'
+        f'<td>{html.escape(str(owner))}</td>'
+        f'<td>{progress}%</td>'
+        f'<td><span class="{MILESTONE_STATUS_CLASSES[status]}">{status}</span></td></tr>'
+        for name, due, owner, progress, status in zip(
+            df["Name"], df["Due Date"], df["Owner"], df["Progress"], df["Status"]
+        )
+    ]
+    return (
+        '<table style="width:100%">'
+        '<tr><th>Name</th><th>Due Date</th><th>Owner</th><th>Progress</th><th>Status</th></tr>'
+        + "".join(rows)
+        + '</table>'
+    )
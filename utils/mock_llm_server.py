@@ -0,0 +1,282 @@
+"""
+Local mock of the OpenAI chat completions API.
+
+Serves canned project-management answers over ``POST /v1/chat/completions``,
+with and without ``stream=true`` (server-sent events), so streaming and
+time-to-first-token can be developed and benchmarked offline:
+
+    python -m utils.mock_llm_server --port 8765
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=mock streamlit run app_v2.py
+
+    python -m utils.mock_llm_server --benchmark 20
+
+``--error-rate`` makes a share of requests fail with HTTP 429 to exercise
+client retries.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Canned answers, picked by keywords in the last user message
+MOCK_RESPONSES = [
+    (("risk",), """\
+# Risk Analysis
+
+Based on your project data, I've identified these key risks:
+
+1. **Schedule Risk**: Current progress (65%) is trailing behind elapsed time (70%)
+2. **Resource Constraint**: Team member "Alex Chen" is currently over-allocated (110%)
+3. **Technical Risk**: Integration with legacy systems has unresolved dependencies
+
+**Recommendations**:
+- Consider adjusting timeline for the implementation phase
+- Redistribute tasks from over-allocated resources
+- Schedule a technical review session for integration components
+"""),
+    (("status report", "report"), """\
+# Project Status Report
+
+**Period**: April 15-27, 2023
+
+## Summary
+Project is currently at 65% completion with moderate schedule risk. Budget spending is on track at 62%.
+
+## Key Achievements
+- Completed user authentication module
+- Finalized database schema design
+- Conducted first round of user acceptance testing
+
+## Issues & Risks
+- Integration with payment gateway experiencing delays
+- Resource constraint in QA team
+
+## Next Steps
+- Complete payment gateway integration
+- Begin final testing phase
+- Prepare deployment documentation
+"""),
+    (("milestone",), """\
+# Milestone Status
+
+| Milestone | Due Date | Status | Days Remaining |
+|-----------|----------|--------|---------------|
+| Requirements Sign-off | 2023-01-15 | Completed | - |
+| Design Approval | 2023-02-28 | Completed | - |
+| Alpha Release | 2023-04-15 | Completed | - |
+| Beta Release | 2023-05-30 | At Risk | 33 |
+| Final Delivery | 2023-07-15 | On Track | 79 |
+
+**Note**: Beta Release milestone is at risk due to delays in the payment integration module. Consider allocating additional resources or adjusting the timeline.
+"""),
+    (("budget",), """\
+# Budget Analysis
+
+Current budget status:
+- Total budget: $450,000
+- Spent to date: $279,000 (62%)
+- Remaining: $171,000 (38%)
+
+Forecast analysis shows current spending rate might lead to a 5% budget overrun by project completion. Cost control measures recommended for the testing and deployment phases.
+
+**Cost Distribution**:
+- Development: 45%
+- Testing: 20%
+- Project Management: 15%
+- Infrastructure: 12%
+- Training & Documentation: 8%
+"""),
+]
+
+DEFAULT_MOCK_RESPONSE = """\
+I understand you're asking about project management insights. Based on the current project data, here are some observations:
+
+1. The project is progressing at an acceptable rate with 65% completion
+2. There are some resource allocation concerns that may need attention
+3. Several high-priority risks have been identified that should be addressed
+
+What specific aspect of the project would you like me to analyze in more detail? For example, I can provide insights on schedule, budget, risks, resource allocation, or help draft project documents.
+"""
+
+def pick_response(messages):
+    """
+    Pick the canned answer for a conversation.
+
+    Args:
+        messages: Messages in OpenAI chat format
+
+    Returns:
+        str: Answer text
+    """
+    user_messages = [m.get("content") or "" for m in messages if m.get("role") == "user"]
+    prompt = user_messages[-1].lower() if user_messages else ""
+    for keywords, response in MOCK_RESPONSES:
+        if any(keyword in prompt for keyword in keywords):
+            return response
+    return DEFAULT_MOCK_RESPONSE
+
+def tokenize_response(text):
+    """Split an answer into word-sized chunks, as a model would stream it."""
+    return re.findall(r"\S+\s*|\s+", text)
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """Request handler emulating the chat completions endpoint."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        server.request_count += 1
+
+        if server.error_rate and random.random() < server.error_rate:
+            server.error_count += 1
+            self._send_json(429, {"error": {"message": "Rate limit reached (mock)", "type": "rate_limit_error"}})
+            return
+
+        text = server.responder(request.get("messages", []))
+        model = request.get("model", "mock")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        time.sleep(server.first_token_delay)
+
+        if not request.get("stream"):
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(tokenize_response(text)), "total_tokens": 0}
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        def send_chunk(delta, finish_reason=None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        try:
+            send_chunk({"role": "assistant", "content": ""})
+            for token in tokenize_response(text):
+                send_chunk({"content": token})
+                time.sleep(server.token_delay)
+            send_chunk({}, finish_reason="stop")
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client cancelled the stream
+            server.cancelled_count += 1
+        self.close_connection = True
+
+def start_mock_server(host="127.0.0.1", port=0, first_token_delay=0.2, token_delay=0.02, responder=pick_response,
+                      error_rate=0.0):
+    """
+    Start the mock server on a background thread.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        first_token_delay: Seconds before the first token (emulated model latency)
+        token_delay: Seconds between streamed tokens
+        responder: Callable mapping the request messages to the answer text
+        error_rate: Share of requests answered with HTTP 429
+
+    Returns:
+        tuple: (server, base_url); call server.shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), MockLLMHandler)
+    server.daemon_threads = True
+    server.first_token_delay = first_token_delay
+    server.token_delay = token_delay
+    server.responder = responder
+    server.error_rate = error_rate
+    server.request_count = 0
+    server.cancelled_count = 0
+    server.error_count = 0
+    thread = threading.Thread(target=server.serve_forever, name="mock-llm-server", daemon=True)
+    thread.start()
+    return server, f"http://{server.server_address[0]}:{server.server_address[1]}/v1"
+
+def run_benchmark(requests, first_token_delay, token_delay):
+    """Measure streaming latency against a private mock server and print a summary."""
+    from utils.llm_client import build_messages, get_client, measure_stream
+
+    server, base_url = start_mock_server(first_token_delay=first_token_delay, token_delay=token_delay)
+    try:
+        client = get_client(api_key="mock", base_url=base_url)
+        messages = build_messages([{"role": "user", "content": "Give me a status report"}])
+        results = [measure_stream(messages, model="mock", client=client) for _ in range(requests)]
+    finally:
+        server.shutdown()
+
+    ttft = sorted(r["ttft_s"] for r in results)
+    total = sorted(r["total_s"] for r in results)
+    print(f"requests: {requests}")
+    print(f"time to first token: p50 {ttft[len(ttft) // 2] * 1000:.1f} ms, max {ttft[-1] * 1000:.1f} ms")
+    print(f"full response:       p50 {total[len(total) // 2] * 1000:.1f} ms, max {total[-1] * 1000:.1f} ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible chat completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--first-token-delay", type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Seconds between tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with HTTP 429")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Run N streaming requests against a private server and exit")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        run_benchmark(args.benchmark, args.first_token_delay, args.token_delay)
+        return
+
+    server, base_url = start_mock_server(
+        args.host, args.port, args.first_token_delay, args.token_delay, error_rate=args.error_rate
+    )
+    print(f"Mock LLM server listening on {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+"""
+Full-text search over the RAID logs, decisions, activities, scope changes
+and team feedback of all projects.
+
+Every item (a risk, a decision, an activity, ...) is a document. The
+inverted index maps each term (see knowledge_index.tokenize) and each pair
+of adjacent terms to the documents containing it, so a query only reads
+the postings of its own terms:
+
+    legacy api          items containing both terms
+    "legacy api"        the exact phrase
+    integ*              any term starting with "integ"
+
+Postings are compact arrays of document numbers and term frequencies that
+NumPy intersects and scores (BM25) without a Python loop per document.
+Documents are only ever appended; removing a project marks its documents
+dead, and the postings are compacted once dead entries outnumber live ones.
+
+The process-wide index follows the project store: when a snapshot is
+published, only projects whose version changed are re-indexed. Unsaved
+session edits are not searched.
+"""
+import bisect
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+
+from utils.knowledge_index import normalize_term, tokenize
+
+# Item fields that are not searched
+SKIPPED_FIELDS = {"id", "date", "raised_date", "due_date"}
+
+# Searchable collections of a project: kind -> (label, function returning the items)
+SEARCH_KINDS = {
+    "risk": ("Risk", lambda project: project.get("raid", {}).get("risks", [])),
+    "issue": ("Issue", lambda project: project.get("raid", {}).get("issues", [])),
+    "assumption": ("Assumption", lambda project: project.get("raid", {}).get("assumptions", [])),
+    "dependency": ("Dependency", lambda project: project.get("raid", {}).get("dependencies", [])),
+    "decision": ("Decision", lambda project: project.get("decisions", [])),
+    "activity": ("Activity", lambda project: project.get("activities", [])),
+    "scope_change": ("Scope change", lambda project: project.get("scope_changes", [])),
+    "feedback": ("Feedback", lambda project: project.get("team_feedback", [])),
+}
+KIND_CODES = {kind: code for code, kind in enumerate(SEARCH_KINDS)}
+
+_QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+def item_fields(item):
+    """Return the searchable text fields of an item, title first."""
+    fields = [item["title"]] if isinstance(item.get("title"), str) else []
+    fields += [
+        value for key, value in item.items()
+        if key != "title" and key not in SKIPPED_FIELDS and isinstance(value, str) and value
+    ]
+    return fields
+
+def parse_query(query):
+    """
+    Split a query into clauses.
+
+    Args:
+        query: Query text with terms, "quoted phrases" and prefix* terms
+
+    Returns:
+        list: ("term", term), ("prefix", text) or ("phrase", terms) tuples
+    """
+    clauses = []
+    for phrase, word in _QUERY_PATTERN.findall(query):
+        if phrase:
+            terms = tokenize(phrase)
+            if len(terms) > 1:
+                clauses.append(("phrase", tuple(terms)))
+            elif terms:
+                clauses.append(("term", terms[0]))
+        elif word.endswith("*") and re.fullmatch(r"[a-z0-9]+", word[:-1].lower()):
+            # Index terms have their plural "s" dropped, so the prefix must too:
+            # "stakeholders*" looks up "stakeholder"; short prefixes stay as typed
+            clauses.append(("prefix", normalize_term(word[:-1].lower())))
+        else:
+            clauses.extend(("term", term) for term in tokenize(word))
+    return clauses
+
+def _phrase_count(item, terms):
+    """Count the occurrences of a tokenized phrase within the fields of an item."""
+    count = 0
+    size = len(terms)
+    for text in item_fields(item):
+        field_terms = tokenize(text)
+        count += sum(
+            1 for start in range(len(field_terms) - size + 1)
+            if tuple(field_terms[start:start + size]) == terms
+        )
+    return count
+
+class _Postings:
+    """Document numbers (ascending) and term frequencies of one term."""
+
+    __slots__ = ("docs", "frequencies")
+
+    def __init__(self):
+        self.docs = array("q")
+        self.frequencies = array("i")
+
+class ProjectSearchIndex:
+    """Append-only inverted index over the items of many projects."""
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._terms = {}
+        self._pairs = {}
+        self._vocabulary = []
+        # Per document number: alive flag, length, project number and kind code
+        self._alive = bytearray()
+        self._lengths = array("f")
+        self._doc_projects = array("q")
+        self._doc_kinds = array("b")
+        self._documents = {}
+        self._project_docs = {}
+        self._project_numbers = {}
+        self._versions = {}
+        self._total_length = 0
+        self._live_postings = 0
+        self._dead_postings = 0
+        self.stats = {"indexed_projects": 0, "compactions": 0, "queries": 0}
+
+    def __len__(self):
+        return len(self._documents)
+
+    def add_project(self, project):
+        """
+        Index the items of a project, replacing its previously indexed items.
+
+        Args:
+            project: Project dictionary
+        """
+        name = project["name"]
+        with self._lock:
+            self.remove_project(name)
+            project_number = self._project_numbers.setdefault(name, len(self._project_numbers))
+            self._project_docs[name] = [
+                self._add_document(project_number, name, kind, position, item)
+                for kind, (_, items) in SEARCH_KINDS.items()
+                for position, item in enumerate(items(project))
+            ]
+            self._versions[name] = project.get("version")
+            self.stats["indexed_projects"] += 1
+
+    def _add_document(self, project_number, project_name, kind, position, item):
+        all_terms = []
+        all_pairs = []
+        for text in item_fields(item):
+            field_terms = tokenize(text)
+            all_terms += field_terms
+            all_pairs += zip(field_terms, field_terms[1:])
+        terms = Counter(all_terms)
+        pairs = Counter(all_pairs)
+        length = len(all_terms)
+
+        doc_number = len(self._alive)
+        for postings_by_key, counts in ((self._terms, terms), (self._pairs, pairs)):
+            for key, frequency in counts.items():
+                postings = postings_by_key.get(key)
+                if postings is None:
+                    postings = postings_by_key[key] = _Postings()
+                    if postings_by_key is self._terms:
+                        bisect.insort(self._vocabulary, key)
+                postings.docs.append(doc_number)
+                postings.frequencies.append(frequency)
+        self._alive.append(1)
+        self._lengths.append(length)
+        self._doc_projects.append(project_number)
+        self._doc_kinds.append(KIND_CODES[kind])
+        # The item itself is shared with the project snapshot, not copied
+        self._documents[doc_number] = (project_name, kind, position, item, len(terms) + len(pairs))
+        self._total_length += length
+        self._live_postings += len(terms) + len(pairs)
+        return doc_number
+
+    def remove_project(self, name):
+        """Drop the indexed items of a project."""
+        with self._lock:
+            for doc_number in self._project_docs.pop(name, ()):
+                document = self._documents.pop(doc_number)
+                self._alive[doc_number] = 0
+                self._total_length -= self._lengths[doc_number]
+                self._live_postings -= document[4]
+                self._dead_postings += document[4]
+            self._versions.pop(name, None)
+            if self._dead_postings > max(self._live_postings, 10000):
+                self.compact()
+
+    def compact(self):
+        """Drop the postings of removed documents."""
+        import numpy as np
+
+        with self._lock:
+            alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+            for postings_by_key in (self._terms, self._pairs):
+                for key in list(postings_by_key):
+                    postings = postings_by_key[key]
+                    docs = np.frombuffer(postings.docs, dtype=np.int64)
+                    keep = alive[docs]
+                    if keep.all():
+                        continue
+                    if not keep.any():
+                        del postings_by_key[key]
+                        continue
+                    frequencies = np.frombuffer(postings.frequencies, dtype=np.int32)
+                    postings.docs = array("q", docs[keep].tobytes())
+                    postings.frequencies = array("i", frequencies[keep].tobytes())
+            self._vocabulary = sorted(self._terms)
+            self._dead_postings = 0
+            self.stats["compactions"] += 1
+
+    def sync(self, projects):
+        """
+        Bring the index up to date with a set of projects.
+
+        Only projects whose version differs from the indexed one are
+        re-indexed; projects that are gone are removed.
+
+        Args:
+            projects: Mapping of project name -> project dictionary
+
+        Returns:
+            int: Number of projects (re-)indexed
+        """
+        with self._lock:
+            for name in [name for name in self._versions if name not in projects]:
+                self.remove_project(name)
+            changed = [
+                project for name, project in projects.items()
+                if name not in self._versions or self._versions[name] != project.get("version")
+            ]
+            for project in changed:
+                self.add_project(project)
+            return len(changed)
+
+    def _arrays(self, postings, alive):
+        import numpy as np
+
+        docs = np.frombuffer(postings.docs, dtype=np.int64)
+        frequencies = np.frombuffer(postings.frequencies, dtype=np.int32)
+        live = alive[docs]
+        return docs[live], frequencies[live]
+
+    def _clause_matches(self, clause, alive):
+        """Return (document numbers, frequencies) arrays of one query clause."""
+        import numpy as np
+
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32))
+        kind, value = clause
+        if kind == "term":
+            postings = self._terms.get(value)
+            return self._arrays(postings, alive) if postings else empty
+
+        if kind == "prefix":
+            # The vocabulary is sorted, so the terms starting with the prefix
+            # are one slice; terms only contain [a-z0-9], all below "\uffff"
+            start = bisect.bisect_left(self._vocabulary, value)
+            end = bisect.bisect_right(self._vocabulary, value + "\uffff", start)
+            parts = [self._arrays(self._terms[term], alive) for term in self._vocabulary[start:end]]
+            if not parts:
+                return empty
+            docs, inverse = np.unique(np.concatenate([docs for docs, _ in parts]), return_inverse=True)
+            frequencies = np.bincount(inverse, weights=np.concatenate([f for _, f in parts]))
+            return docs, frequencies.astype(np.int32)
+
+        # Phrase: documents with every pair of adjacent terms
+        pair_postings = [self._pairs.get(pair) for pair in zip(value, value[1:])]
+        if not all(pair_postings):
+            return empty
+        docs, frequencies = self._arrays(pair_postings[0], alive)
+        for postings in pair_postings[1:]:
+            other_docs, other_frequencies = self._arrays(postings, alive)
+            docs, mine, other = np.intersect1d(docs, other_docs, assume_unique=True, return_indices=True)
+            frequencies = np.minimum(frequencies[mine], other_frequencies[other])
+        if len(value) > 2:
+            # Adjacent pairs do not guarantee the whole phrase; check the few candidates
+            counts = np.array([_phrase_count(self._documents[doc][3], value) for doc in docs.tolist()], dtype=np.int32)
+            found = counts > 0
+            docs, frequencies = docs[found], counts[found]
+        return docs, frequencies
+
+    def search(self, query, k=20, projects=None, kinds=None):
+        """
+        Return the items matching every clause of a query, best first.
+
+        Args:
+            query: Query text (see parse_query)
+            k: Number of results
+            projects: Optional collection of project names to search in
+            kinds: Optional collection of item kinds (keys of SEARCH_KINDS)
+
+        Returns:
+            dict: results (dicts with project, kind, label, position, item and
+            score), total (number of matching items) and ms
+        """
+        import numpy as np
+
+        start_time = time.perf_counter()
+        clauses = parse_query(query)
+        with self._lock:
+            self.stats["queries"] += 1
+            doc_count = len(self._documents)
+            if not clauses or not doc_count:
+                return {"results": [], "total": 0, "ms": (time.perf_counter() - start_time) * 1000}
+
+            alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+            matches = [self._clause_matches(clause, alive) for clause in clauses]
+
+            # Intersect the clauses, rarest first; frequencies stay aligned with the documents
+            order = sorted(range(len(matches)), key=lambda i: len(matches[i][0]))
+            docs = matches[order[0]][0]
+            aligned = {order[0]: matches[order[0]][1]}
+            for i in order[1:]:
+                docs, mine, other = np.intersect1d(docs, matches[i][0], assume_unique=True, return_indices=True)
+                aligned = {j: frequencies[mine] for j, frequencies in aligned.items()}
+                aligned[i] = matches[i][1][other]
+            keep = np.ones(len(docs), dtype=bool)
+            if projects is not None:
+                numbers = [self._project_numbers[name] for name in projects if name in self._project_numbers]
+                keep &= np.isin(np.frombuffer(self._doc_projects, dtype=np.int64)[docs], numbers)
+            if kinds is not None:
+                codes = [KIND_CODES[kind] for kind in kinds]
+                keep &= np.isin(np.frombuffer(self._doc_kinds, dtype=np.int8)[docs], codes)
+            if not keep.all():
+                docs = docs[keep]
+                aligned = {j: frequencies[keep] for j, frequencies in aligned.items()}
+
+            # BM25 over the clauses, each clause scored like a single term
+            k1, b = self.k1, self.b
+            avg_length = self._total_length / doc_count or 1.0
+            norm = k1 * (1 - b + b * np.frombuffer(self._lengths, dtype=np.float32)[docs] / avg_length)
+            scores = np.zeros(len(docs))
+            for i, frequencies in aligned.items():
+                matching = len(matches[i][0])
+                idf = np.log(1 + (doc_count - matching + 0.5) / (matching + 0.5))
+                scores += idf * frequencies * (k1 + 1) / (frequencies + norm)
+            # Best first; ties go to the earlier indexed item (docs are in ascending order)
+            top = np.arange(len(scores))
+            if len(scores) > k:
+                kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+                above = np.flatnonzero(scores > kth)
+                top = np.concatenate([above, np.flatnonzero(scores == kth)[:k - len(above)]])
+            top = top[np.lexsort((top, -scores[top]))]
+
+            results = []
+            for position in top.tolist():
+                project_name, kind, item_position, item, _ = self._documents[int(docs[position])]
+                results.append({
+                    "project": project_name,
+                    "kind": kind,
+                    "label": SEARCH_KINDS[kind][0],
+                    "position": item_position,
+                    "item": item,
+                    "score": float(scores[position])
+                })
+        return {"results": results, "total": len(docs), "ms": (time.perf_counter() - start_time) * 1000}
+
+    def report(self):
+        """Return the index size: projects, documents, terms, pairs and postings."""
+        with self._lock:
+            return {
+                "projects": len(self._project_docs),
+                "documents": len(self._documents),
+                "terms": len(self._terms),
+                "pairs": len(self._pairs),
+                "postings": self._live_postings,
+                "dead_postings": self._dead_postings,
+                **self.stats
+            }
+
+def snippet(item, query, width=160):
+    """
+    Return the part of an item's text around the first query term, for display.
+
+    Args:
+        item: Indexed item dictionary
+        query: Query text
+        width: Maximum snippet length in characters
+
+    Returns:
+        str: Text with "..." where it was cut
+    """
+    text = " - ".join(item_fields(item))
+    words = [value if kind != "phrase" else value[0] for kind, value in parse_query(query)]
+    lowered = text.lower()
+    hits = [lowered.find(word) for word in words]
+    first = min((hit for hit in hits if hit >= 0), default=0)
+    start = text.rfind(" ", 0, max(0, first - width // 3)) + 1
+    end = start + width
+    return ("..." if start else "") + text[start:end] + ("..." if end < len(text) else "")
+
+_project_search = None
+_project_search_lock = threading.Lock()
+
+def get_project_search():
+    """
+    Return the process-wide search index of the shared projects.
+
+    On first use it indexes the current project store snapshot and
+    subscribes to the store, so later snapshots re-index only the projects
+    that changed.
+    """
+    global _project_search
+    with _project_search_lock:
+        if _project_search is None:
+            from utils.project_store import get_project_store
+
+            index = ProjectSearchIndex()
+            store = get_project_store()
+            store.subscribe(lambda snapshot: index.sync(snapshot.projects))
+            index.sync(store.snapshot().projects)
+            _project_search = index
+        return _project_search
@@ -0,0 +1,283 @@
+"""
+Project data shared by all sessions of the process.
+
+ProjectStore holds an immutable snapshot of every project. Sessions read it
+through a ProjectView, which keeps the session's unsaved edits in an
+overlay: edit() copies a project into the overlay on first write and save()
+publishes the overlay as a new snapshot. Publishing swaps the snapshot
+reference in one step, so a view sees either the old or the new snapshot,
+never a mix, and picks up the new one on its next refresh(). Memory grows
+with the number of edited projects, not with the number of sessions, and
+session_memory parks the edits of a session over its memory cap in the
+shared store.
+
+Every project in the store and every edited copy gets a version that is
+unique in the process, so caches keyed by (project name, version) never mix
+up the states of different sessions.
+"""
+import copy
+import itertools
+import logging
+import threading
+import types
+from collections import ChainMap
+from collections.abc import Mapping
+
+from utils.shared_store import get_shared_store
+
+logger = logging.getLogger(__name__)
+
+class ProjectConflictError(Exception):
+    """Raised when saving edits to projects another session has saved since."""
+
+    def __init__(self, names):
+        self.names = names
+        super().__init__(f"Changed by another session in the meantime: {', '.join(names)}")
+
+class Snapshot:
+    """State of all projects at one point in time; never changed once published."""
+
+    # Not counted as session memory (see session_memory.deep_sizeof)
+    shared_between_sessions = True
+
+    def __init__(self, version, projects):
+        self.version = version
+        self.projects = types.MappingProxyType(projects)
+
+class ProjectStore:
+    """Process-wide, versioned snapshots of the project data."""
+
+    shared_between_sessions = True
+
+    def __init__(self, projects, default_project=None):
+        """
+        Args:
+            projects: Dict of project name -> project dictionary
+            default_project: Project selected in new views (defaults to the first)
+        """
+        self._lock = threading.Lock()
+        self._versions = itertools.count(1)
+        self._snapshot = None
+        self._subscribers = []
+        self.publish(projects, default_project)
+
+    def snapshot(self):
+        """Return the current snapshot."""
+        return self._snapshot
+
+    def subscribe(self, callback):
+        """
+        Call a function with every snapshot published from now on.
+
+        Args:
+            callback: Callable taking the new Snapshot; it runs in the
+                publishing thread and should return quickly
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def _notify(self, snapshot):
+        for callback in list(self._subscribers):
+            try:
+                callback(snapshot)
+            except Exception:
+                logger.exception("Project store subscriber failed")
+
+    def next_version(self):
+        """Return a project version not used before in this process."""
+        with self._lock:
+            return next(self._versions)
+
+    def publish(self, projects, default_project=None):
+        """
+        Replace all projects with a new snapshot.
+
+        Args:
+            projects: Dict of project name -> project dictionary; the store
+                keeps versioned shallow copies, the dicts must not be changed
+                afterwards
+            default_project: Project selected in new views (defaults to the first)
+
+        Returns:
+            Snapshot: The new snapshot
+        """
+        with self._lock:
+            versioned = {name: dict(project, version=next(self._versions)) for name, project in projects.items()}
+            number = self._snapshot.version + 1 if self._snapshot else 1
+            self._snapshot = Snapshot(number, versioned)
+            self.default_project = default_project or next(iter(versioned), None)
+            snapshot = self._snapshot
+        self._notify(snapshot)
+        return snapshot
+
+    def commit(self, edits, bases):
+        """
+        Publish edited projects as a new snapshot.
+
+        Args:
+            edits: Dict of project name -> edited project dictionary
+            bases: Dict of project name -> version the edit started from
+
+        Returns:
+            Snapshot: The new snapshot
+
+        Raises:
+            ProjectConflictError: When another session saved one of the projects first
+        """
+        with self._lock:
+            current = self._snapshot
+            conflicts = [
+                name for name in edits
+                if name in current.projects and current.projects[name].get("version") != bases.get(name)
+            ]
+            if conflicts:
+                raise ProjectConflictError(conflicts)
+            projects = dict(current.projects)
+            projects.update(edits)
+            self._snapshot = Snapshot(current.version + 1, projects)
+            snapshot = self._snapshot
+        self._notify(snapshot)
+        return snapshot
+
+class _ParkedEdits(Mapping):
+    """Read-only mapping of project name -> edit parked in the shared store."""
+
+    def __init__(self, parked):
+        self._parked = parked
+
+    def __getitem__(self, name):
+        return get_shared_store().get(self._parked[name])
+
+    def __iter__(self):
+        return iter(self._parked)
+
+    def __len__(self):
+        return len(self._parked)
+
+class ProjectView:
+    """One session's view of the store: a snapshot plus the session's unsaved edits."""
+
+    def __init__(self, store, selected_project=None):
+        self.store = store
+        self.snapshot = store.snapshot()
+        self.edits = {}
+        self.parked = {}
+        self.bases = {}
+        self.selected_project = selected_project or store.default_project
+
+    def refresh(self):
+        """Move to the latest snapshot; unsaved edits stay on top of it."""
+        self.snapshot = self.store.snapshot()
+        if self.selected_project not in self.projects:
+            self.selected_project = self.store.default_project
+
+    @property
+    def projects(self):
+        """Project name -> project, edits first (read-only)."""
+        return ChainMap(self.edits, _ParkedEdits(self.parked), self.snapshot.projects)
+
+    @property
+    def dirty(self):
+        """True when the view has unsaved edits."""
+        return bool(self.edits or self.parked)
+
+    def project(self, name=None):
+        """
+        Return a project for reading.
+
+        Args:
+            name: Project name (defaults to the selected project)
+
+        Returns:
+            dict: The edited copy or the shared project; do not change it
+        """
+        return self.projects[name or self.selected_project]
+
+    def edit(self, name=None):
+        """
+        Return a project for changing.
+
+        The first call copies the shared project into the overlay; later
+        calls return the same copy. Call changed() after each change.
+
+        Args:
+            name: Project name (defaults to the selected project)
+
+        Returns:
+            dict: This session's copy of the project
+        """
+        name = name or self.selected_project
+        if name in self.parked:
+            # The parked value is shared by the store, so edit a private copy
+            self.edits[name] = copy.deepcopy(get_shared_store().get(self.parked.pop(name)))
+        elif name not in self.edits:
+            base = self.snapshot.projects[name]
+            self.bases[name] = base.get("version")
+            self.edits[name] = copy.deepcopy(base)
+            self.edits[name]["version"] = self.store.next_version()
+        return self.edits[name]
+
+    def changed(self, name=None):
+        """Mark an edited project as changed, so caches keyed on its version are refreshed."""
+        self.edits[name or self.selected_project]["version"] = self.store.next_version()
+
+    def edit_versions(self):
+        """Return (name, version) of every unsaved edit; changes whenever the edits do."""
+        return tuple((name, edit.get("version")) for name, edit in self.edits.items()) + tuple(self.parked)
+
+    def discard(self, name=None):
+        """Drop the unsaved edits of a project, or of all projects when name is None."""
+        for discarded in [name] if name else list(self.edits) + list(self.parked):
+            self.edits.pop(discarded, None)
+            self.parked.pop(discarded, None)
+            self.bases.pop(discarded, None)
+
+    def park_edits(self):
+        """
+        Move the unsaved edits to the shared store to free session memory.
+
+        The edits stay readable through projects; the next edit() of a
+        parked project copies it back into the overlay.
+
+        Returns:
+            list: Names of the parked projects
+        """
+        from utils.session_memory import deep_sizeof
+
+        store = get_shared_store()
+        parked = list(self.edits)
+        for name in parked:
+            edit = self.edits.pop(name)
+            self.parked[name] = store.put(edit, size=deep_sizeof(edit))
+        return parked
+
+    def save(self):
+        """
+        Publish the unsaved edits to all sessions.
+
+        Raises:
+            ProjectConflictError: When another session saved one of the
+                projects first; the edits are kept
+        """
+        if not self.dirty:
+            return
+        edits = dict(_ParkedEdits(self.parked))
+        edits.update(self.edits)
+        self.snapshot = self.store.commit(edits, self.bases)
+        self.edits = {}
+        self.parked = {}
+        self.bases = {}
+
+_project_store = None
+_project_store_lock = threading.Lock()
+
+def get_project_store():
+    """Return the process-wide project store, filled with the sample projects on first use."""
+    global _project_store
+    with _project_store_lock:
+        if _project_store is None:
+            from utils.data_utils import build_sample_portfolio
+
+            portfolio = build_sample_portfolio()
+            _project_store = ProjectStore(portfolio["projects"], portfolio["selected_project"])
+        return _project_store
@@ -0,0 +1,295 @@
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import visualization
+from utils.metrics import cached_for_project
+
+logger = logging.getLogger(__name__)
+
+# Directory where pre-rendered chart images are stored, named by content hash
+RENDER_DIR = os.environ.get(
+    "RENDER_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "renders")
+)
+
+# Bump when chart styling changes so stale renders are not reused
+RENDER_VERSION = "1"
+
+RENDER_FORMATS = ("png", "svg")
+
+# Renders older than RENDER_MAX_AGE seconds are deleted, then the oldest
+# ones while the directory holds more than RENDER_DIR_MAX_MB; checked at
+# most every RENDER_PRUNE_INTERVAL seconds after a render
+RENDER_MAX_AGE = float(os.environ.get("RENDER_MAX_AGE", 7 * 24 * 3600))
+RENDER_DIR_MAX_MB = float(os.environ.get("RENDER_DIR_MAX_MB", 200))
+RENDER_PRUNE_INTERVAL = 60
+
+# Seconds before a failed render is tried again
+RENDER_RETRY_SECONDS = float(os.environ.get("RENDER_RETRY_SECONDS", 300))
+
+# Chart name -> (builder, function extracting the builder inputs from a project)
+CHART_BUILDERS = {
+    "gantt": (visualization.create_gantt_chart, lambda p: (p.get("wbs", []),)),
+    "resource_allocation": (visualization.create_resource_allocation_chart, lambda p: (p.get("resources", []),)),
+    "raid_compliance": (visualization.create_raid_compliance_chart, lambda p: (p.get("raid", {}),)),
+    "decision_status": (visualization.create_decision_status_chart, lambda p: (p.get("decisions", []),)),
+    "wordcloud": (visualization.create_wordcloud, lambda p: (p.get("team_feedback", []),)),
+    "critical_path": (visualization.create_critical_path_network, lambda p: (p.get("wbs", []),)),
+}
+
+# Charts that need data a project may not have
+CHART_REQUIREMENTS = {
+    "gantt": "wbs",
+    "resource_allocation": "resources",
+    "raid_compliance": "raid",
+    "decision_status": "decisions",
+    "wordcloud": "team_feedback",
+    "critical_path": "wbs",
+}
+
+# Plotly static export needs the optional kaleido package; without it only
+# Matplotlib charts are pre-rendered
+PLOTLY_EXPORT_AVAILABLE = importlib.util.find_spec("kaleido") is not None
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = {}
+_failed = {}
+_pending_lock = threading.Lock()
+_last_prune = 0.0
+
+# Charts drawn with Matplotlib, which can always be exported
+MATPLOTLIB_CHARTS = {"wordcloud", "critical_path"}
+
+def _get_executor():
+    """Return the process-wide render worker pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.environ.get("RENDER_WORKERS", "2"))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chart-render")
+        return _executor
+
+def render_key(chart_name, inputs, fmt):
+    """
+    Compute the content hash identifying a rendered chart.
+
+    Args:
+        chart_name: Name of the chart in CHART_BUILDERS
+        inputs: Tuple of builder inputs
+        fmt: Image format ("png" or "svg")
+
+    Returns:
+        str: Hex digest used as the file name
+    """
+    payload = json.dumps([RENDER_VERSION, chart_name, fmt, inputs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def render_path(key, fmt):
+    """Return the on-disk location of a rendered chart."""
+    return os.path.join(RENDER_DIR, f"{key}.{fmt}")
+
+def _save_figure(fig, path, fmt):
+    """Write a Plotly or Matplotlib figure to disk atomically."""
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    if hasattr(fig, "savefig"):
+        fig.savefig(tmp_path, format=fmt, bbox_inches="tight")
+    else:
+        # Plotly static export requires the optional kaleido package
+        fig.write_image(tmp_path, format=fmt)
+    os.replace(tmp_path, path)
+
+def _render(chart_name, inputs, fmt, path):
+    """Build one chart and save it; runs on a worker thread."""
+    builder, _ = CHART_BUILDERS[chart_name]
+    try:
+        fig = builder(*inputs)
+        _save_figure(fig, path, fmt)
+    except Exception:
+        logger.warning("Failed to pre-render %s as %s", chart_name, fmt, exc_info=True)
+        with _pending_lock:
+            _failed[path] = time.time()
+        return None
+    finally:
+        with _pending_lock:
+            _pending.pop(path, None)
+    _maybe_prune()
+    return path
+
+def prune_renders(max_age=RENDER_MAX_AGE, max_mb=RENDER_DIR_MAX_MB):
+    """
+    Delete old renders from RENDER_DIR.
+
+    Renders of current project versions are rendered again when they are
+    requested after being deleted.
+
+    Args:
+        max_age: Delete files older than this many seconds
+        max_mb: Then delete the oldest files while the directory is larger
+
+    Returns:
+        int: Number of deleted files
+    """
+    try:
+        names = os.listdir(RENDER_DIR)
+    except FileNotFoundError:
+        return 0
+    now = time.time()
+    files = []
+    for name in names:
+        path = os.path.join(RENDER_DIR, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    files.sort()
+
+    total = sum(size for _, size, _ in files)
+    deleted = 0
+    for mtime, size, path in files:
+        if now - mtime <= max_age and total <= max_mb * 2 ** 20:
+            break
+        if path.endswith(".tmp") and now - mtime <= max_age:
+            # Written by a render in progress
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        deleted += 1
+    return deleted
+
+def _maybe_prune():
+    global _last_prune
+    with _pending_lock:
+        if time.time() - _last_prune < RENDER_PRUNE_INTERVAL:
+            return
+        _last_prune = time.time()
+    try:
+        deleted = prune_renders()
+    except OSError:
+        logger.warning("Failed to prune %s", RENDER_DIR, exc_info=True)
+        return
+    if deleted:
+        logger.info("Deleted %d old renders", deleted)
+
+def _chart_inputs(chart_name, project):
+    """Return the builder inputs for a chart, or None if the project lacks the data."""
+    if not project.get(CHART_REQUIREMENTS[chart_name]):
+        return None
+    _, extract = CHART_BUILDERS[chart_name]
+    return extract(project)
+
+def _chart_keys(project, fmt):
+    keys = {}
+    for chart_name in CHART_BUILDERS:
+        inputs = _chart_inputs(chart_name, project)
+        if inputs is not None:
+            keys[chart_name] = render_key(chart_name, inputs, fmt)
+    return keys
+
+def project_render_keys(project, fmt="png"):
+    """
+    Return the render keys of a project's charts, memoized by project version.
+
+    Hashing the chart inputs serializes the whole WBS, so it is done once
+    per project version instead of on every rerun.
+
+    Args:
+        project: Project dictionary
+        fmt: Image format
+
+    Returns:
+        dict: Chart name -> render key for every chart the project has data for (read-only)
+    """
+    return cached_for_project(
+        f"render_keys.{fmt}",
+        project,
+        None,
+        lambda project, today: _chart_keys(project, fmt)
+    )
+
+def prerender_project(project, charts=None, formats=RENDER_FORMATS):
+    """
+    Queue background renders for every chart of a project that is not on disk yet.
+
+    Renders are keyed by the hash of their inputs, so calling this again for an
+    unchanged project is cheap and never renders the same chart twice. A
+    failed render is tried again after RENDER_RETRY_SECONDS.
+
+    Args:
+        project: Project dictionary
+        charts: Optional list of chart names (defaults to all CHART_BUILDERS)
+        formats: Image formats to produce
+
+    Returns:
+        dict: (chart name, format) -> Future resolving to the file path (or None
+        on failure); charts already rendered are not included
+    """
+    os.makedirs(RENDER_DIR, exist_ok=True)
+    futures = {}
+    for chart_name in charts or CHART_BUILDERS:
+        if chart_name not in MATPLOTLIB_CHARTS and not PLOTLY_EXPORT_AVAILABLE:
+            continue
+        for fmt in formats:
+            key = project_render_keys(project, fmt).get(chart_name)
+            if key is None:
+                continue
+            path = render_path(key, fmt)
+            if os.path.exists(path):
+                continue
+            with _pending_lock:
+                if path in _failed:
+                    if time.time() - _failed[path] < RENDER_RETRY_SECONDS:
+                        continue
+                    del _failed[path]
+                future = _pending.get(path)
+                if future is None:
+                    future = _get_executor().submit(_render, chart_name, _chart_inputs(chart_name, project), fmt, path)
+                    _pending[path] = future
+            futures[(chart_name, fmt)] = future
+    return futures
+
+def get_rendered_path(chart_name, project, fmt="png"):
+    """
+    Return the path of a ready-made render of a chart, or None if it is not available yet.
+
+    Args:
+        chart_name: Name of the chart in CHART_BUILDERS
+        project: Project dictionary
+        fmt: Image format
+
+    Returns:
+        str or None: Path to the rendered file
+    """
+    key = project_render_keys(project, fmt).get(chart_name)
+    if key is None:
+        return None
+    path = render_path(key, fmt)
+    return path if os.path.exists(path) else None
+
+def rendered_assets(project, fmt="png"):
+    """
+    Collect the ready-made renders of a project, e.g. for a status pack or thumbnails.
+
+    Args:
+        project: Project dictionary
+        fmt: Image format
+
+    Returns:
+        dict: Chart name -> file path for every chart already rendered
+    """
+    assets = {}
+    for chart_name in CHART_BUILDERS:
+        path = get_rendered_path(chart_name, project, fmt)
+        if path:
+            assets[chart_name] = path
+    return assets
@@ -0,0 +1,141 @@
+"""
+Memory regression check for the Matplotlib charts.
+
+Draws the word cloud and the critical path network to PNG repeatedly, as a
+long-running server does on every rerun, and exits with code 1 when memory
+grows between the end of the warm-up and the end of the run:
+
+    python -m utils.render_memory_check --renders 10000
+
+Two measures are compared, both taken after a full garbage collection:
+- Live Python objects. Figures that are never released (e.g. kept by
+  pyplot's figure manager) show up here deterministically.
+- Resident memory after returning freed heap pages to the OS
+  (malloc_trim, glibc only). Without the trim the resident size keeps
+  whatever peak the allocator reached; each word cloud briefly allocates
+  several MB of image buffers, so the untrimmed size rises by a few MB
+  over the first few hundred renders and then stays flat.
+
+10,000 renders take over two hours, mostly spent laying out the word cloud.
+"""
+import argparse
+import ctypes
+import ctypes.util
+import datetime
+import gc
+import io
+import os
+import resource
+import sys
+import time
+
+# Largest allowed growth after the warm-up
+MAX_RSS_GROWTH_MB = 2.0
+MAX_OBJECT_GROWTH = 1000
+
+def current_rss_mb():
+    """Return the current resident set size of the process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        # Peak instead of current RSS where /proc is not available
+        unit = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2 ** 20
+
+def _malloc_trim():
+    """Return a function releasing free heap memory to the OS, or None without glibc."""
+    path = ctypes.util.find_library("c")
+    try:
+        return ctypes.CDLL(path).malloc_trim if path else None
+    except (OSError, AttributeError):
+        return None
+
+def measure(trim):
+    """Collect garbage and return (live objects, resident MB)."""
+    gc.collect()
+    if trim is not None:
+        trim(0)
+    return len(gc.get_objects()), current_rss_mb()
+
+def run_check(renders=10000, warmup=50, log=None):
+    """
+    Draw both Matplotlib charts repeatedly and measure the memory growth.
+
+    Args:
+        renders: Renders of each chart after the warm-up
+        warmup: Renders before the reference measurement (fills font and
+            layout caches)
+        log: Optional callable receiving progress lines
+
+    Returns:
+        dict: renders, seconds, objects_start, objects_end, object_growth,
+        rss_start_mb, rss_end_mb, rss_growth_mb and trimmed (whether
+        malloc_trim was available)
+    """
+    from utils import visualization
+    from utils.data_utils import generate_sample_project_1
+
+    project = generate_sample_project_1(datetime.datetime.now().date())
+    trim = _malloc_trim()
+
+    def render():
+        for fig in (
+            visualization.create_wordcloud(project["team_feedback"]),
+            visualization.create_critical_path_network(project["wbs"])
+        ):
+            fig.savefig(io.BytesIO(), format="png")
+
+    for _ in range(warmup):
+        render()
+    objects_start, rss_start = measure(trim)
+
+    started = time.perf_counter()
+    step = max(1, renders // 10)
+    for number in range(1, renders + 1):
+        render()
+        if log and number % step == 0:
+            objects, rss = measure(trim)
+            log(f"{number}/{renders} renders: {objects} objects, RSS {rss:.1f} MB")
+    seconds = time.perf_counter() - started
+
+    objects_end, rss_end = measure(trim)
+    return {
+        "renders": renders,
+        "seconds": seconds,
+        "objects_start": objects_start,
+        "objects_end": objects_end,
+        "object_growth": objects_end - objects_start,
+        "rss_start_mb": rss_start,
+        "rss_end_mb": rss_end,
+        "rss_growth_mb": rss_end - rss_start,
+        "trimmed": trim is not None
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that repeated Matplotlib chart renders keep memory flat.")
+    parser.add_argument("--renders", type=int, default=10000, help="Renders of each chart")
+    parser.add_argument("--warmup", type=int, default=50, help="Renders before the reference measurement")
+    parser.add_argument("--max-rss-growth", type=float, default=MAX_RSS_GROWTH_MB, help="Allowed resident memory growth (MB)")
+    parser.add_argument("--max-object-growth", type=int, default=MAX_OBJECT_GROWTH, help="Allowed growth of live Python objects")
+    args = parser.parse_args(argv)
+
+    result = run_check(args.renders, args.warmup, log=print)
+    print(
+        f"{result['renders']} renders in {result['seconds']:.0f} s: "
+        f"{result['objects_start']} -> {result['objects_end']} objects ({result['object_growth']:+d}), "
+        f"RSS {result['rss_start_mb']:.1f} -> {result['rss_end_mb']:.1f} MB ({result['rss_growth_mb']:+.1f} MB"
+        + (")" if result["trimmed"] else ", without malloc_trim)")
+    )
+
+    failures = []
+    if result["object_growth"] > args.max_object_growth:
+        failures.append(f"live objects grew by {result['object_growth']} (limit {args.max_object_growth})")
+    if result["rss_growth_mb"] > args.max_rss_growth:
+        failures.append(f"RSS grew by {result['rss_growth_mb']:.1f} MB (limit {args.max_rss_growth:.1f} MB)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
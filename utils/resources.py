@@ -0,0 +1,150 @@
+import datetime
+import html
+
+from utils.metrics import cached_for_project
+
+# Utilization bands used by the resource chart, filters and status cards
+BAND_OVER = "Over-allocated"
+BAND_NEAR = "Near Capacity"
+BAND_HEALTHY = "Healthy"
+UTILIZATION_BANDS = [BAND_OVER, BAND_NEAR, BAND_HEALTHY]
+
+BAND_COLORS = {
+    BAND_OVER: "red",
+    BAND_NEAR: "orange",
+    BAND_HEALTHY: "green"
+}
+
+BAND_STATUS_CLASSES = {
+    BAND_OVER: "status-delayed",
+    BAND_NEAR: "status-at-risk",
+    BAND_HEALTHY: "status-on-track"
+}
+
+RESOURCE_COLUMNS = ["Name", "Role", "Availability", "Allocated", "Utilization", "Band", "Skills", "Search Text"]
+
+def resource_frame(resource_data):
+    """
+    Build a columnar view of team resources with utilization computed vectorized.
+
+    Args:
+        resource_data: List of resource dictionaries
+
+    Returns:
+        DataFrame: One row per resource with the RESOURCE_COLUMNS columns
+    """
+    import numpy as np
+    import pandas as pd
+
+    if not resource_data:
+        return pd.DataFrame(columns=RESOURCE_COLUMNS)
+
+    df = pd.DataFrame.from_records(resource_data).rename(columns={
+        "name": "Name",
+        "role": "Role",
+        "availability": "Availability",
+        "allocated": "Allocated",
+        "skills": "Skills"
+    })
+    if "Skills" not in df:
+        df["Skills"] = [[] for _ in range(len(df))]
+
+    availability = df["Availability"].to_numpy(dtype=float)
+    allocated = df["Allocated"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        utilization = np.where(availability > 0, allocated / availability * 100, 0.0)
+    df["Utilization"] = utilization
+    df["Band"] = np.select(
+        [utilization > 100, utilization > 90],
+        [BAND_OVER, BAND_NEAR],
+        default=BAND_HEALTHY
+    )
+    # Lower-cased name, role and skills for searching
+    df["Search Text"] = (
+        df["Name"].astype(str) + "\n" + df["Role"].astype(str) + "\n"
+        + df["Skills"].map(lambda skills: "\n".join(skills or []))
+    ).str.lower()
+
+    return df[RESOURCE_COLUMNS]
+
+def get_resource_frame(project, today=None):
+    """
+    Return the resource frame of a project, memoized by project version.
+
+    Args:
+        project: Project dictionary
+        today: Reference date (defaults to the current date)
+
+    Returns:
+        DataFrame: Result of resource_frame (read-only)
+    """
+    return cached_for_project(
+        "resources",
+        project,
+        today or datetime.datetime.now().date(),
+        lambda p, day: resource_frame(p.get("resources", []))
+    )
+
+def query_resources(df, roles=None, bands=None, search=None, sort_by="Utilization", ascending=False):
+    """
+    Filter and sort a resource frame.
+
+    Args:
+        df: DataFrame from resource_frame
+        roles: Optional list of roles to keep
+        bands: Optional list of utilization bands to keep
+        search: Optional text matched (case-insensitively) against name, role
+            and skills
+        sort_by: Column to sort by
+        ascending: Sort direction
+
+    Returns:
+        DataFrame: Matching resources in the requested order
+    """
+    import numpy as np
+
+    mask = np.ones(len(df), dtype=bool)
+    if roles:
+        mask &= df["Role"].isin(roles).to_numpy()
+    if bands:
+        mask &= df["Band"].isin(bands).to_numpy()
+    if search and search.strip():
+        mask &= df["Search Text"].str.contains(search.strip().lower(), regex=False).to_numpy()
+
+    # Stable sort so resources with equal values keep their original order
+    return df[mask].sort_values(by=sort_by, ascending=ascending, kind="stable")
+
+def resource_cards_html(df):
+    """
+    Render a page of resources as one grid of cards.
+
+    The whole page is a single HTML payload, so it costs one element in the
+    Streamlit delta stream regardless of the number of cards.
+
+    Args:
+        df: (Paged) DataFrame from resource_frame or query_resources
+
+    Returns:
+        str: HTML grid of resource cards
+    """
+    cards = []
+    for name, role, allocated, availability, utilization, band in zip(
+        df["Name"], df["Role"], df["Allocated"], df["Availability"], df["Utilization"], df["Band"]
+    ):
+        bar_color = '#F44336' if utilization > 100 else '#4CAF50'
+        cards.append(
+            f'<div class="card">'
+            f'<h3>{html.escape(str(name))}</h3>'
+            f'<p><strong>Role:</strong> {html.escape(str(role))}</p>'
+            f'<p><strong>Utilization:</strong> <span class="{BAND_STATUS_CLASSES[band]}">{utilization:.0f}%</span></p>'
+            f'<div style="background-color: #f0f0f0; height: 10px; border-radius: 5px; margin-top: 10px;">'
+            f'<div style="background-color: {bar_color}; width: {min(100, utilization)}%; height: 10px; border-radius: 5px;"></div>'
+            f'</div>'
+            f'<p><strong>Allocated:</strong> {allocated} hrs / <strong>Available:</strong> {availability} hrs</p>'
+            f'</div>'
+        )
+    return (
+        '<div style="display: grid; grid-template-columns: repeat(3, minmax(0, 1fr)); gap: 0 1rem;">'
+        + "".join(cards)
+        + '</div>'
+    )
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from utils.metrics import cached_for_project
+
+# Location and limits of the assistant response cache
+RESPONSE_CACHE_PATH = os.environ.get(
+    "RESPONSE_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "response_cache.sqlite3")
+)
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", 24 * 3600))
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", 1000))
+# Minimum word-set similarity for near-duplicate prompts; 0 disables matching
+RESPONSE_CACHE_SIMILARITY = float(os.environ.get("RESPONSE_CACHE_SIMILARITY", 0.8))
+
+# Function words that do not change the meaning of a question to the
+# assistant; content words such as "project" or "current" are kept
+STOP_WORDS = {
+    "a", "an", "the", "me", "my", "please", "can", "could", "you", "would",
+    "is", "are", "of", "for", "to", "what", "whats", "i", "we", "our", "us",
+    "on", "about"
+}
+
+def normalize_prompt(prompt):
+    """
+    Normalize a prompt for cache lookups: lower case, no punctuation, single spaces.
+
+    Args:
+        prompt: User prompt
+
+    Returns:
+        str: Normalized prompt
+    """
+    return " ".join(re.findall(r"[a-z0-9]+", prompt.lower()))
+
+def prompt_terms(normalized_prompt):
+    """Return the meaningful words of a normalized prompt."""
+    words = set(normalized_prompt.split())
+    return (words - STOP_WORDS) or words
+
+def project_snapshot_hash(project):
+    """
+    Hash the content of a project, memoized by project version.
+
+    Args:
+        project: Project dictionary
+
+    Returns:
+        str: Hex digest identifying the project state
+    """
+    def compute(p, _):
+        payload = json.dumps(p, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    return cached_for_project("snapshot", project, None, compute)
+
+def _similarity(terms_a, terms_b):
+    """Jaccard similarity of two word sets."""
+    if not terms_a or not terms_b:
+        return 0.0
+    return len(terms_a & terms_b) / len(terms_a | terms_b)
+
+class ResponseCache:
+    """
+    Persistent cache of assistant answers keyed by normalized prompt and project snapshot.
+
+    Entries expire after a TTL and the least recently used ones are evicted
+    beyond max_entries. Because the key contains the project snapshot hash,
+    answers are never served for data they were not generated from. Entries
+    for other snapshots of a project are left to the TTL and LRU eviction,
+    since sessions may view different versions of the same project (e.g.
+    one with unsaved edits).
+
+    The key does not cover the conversation, so only answers to questions
+    asked without earlier turns may be stored and looked up.
+    """
+
+    def __init__(self, path=RESPONSE_CACHE_PATH, ttl=RESPONSE_CACHE_TTL,
+                 max_entries=RESPONSE_CACHE_SIZE, similarity=RESPONSE_CACHE_SIMILARITY):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                project TEXT,
+                snapshot TEXT,
+                prompt TEXT,
+                response TEXT,
+                created REAL,
+                accessed REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_snapshot ON responses (snapshot)")
+        self._conn.commit()
+
+    @staticmethod
+    def _key(normalized_prompt, snapshot):
+        return hashlib.sha256(f"{snapshot}\n{normalized_prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, prompt, project):
+        """
+        Look up a cached answer for a prompt about a project.
+
+        Args:
+            prompt: User prompt
+            project: Project dictionary the answer must be based on
+
+        Returns:
+            str or None: Cached answer, or None on a miss
+        """
+        normalized = normalize_prompt(prompt)
+        snapshot = project_snapshot_hash(project)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, response FROM responses WHERE key = ? AND created >= ?",
+                (self._key(normalized, snapshot), now - self.ttl)
+            ).fetchone()
+
+            if row is None and self.similarity > 0:
+                # Near-duplicate prompts about the same snapshot
+                terms = prompt_terms(normalized)
+                best = None
+                for key, cached_prompt, response in self._conn.execute(
+                    "SELECT key, prompt, response FROM responses WHERE snapshot = ? AND created >= ?",
+                    (snapshot, now - self.ttl)
+                ):
+                    score = _similarity(terms, prompt_terms(cached_prompt))
+                    if score >= self.similarity and (best is None or score > best[0]):
+                        best = (score, key, response)
+                if best is not None:
+                    row = best[1:]
+
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, row[0]))
+            self._conn.commit()
+            return row[1]
+
+    def put(self, prompt, project, response):
+        """
+        Store an answer for a prompt about a project.
+
+        Args:
+            prompt: User prompt
+            project: Project dictionary the answer was based on
+            response: Answer text
+        """
+        normalized = normalize_prompt(prompt)
+        snapshot = project_snapshot_hash(project)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self._key(normalized, snapshot), project.get("name"), snapshot, normalized, response, now, now)
+            )
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            self._conn.execute(
+                """DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every cached answer."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """Return the process-wide response cache, opening it on first use."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
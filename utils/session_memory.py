@@ -0,0 +1,220 @@
+"""
+Memory accounting and caps for Streamlit session state.
+
+Projects are shared through utils.project_store, but every session keeps
+full copies of the projects it edits in its ProjectView until they are
+saved, so a few heavy sessions can exhaust the container's memory.
+check_session measures the deep size of each session state key, records it
+in the process-wide registry shown in the performance panel, and parks the
+unsaved edits of a view in the shared store when its key or the whole
+session exceeds its cap.
+"""
+import os
+import sys
+import threading
+import time
+import types
+
+from utils.shared_store import get_shared_store
+
+# Caps in MB: the edits of a view whose key is above SESSION_KEY_CAP_MB are
+# parked, and further views are parked, largest first, while the session
+# exceeds SESSION_STATE_CAP_MB
+SESSION_STATE_CAP_MB = float(os.environ.get("SESSION_STATE_CAP_MB", 64))
+SESSION_KEY_CAP_MB = float(os.environ.get("SESSION_KEY_CAP_MB", 16))
+
+# Seconds between measurements of a session whose keys still hold the same objects
+SESSION_MEMORY_INTERVAL = float(os.environ.get("SESSION_MEMORY_INTERVAL", 30))
+
+# Sessions not measured for this long are dropped from the registry
+SESSION_MEMORY_TTL = 3600
+
+# Objects that belong to the program rather than to a session
+_NOT_SESSION_DATA = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+def deep_sizeof(obj):
+    """
+    Estimate the memory held by an object and everything it references.
+
+    Containers, instance attributes and slots are followed; objects reached
+    twice are counted once. pandas objects report their deep memory usage
+    and NumPy arrays their buffer size. Classes, modules, functions and
+    objects whose class sets shared_between_sessions (e.g. the project store
+    snapshots) are not counted.
+
+    Args:
+        obj: Any object
+
+    Returns:
+        int: Size in bytes
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _NOT_SESSION_DATA):
+            continue
+        if getattr(type(obj), "shared_between_sessions", False):
+            continue
+        seen.add(id(obj))
+
+        module = type(obj).__module__
+        if module.startswith("pandas") and hasattr(obj, "memory_usage"):
+            usage = obj.memory_usage(deep=True)
+            total += int(getattr(usage, "sum", lambda: usage)())
+            continue
+        if module == "numpy" and hasattr(obj, "nbytes"):
+            total += sys.getsizeof(obj) + (obj.nbytes if getattr(obj, "base", None) is None else 0)
+            continue
+
+        try:
+            total += sys.getsizeof(obj)
+        except TypeError:
+            continue
+        if isinstance(obj, (str, bytes, bytearray, int, float, complex, bool)) or obj is None:
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)) or type(obj).__name__ == "deque":
+            stack.extend(obj)
+        if hasattr(obj, "__dict__"):
+            stack.append(obj.__dict__)
+        for slot in getattr(type(obj), "__slots__", ()):
+            if slot != "__weakref__" and hasattr(obj, slot):
+                stack.append(getattr(obj, slot))
+    return total
+
+def enforce_caps(state, sizes, key_cap_mb=SESSION_KEY_CAP_MB, session_cap_mb=SESSION_STATE_CAP_MB):
+    """
+    Park unsaved project edits in the shared store to respect the caps.
+
+    Args:
+        state: Session state mapping; values with a park_edits method
+            (project_store.ProjectView) can be shrunk
+        sizes: Key -> size in bytes, largest first; updated in place
+        key_cap_mb: Maximum size of a single key
+        session_cap_mb: Maximum size of the whole session
+
+    Returns:
+        list: Parked projects as "key/project name"
+    """
+    offloaded = []
+    candidates = [key for key in sizes if hasattr(state[key], "park_edits")]
+    for key in candidates:
+        over_key_cap = sizes[key] > key_cap_mb * 2 ** 20
+        over_session_cap = sum(sizes.values()) > session_cap_mb * 2 ** 20
+        if not (over_key_cap or over_session_cap):
+            continue
+        parked = state[key].park_edits()
+        if parked:
+            sizes[key] = deep_sizeof(state[key])
+            offloaded.extend(f"{key}/{name}" for name in parked)
+    return offloaded
+
+class SessionMemoryRegistry:
+    """Latest session state measurements of every session in the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def update(self, session, sizes, offloaded, measure_ms):
+        """Record a measurement of a session."""
+        with self._lock:
+            previous = self._sessions.get(session, {})
+            self._sessions[session] = {
+                "session": session,
+                "total_bytes": sum(sizes.values()),
+                "largest_key": next(iter(sizes), None),
+                "keys": sizes,
+                "offloaded": previous.get("offloaded", 0) + len(offloaded),
+                "measure_ms": measure_ms,
+                "updated": time.time()
+            }
+
+    def report(self):
+        """
+        Summarize the recorded sessions, dropping those idle for SESSION_MEMORY_TTL.
+
+        Returns:
+            dict: sessions (rows without the per-key sizes, largest first),
+            total_bytes and the shared store report
+        """
+        cutoff = time.time() - SESSION_MEMORY_TTL
+        with self._lock:
+            for session in [s for s, entry in self._sessions.items() if entry["updated"] < cutoff]:
+                del self._sessions[session]
+            rows = [
+                {key: value for key, value in entry.items() if key != "keys"}
+                for entry in self._sessions.values()
+            ]
+        rows.sort(key=lambda row: row["total_bytes"], reverse=True)
+        return {
+            "sessions": rows,
+            "total_bytes": sum(row["total_bytes"] for row in rows),
+            "shared_store": get_shared_store().report()
+        }
+
+    def keys(self, session):
+        """Return the latest per-key sizes of a session."""
+        with self._lock:
+            entry = self._sessions.get(session)
+            return dict(entry["keys"]) if entry else {}
+
+    def clear(self):
+        """Forget every session."""
+        with self._lock:
+            self._sessions.clear()
+
+_registry = SessionMemoryRegistry()
+
+def memory_registry():
+    """Return the process-wide session memory registry."""
+    return _registry
+
+def _identity(value):
+    # Views are changed in place, so their edit versions tell whether to measure again
+    if hasattr(value, "edit_versions"):
+        return id(value), value.edit_versions()
+    return id(value)
+
+def check_session(state, session, marker_key="_memory_check", force=False):
+    """
+    Measure a session state, record it and enforce the caps.
+
+    Measuring a large portfolio takes a while, so between full measurements
+    (every SESSION_MEMORY_INTERVAL seconds) only keys holding a different
+    object than at the previous check, or a view whose unsaved edits
+    changed, are measured again.
+
+    Args:
+        state: Session state mapping
+        session: Session label for the registry
+        marker_key: Session state key remembering the previous measurement
+        force: Measure every key again
+
+    Returns:
+        list: Projects parked by this check (see enforce_caps)
+    """
+    now = time.time()
+    measured_at, previous = state[marker_key] if marker_key in state else (0, {})
+    if force or now - measured_at >= SESSION_MEMORY_INTERVAL:
+        measured_at, previous = now, {}
+
+    start = time.perf_counter()
+    sizes = {}
+    for key in list(state.keys()):
+        if key == marker_key:
+            continue
+        value = state[key]
+        cached = previous.get(key)
+        sizes[key] = cached[1] if cached and cached[0] == _identity(value) else deep_sizeof(value)
+    sizes = dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+    offloaded = enforce_caps(state, sizes)
+    sizes = dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+    _registry.update(session, sizes, offloaded, (time.perf_counter() - start) * 1000)
+
+    state[marker_key] = (measured_at, {key: (_identity(state[key]), size) for key, size in sizes.items()})
+    return offloaded
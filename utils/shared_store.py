@@ -0,0 +1,135 @@
+"""
+Process-wide store for large read-only values offloaded from session state.
+
+Values are stored once per content digest as zlib-compressed pickles, so
+sessions holding the same data (e.g. the same unsaved project edits) share
+a single copy. Session state keeps a small SharedRef instead of the value
+(see ProjectView.park_edits); the store
+forgets a value once no SharedRef to it is left. The most recently used
+values are also kept decoded, and those decoded objects are shared between
+sessions: treat them as read-only and copy before changing them.
+"""
+import collections
+import hashlib
+import os
+import pickle
+import threading
+import weakref
+import zlib
+
+# Number of decoded values kept for fast access
+SHARED_STORE_DECODED = int(os.environ.get("SHARED_STORE_DECODED", 4))
+
+class SharedRef:
+    """Handle of a value in the shared store, kept in session state instead of the value."""
+
+    __slots__ = ("digest", "size", "__weakref__")
+
+    def __init__(self, digest, size):
+        self.digest = digest
+        self.size = size
+
+    def __repr__(self):
+        return f"SharedRef({self.digest[:12]}, {self.size} bytes)"
+
+class SharedStore:
+    """Content-addressed, reference-counted store of compressed values."""
+
+    def __init__(self, max_decoded=SHARED_STORE_DECODED):
+        self.max_decoded = max_decoded
+        self._lock = threading.Lock()
+        self._blobs = {}
+        self._refs = collections.Counter()
+        self._decoded = collections.OrderedDict()
+        self.stats = {"puts": 0, "deduplicated": 0, "hits": 0, "decodes": 0}
+
+    def put(self, value, size=0):
+        """
+        Store a value.
+
+        Args:
+            value: Picklable value; it is also kept decoded, so the caller
+                must not change it afterwards
+            size: In-memory size of the value, for reporting
+
+        Returns:
+            SharedRef: Handle to keep in place of the value
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hashlib.sha1(blob).hexdigest()
+        with self._lock:
+            self.stats["puts"] += 1
+            if digest in self._blobs:
+                self.stats["deduplicated"] += 1
+            else:
+                self._blobs[digest] = zlib.compress(blob, 1)
+            self._refs[digest] += 1
+            self._remember(digest, value)
+        ref = SharedRef(digest, size)
+        weakref.finalize(ref, self._release, digest)
+        return ref
+
+    def get(self, ref):
+        """
+        Return the value of a handle.
+
+        Args:
+            ref: SharedRef returned by put
+
+        Returns:
+            The stored value (shared between sessions, read-only)
+        """
+        with self._lock:
+            if ref.digest in self._decoded:
+                self._decoded.move_to_end(ref.digest)
+                self.stats["hits"] += 1
+                return self._decoded[ref.digest]
+            blob = self._blobs[ref.digest]
+        value = pickle.loads(zlib.decompress(blob))
+        with self._lock:
+            self.stats["decodes"] += 1
+            if ref.digest in self._blobs:
+                self._remember(ref.digest, value)
+        return value
+
+    def _remember(self, digest, value):
+        self._decoded[digest] = value
+        self._decoded.move_to_end(digest)
+        while len(self._decoded) > self.max_decoded:
+            self._decoded.popitem(last=False)
+
+    def _release(self, digest):
+        with self._lock:
+            self._refs[digest] -= 1
+            if self._refs[digest] <= 0:
+                del self._refs[digest]
+                self._blobs.pop(digest, None)
+                self._decoded.pop(digest, None)
+
+    def report(self):
+        """
+        Summarize the store.
+
+        Returns:
+            dict: entries, compressed_bytes, references, decoded entries and
+            the put/get counters
+        """
+        with self._lock:
+            return dict(
+                self.stats,
+                entries=len(self._blobs),
+                compressed_bytes=sum(len(blob) for blob in self._blobs.values()),
+                references=sum(self._refs.values()),
+                decoded=len(self._decoded)
+            )
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+def get_shared_store():
+    """Return the process-wide shared store."""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = SharedStore()
+        return _shared_store
@@ -0,0 +1,160 @@
+"""
+Import-time report for the app's cold start.
+
+Runs a fresh interpreter with ``python -X importtime`` over the modules the
+app imports at startup and prints a per-module breakdown. Use ``--budget-ms``
+to fail (exit code 1) when the total exceeds a time-to-first-paint budget:
+
+    python -m utils.startup_report --budget-ms 1500
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_FILE = os.path.join(ROOT_DIR, "app_v2.py")
+
+def app_startup_modules(app_file=APP_FILE):
+    """
+    List the modules imported at module level by the app script.
+
+    Imports inside functions are deliberately excluded, since they are only
+    paid when the page or chart that needs them runs.
+
+    Args:
+        app_file: Path to the Streamlit app script
+
+    Returns:
+        list: Module names in import order
+    """
+    with open(app_file, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=app_file)
+
+    modules = []
+
+    def visit(statements):
+        for node in statements:
+            if isinstance(node, ast.Import):
+                modules.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                modules.append(node.module)
+            elif isinstance(node, ast.Try):
+                # Only the primary branch runs in a normal start
+                visit(node.body)
+            elif isinstance(node, ast.If):
+                visit(node.body)
+
+    visit(tree.body)
+    return list(dict.fromkeys(modules))
+
+def measure_imports(modules, python=sys.executable):
+    """
+    Import modules in a fresh interpreter and collect per-module import times.
+
+    Args:
+        modules: Module names to import, in order
+        python: Interpreter to run
+
+    Returns:
+        list: Entries with module, depth, self_ms and cumulative_ms, in the
+        order reported by the interpreter
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if line.endswith("| site"):
+            # Everything up to here is interpreter startup, not the app's imports
+            entries = []
+            continue
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip(" ")
+        entries.append({
+            "module": stripped.strip(),
+            "depth": (len(name) - len(stripped) - 1) // 2,
+            "self_ms": int(self_us.strip()) / 1000,
+            "cumulative_ms": int(cumulative_us.strip()) / 1000
+        })
+    return entries
+
+def build_report(entries, top=15):
+    """
+    Summarize import-time entries.
+
+    Args:
+        entries: Result of measure_imports
+        top: Number of most expensive packages to list
+
+    Returns:
+        dict: total_ms, per-requested-module cumulative times (modules) and
+        self time aggregated by top-level package (packages)
+    """
+    modules = [
+        {"module": entry["module"], "cumulative_ms": entry["cumulative_ms"]}
+        for entry in entries if entry["depth"] == 0
+    ]
+
+    packages = {}
+    for entry in entries:
+        package = entry["module"].split(".")[0]
+        packages[package] = packages.get(package, 0) + entry["self_ms"]
+
+    return {
+        "total_ms": sum(module["cumulative_ms"] for module in modules),
+        "modules": modules,
+        "packages": sorted(
+            ({"package": name, "self_ms": ms} for name, ms in packages.items()),
+            key=lambda item: item["self_ms"],
+            reverse=True
+        )[:top]
+    }
+
+def format_report(report, budget_ms=None):
+    """Render a report as a plain-text table."""
+    lines = ["Top-level imports (cumulative):"]
+    for module in report["modules"]:
+        lines.append(f"  {module['cumulative_ms']:9.1f} ms  {module['module']}")
+    lines.append("Most expensive packages (self time):")
+    for package in report["packages"]:
+        lines.append(f"  {package['self_ms']:9.1f} ms  {package['package']}")
+    total = f"Total import time: {report['total_ms']:.1f} ms"
+    if budget_ms is not None:
+        status = "OK" if report["total_ms"] <= budget_ms else "OVER BUDGET"
+        total += f" (budget {budget_ms:.0f} ms, {status})"
+    lines.append(total)
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report cold-start import times of the app.")
+    parser.add_argument("modules", nargs="*", help="Modules to import (defaults to the app's startup imports)")
+    parser.add_argument("--budget-ms", type=float, help="Fail if the total import time exceeds this budget")
+    parser.add_argument("--top", type=int, default=15, help="Number of packages to list")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = build_report(measure_imports(args.modules or app_startup_modules()), top=args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report, args.budget_ms))
+
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Lightweight tracing spans for finding where reruns spend their time.
+
+Tracing is off unless the APP_TRACING environment variable is set to 1.
+When it is off, span() returns a shared no-op context manager and traced()
+functions add a single flag check, so the instrumentation can stay in place.
+
+When it is on, every span duration is aggregated per process and, through
+the resolver registered with set_session_resolver, per user session. The
+most recent spans are also kept as records that export_jsonl writes out for
+offline analysis.
+"""
+import collections
+import json
+import os
+import threading
+import time
+from functools import wraps
+
+TRACING_ENABLED = os.environ.get("APP_TRACING", "") == "1"
+
+# Durations kept per span name for percentiles, and raw records kept for export
+TRACE_WINDOW = int(os.environ.get("TRACE_WINDOW", 2048))
+TRACE_BUFFER = int(os.environ.get("TRACE_BUFFER", 10000))
+
+class SpanStats:
+    """Durations of spans by name, keeping the latest TRACE_WINDOW of each for percentiles."""
+
+    def __init__(self, label="process"):
+        self.label = label
+        self._lock = threading.Lock()
+        self._spans = {}
+
+    def add(self, name, duration_ms):
+        """Record one span duration in milliseconds."""
+        with self._lock:
+            entry = self._spans.get(name)
+            if entry is None:
+                entry = self._spans[name] = [0, 0.0, collections.deque(maxlen=TRACE_WINDOW)]
+            entry[0] += 1
+            entry[1] += duration_ms
+            entry[2].append(duration_ms)
+
+    def summary(self):
+        """
+        Summarize the recorded spans.
+
+        Returns:
+            list: Dicts with span, count, p50_ms, p95_ms, max_ms and total_ms,
+            slowest total first; percentiles cover the latest TRACE_WINDOW spans
+        """
+        with self._lock:
+            entries = [(name, count, total, sorted(window)) for name, (count, total, window) in self._spans.items()]
+        rows = [
+            {
+                "span": name,
+                "count": count,
+                "p50_ms": _percentile(window, 50),
+                "p95_ms": _percentile(window, 95),
+                "max_ms": window[-1],
+                "total_ms": total
+            }
+            for name, count, total, window in entries
+        ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def clear(self):
+        """Forget every recorded span."""
+        with self._lock:
+            self._spans.clear()
+
+def _percentile(sorted_values, percent):
+    """Nearest-rank percentile of a sorted list."""
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+_process_stats = SpanStats()
+_records = collections.deque(maxlen=TRACE_BUFFER)
+_records_lock = threading.Lock()
+_session_resolver = None
+
+def set_session_resolver(resolver):
+    """
+    Register the function returning the current session's SpanStats.
+
+    Args:
+        resolver: Callable returning a SpanStats, or None outside a session
+            (e.g. in worker threads)
+    """
+    global _session_resolver
+    _session_resolver = resolver
+
+def process_stats():
+    """Return the process-wide span statistics."""
+    return _process_stats
+
+class _NullSpan:
+    """Span used while tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration_ms = (time.perf_counter() - self.start) * 1000
+        record_span(self.name, duration_ms)
+        return False
+
+def record_span(name, duration_ms):
+    """
+    Record a finished span in the process and session statistics.
+
+    Args:
+        name: Span name
+        duration_ms: Duration in milliseconds
+    """
+    _process_stats.add(name, duration_ms)
+    session = _session_resolver() if _session_resolver is not None else None
+    if session is not None:
+        session.add(name, duration_ms)
+    with _records_lock:
+        _records.append({
+            "ts": time.time(),
+            "span": name,
+            "ms": round(duration_ms, 3),
+            "session": session.label if session is not None else None,
+            "thread": threading.current_thread().name
+        })
+
+def span(name):
+    """
+    Time a block of code.
+
+        with span("dashboard.metrics"):
+            ...
+
+    Args:
+        name: Span name; dots group related spans
+
+    Returns:
+        Context manager
+    """
+    if not TRACING_ENABLED:
+        return _NULL_SPAN
+    return _Span(name)
+
+def traced(name):
+    """
+    Decorator timing every call of a function as a span.
+
+    Args:
+        name: Span name
+
+    Returns:
+        Decorator
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACING_ENABLED:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def export_jsonl(path=None):
+    """
+    Export the most recent span records as JSON lines.
+
+    Args:
+        path: Optional file to append the records to
+
+    Returns:
+        str: The records, one JSON object per line
+    """
+    with _records_lock:
+        records = list(_records)
+    text = "".join(json.dumps(record) + "\n" for record in records)
+    if path:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(text)
+    return text
@@ -1,12 +1,47 @@
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import networkx as nx
-import plotly.graph_objects as go
-import plotly.express as px
-from wordcloud import WordCloud
 import datetime
+import threading
 
+# Plotting libraries (pandas, plotly, matplotlib, networkx, wordcloud) are
+# imported inside the chart functions that need them, so pages that never
+# draw a chart do not pay for them at startup.
+from utils.resources import BAND_COLORS, query_resources, resource_frame
+from utils.tracing import traced
+from utils.wbs_diff import diff_wbs
+
+# Matplotlib figures reused across renders, one per chart and thread
+_figure_pool = threading.local()
+
+def _pooled_figure(name, figsize):
+    """
+    Return a cleared Matplotlib figure reserved for one chart on the current thread.
+    
+    Figures are created without pyplot, so they are never registered in its
+    global figure manager. Each chart reuses its figure on every render, which
+    keeps memory flat in a long-running server; the returned figure is only
+    valid until the same chart is rendered again on the same thread.
+    
+    Args:
+        name: Chart name used as the pool key
+        figsize: Figure size in inches
+        
+    Returns:
+        Matplotlib figure (pooled; reused by the next call on this thread)
+    """
+    from matplotlib.figure import Figure
+    
+    figures = getattr(_figure_pool, "figures", None)
+    if figures is None:
+        figures = _figure_pool.figures = {}
+    
+    fig = figures.get(name)
+    if fig is None:
+        fig = figures[name] = Figure(figsize=figsize)
+    else:
+        fig.clear()
+        fig.set_size_inches(figsize)
+    return fig
+
+@traced("chart.gantt")
 def create_gantt_chart(wbs_data):
     """
     Create a Gantt chart for WBS tasks using Plotly.
@@ -17,6 +52,9 @@ def create_gantt_chart(wbs_data):
     Returns:
         Plotly figure object
     """
+    import pandas as pd
+    import plotly.express as px
+    
     # Calculate the duration of tasks in days
     tasks = []
     for task in wbs_data:
@@ -104,31 +142,29 @@ def create_gantt_chart(wbs_data):
     
     return fig
 
-def create_resource_allocation_chart(resource_data):
+@traced("chart.resource_allocation")
+def create_resource_allocation_chart(resource_data, max_rows=50):
     """
     Create a resource allocation chart using Plotly.
     
     Args:
-        resource_data: List of resource dictionaries
+        resource_data: List of resource dictionaries, or a (filtered, paged)
+            DataFrame from utils.resources.resource_frame
+        max_rows: Maximum number of resources to plot; larger inputs are
+            truncated after sorting, so callers should page instead
         
     Returns:
         Plotly figure object
     """
-    # Prepare data
-    resources = []
-    for resource in resource_data:
-        resources.append({
-            "Name": resource["name"],
-            "Role": resource["role"],
-            "Availability": resource["availability"],
-            "Allocated": resource["allocated"],
-            "Utilization": resource["allocated"] / resource["availability"] * 100
-        })
+    import pandas as pd
+    import plotly.graph_objects as go
     
-    df = pd.DataFrame(resources)
-    
-    # Sort by utilization (highest first)
-    df = df.sort_values(by="Utilization", ascending=False)
+    # Prepare data
+    if isinstance(resource_data, pd.DataFrame):
+        df = resource_data
+    else:
+        df = query_resources(resource_frame(resource_data))
+    df = df.head(max_rows)
     
     # Create horizontal bar chart
     fig = go.Figure()
@@ -151,24 +187,17 @@ def create_resource_allocation_chart(resource_data):
         marker=dict(color='rgba(204, 204, 204, 0.5)')
     ))
     
-    # Add utilization percentage as text
-    for i, row in enumerate(df.itertuples()):
-        # Color based on utilization
-        if row.Utilization > 100:
-            color = "red"  # Over-allocated
-        elif row.Utilization > 90:
-            color = "orange"  # Near capacity
-        else:
-            color = "green"  # Good allocation
-            
-        fig.add_annotation(
-            x=row.Allocated + 5,
-            y=i,
-            text=f"{row.Utilization:.0f}%",
-            showarrow=False,
-            font=dict(color=color, size=12),
-            xanchor="left"
-        )
+    # Add utilization percentage as a single text trace, colored by band
+    fig.add_trace(go.Scatter(
+        y=df["Name"],
+        x=df["Allocated"] + 5,
+        mode="text",
+        text=df["Utilization"].round().astype(int).astype(str) + "%",
+        textposition="middle right",
+        textfont=dict(color=df["Band"].map(BAND_COLORS).tolist(), size=12),
+        hoverinfo="skip",
+        showlegend=False
+    ))
     
     # Customize layout
     fig.update_layout(
@@ -176,7 +205,8 @@ def create_resource_allocation_chart(resource_data):
         xaxis_title="Hours",
         yaxis_title="Resource",
         barmode='overlay',
-        height=max(400, len(df) * 40),  # Adjust height based on number of resources
+        height=max(400, len(df) * 40),  # Bounded by max_rows
+        yaxis=dict(autorange="reversed"),  # Keep the sort order top-down
         legend=dict(
             orientation="h",
             yanchor="bottom",
@@ -188,6 +218,7 @@ def create_resource_allocation_chart(resource_data):
     
     return fig
 
+@traced("chart.raid_compliance")
 def create_raid_compliance_chart(raid_data):
     """
     Create RAID compliance visualization using Plotly.
@@ -198,6 +229,8 @@ def create_raid_compliance_chart(raid_data):
     Returns:
         Plotly figure object
     """
+    import plotly.graph_objects as go
+    
     # Calculate compliance metrics
     metrics = {
         "Risks": len([r for r in raid_data["risks"] if r["mitigation"] and r["owner"]]) / max(1, len(raid_data["risks"])) * 100,
@@ -240,6 +273,7 @@ def create_raid_compliance_chart(raid_data):
     
     return fig
 
+@traced("chart.decision_status")
 def create_decision_status_chart(decisions):
     """
     Create a decision status visualization using Plotly.
@@ -250,6 +284,8 @@ def create_decision_status_chart(decisions):
     Returns:
         Plotly figure object
     """
+    import plotly.graph_objects as go
+    
     # Count decisions by status
     status_counts = {}
     for decision in decisions:
@@ -296,6 +332,7 @@ def create_decision_status_chart(decisions):
     
     return fig
 
+@traced("chart.sentiment_gauge")
 def create_sentiment_gauge(sentiment_score):
     """
     Create a sentiment gauge chart using Plotly.
@@ -306,6 +343,8 @@ def create_sentiment_gauge(sentiment_score):
     Returns:
         Plotly figure object
     """
+    import plotly.graph_objects as go
+    
     # Map sentiment score from -1:1 to 0:100 for gauge
     gauge_value = (sentiment_score + 1) / 2 * 100
     
@@ -353,6 +392,7 @@ def create_sentiment_gauge(sentiment_score):
     
     return fig
 
+@traced("chart.wordcloud")
 def create_wordcloud(feedback_text):
     """
     Create a wordcloud from feedback text.
@@ -361,8 +401,10 @@ def create_wordcloud(feedback_text):
         feedback_text: List of feedback text entries
         
     Returns:
-        Matplotlib figure
+        Matplotlib figure (pooled; reused by the next call on this thread)
     """
+    from wordcloud import WordCloud
+    
     # Combine all feedback text
     if isinstance(feedback_text, list):
         text = " ".join([fb.get("content", "") if isinstance(fb, dict) else fb for fb in feedback_text])
@@ -381,13 +423,15 @@ def create_wordcloud(feedback_text):
     ).generate(text)
     
     # Create figure
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = _pooled_figure("wordcloud", (10, 6))
+    ax = fig.subplots()
     ax.imshow(wordcloud, interpolation='bilinear')
     ax.axis("off")
-    plt.tight_layout()
+    fig.tight_layout()
     
     return fig
 
+@traced("chart.critical_path")
 def create_critical_path_network(wbs_data):
     """
     Create a network diagram of the critical path using NetworkX and Matplotlib.
@@ -396,8 +440,11 @@ def create_critical_path_network(wbs_data):
         wbs_data: List of WBS task dictionaries
         
     Returns:
-        Matplotlib figure
+        Matplotlib figure (pooled; reused by the next call on this thread)
     """
+    import networkx as nx
+    from matplotlib.lines import Line2D
+    
     # Create directed graph
     G = nx.DiGraph()
     
@@ -416,7 +463,8 @@ def create_critical_path_network(wbs_data):
             G.add_edge(dep, task["id"])
     
     # Create figure
-    fig, ax = plt.subplots(figsize=(12, 8))
+    fig = _pooled_figure("critical_path", (12, 8))
+    ax = fig.subplots()
     
     # Position nodes using a hierarchical layout algorithm
     pos = nx.spring_layout(G, seed=42)  # Use spring layout instead of graphviz-dependent layouts
@@ -434,24 +482,25 @@ def create_critical_path_network(wbs_data):
             node_colors.append((0.4 * (1 - progress), 0.4 * (1 - progress), 1.0))
     
     # Draw nodes and edges
-    nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=800, alpha=0.8)
-    nx.draw_networkx_edges(G, pos, width=1.5, alpha=0.7, edge_color='gray', arrows=True, arrowsize=15)
+    nx.draw_networkx_nodes(G, pos, ax=ax, node_color=node_colors, node_size=800, alpha=0.8)
+    nx.draw_networkx_edges(G, pos, ax=ax, width=1.5, alpha=0.7, edge_color='gray', arrows=True, arrowsize=15)
     
     # Draw node labels
-    nx.draw_networkx_labels(G, pos, labels=nx.get_node_attributes(G, 'label'), font_size=10)
+    nx.draw_networkx_labels(G, pos, ax=ax, labels=nx.get_node_attributes(G, 'label'), font_size=10)
     
     # Add legend
-    critical_patch = plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='red', markersize=10, label='Critical Path')
-    normal_patch = plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='blue', markersize=10, label='Normal Task')
+    critical_patch = Line2D([0], [0], marker='o', color='w', markerfacecolor='red', markersize=10, label='Critical Path')
+    normal_patch = Line2D([0], [0], marker='o', color='w', markerfacecolor='blue', markersize=10, label='Normal Task')
     ax.legend(handles=[critical_patch, normal_patch], loc='upper right')
     
     # Add title and remove axis
-    plt.title("Project Critical Path Network")
-    plt.axis('off')
-    plt.tight_layout()
+    ax.set_title("Project Critical Path Network")
+    ax.axis('off')
+    fig.tight_layout()
     
     return fig
 
+@traced("chart.scope_creep")
 def create_scope_creep_chart(baseline_wbs, current_wbs):
     """
     Create a visualization comparing baseline WBS to current WBS to show scope creep.
@@ -463,31 +512,18 @@ def create_scope_creep_chart(baseline_wbs, current_wbs):
     Returns:
         Plotly figure object
     """
-    # Calculate scope changes
-    baseline_ids = set(task["id"] for task in baseline_wbs)
-    current_ids = set(task["id"] for task in current_wbs)
-    
-    added_tasks = current_ids - baseline_ids
-    removed_tasks = baseline_ids - current_ids
-    common_tasks = baseline_ids.intersection(current_ids)
-    
-    # Get the tasks that have changed (same ID but different duration or description)
-    modified_tasks = []
-    for task_id in common_tasks:
-        baseline_task = next(task for task in baseline_wbs if task["id"] == task_id)
-        current_task = next(task for task in current_wbs if task["id"] == task_id)
-        
-        if (baseline_task["duration"] != current_task["duration"] or
-            baseline_task["description"] != current_task["description"]):
-            modified_tasks.append(task_id)
+    import plotly.graph_objects as go
+    
+    # Calculate field-level scope changes in a single indexed pass
+    wbs_diff = diff_wbs(baseline_wbs, current_wbs)
     
     # Prepare data for visualization
     categories = ["Added", "Modified", "Removed", "Unchanged"]
     values = [
-        len(added_tasks),
-        len(modified_tasks),
-        len(removed_tasks),
-        len(common_tasks) - len(modified_tasks)
+        len(wbs_diff["added"]),
+        len(wbs_diff["modified"]),
+        len(wbs_diff["removed"]),
+        len(wbs_diff["unchanged"])
     ]
     
     colors = ["#4CAF50", "#FFC107", "#F44336", "#2196F3"]
@@ -513,11 +549,11 @@ def create_scope_creep_chart(baseline_wbs, current_wbs):
     )
     
     # Add a second visualization for task duration comparison
-    baseline_duration = sum(task["duration"] for task in baseline_wbs)
-    current_duration = sum(task["duration"] for task in current_wbs)
+    baseline_duration = wbs_diff["baseline_duration"]
+    current_duration = wbs_diff["current_duration"]
     
     # Create a second plot if there's a difference in total duration
-    if baseline_duration != current_duration:
+    if baseline_duration and baseline_duration != current_duration:
         duration_change = ((current_duration - baseline_duration) / baseline_duration) * 100
         
         # Add an annotation about duration change
@@ -529,4 +565,4 @@ def create_scope_creep_chart(baseline_wbs, current_wbs):
             font=dict(size=14, color="red" if duration_change > 0 else "green")
         )
     
-    return fig
\ No newline at end of file
+    return fig
@@ -0,0 +1,183 @@
+"""
+Process warm-up: builds the shared read-only caches before users need them.
+
+Streamlit runs no application code before the first script run, so the app
+calls start_warmup() when it is first imported; the steps then run once per
+process in a background thread while the first page renders. Each step fills
+a process-wide cache that sessions would otherwise build on their first
+request: the heavy chart libraries, the knowledge index, the shared
+project store and its projects' metrics, milestone and resource frames and
+prompt context, the project search index, the analytics worker's first
+results, a first Plotly figure and the pre-rendered status pack charts.
+warmup_status() reports readiness for the sidebar and the performance panel.
+
+    python -m utils.warmup
+
+runs the steps in the foreground and prints their timings.
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Set APP_WARMUP=0 to skip the warm-up (e.g. in short-lived test processes)
+WARMUP_ENABLED = os.environ.get("APP_WARMUP", "1") != "0"
+
+# Longest wait for the background chart renders before the warm-up reports ready
+WARMUP_RENDER_TIMEOUT = float(os.environ.get("WARMUP_RENDER_TIMEOUT", 60))
+
+def _import_libraries():
+    import matplotlib.figure  # noqa: F401
+    import pandas  # noqa: F401
+    import plotly.graph_objects  # noqa: F401
+
+def _knowledge_index():
+    from utils.knowledge_index import get_knowledge_index
+
+    get_knowledge_index()
+
+def _shared_projects():
+    from utils.project_store import get_project_store
+
+    return list(get_project_store().snapshot().projects.values())
+
+def _portfolio():
+    from utils.context_builder import build_project_context
+    from utils.metrics import get_dashboard_metrics
+    from utils.milestones import get_milestone_frame
+    from utils.resources import get_resource_frame
+
+    # Sessions read the same shared projects, so they hit the caches filled here
+    for project in _shared_projects():
+        get_dashboard_metrics(project)
+        get_milestone_frame(project)
+        get_resource_frame(project)
+        build_project_context(project)
+
+def _search_index():
+    from utils.project_search import get_project_search
+
+    get_project_search()
+
+def _analytics():
+    from utils.analytics import get_analytics_worker
+
+    # Starting the worker schedules the analytics of every shared project
+    worker = get_analytics_worker()
+    futures = [worker.submit(project) for project in _shared_projects()]
+    for future in futures:
+        if future is not None:
+            future.result()
+
+def _figures():
+    from utils.render_cache import prerender_project
+    from utils.visualization import create_resource_allocation_chart
+
+    projects = _shared_projects()
+    # The first Plotly figure of a process is several times slower than the next
+    create_resource_allocation_chart(projects[0].get("resources", []))
+    futures = [future for project in projects for future in prerender_project(project).values()]
+    deadline = time.monotonic() + WARMUP_RENDER_TIMEOUT
+    for future in futures:
+        future.result(timeout=max(0.0, deadline - time.monotonic()))
+
+# Warm-up steps in order: (name, function)
+WARMUP_STEPS = [
+    ("libraries", _import_libraries),
+    ("knowledge_index", _knowledge_index),
+    ("portfolio", _portfolio),
+    ("search_index", _search_index),
+    ("analytics", _analytics),
+    ("figures", _figures),
+]
+
+class Warmup:
+    """Progress of the warm-up steps."""
+
+    def __init__(self, steps=WARMUP_STEPS):
+        self.steps = steps
+        self._lock = threading.Lock()
+        self._status = {name: {"step": name, "status": "pending", "ms": None, "error": None} for name, _ in steps}
+        self.started = None
+        self.finished = None
+        self.ready = threading.Event()
+
+    def run(self):
+        """Run every step; a failing step is recorded and does not stop the others."""
+        self.started = time.time()
+        for name, function in self.steps:
+            with self._lock:
+                self._status[name]["status"] = "running"
+            start = time.perf_counter()
+            try:
+                function()
+                status, error = "done", None
+            except Exception as e:
+                logger.warning("Warm-up step %s failed: %s", name, e)
+                status, error = "failed", str(e)
+            with self._lock:
+                self._status[name].update(status=status, ms=(time.perf_counter() - start) * 1000, error=error)
+        self.finished = time.time()
+        self.ready.set()
+        logger.info("Warm-up finished in %.1f s", self.finished - self.started)
+
+    def status(self):
+        """
+        Report the warm-up progress.
+
+        Returns:
+            dict: ready, elapsed_s and steps (dicts with step, status, ms and error)
+        """
+        with self._lock:
+            steps = [dict(self._status[name]) for name, _ in self.steps]
+        end = self.finished or time.time()
+        return {
+            "ready": self.ready.is_set(),
+            "elapsed_s": end - self.started if self.started else 0.0,
+            "steps": steps
+        }
+
+_warmup = None
+_warmup_lock = threading.Lock()
+
+def start_warmup():
+    """
+    Start the warm-up in a background thread, once per process.
+
+    Returns:
+        Warmup or None: The warm-up, or None when APP_WARMUP=0
+    """
+    global _warmup
+    if not WARMUP_ENABLED:
+        return None
+    with _warmup_lock:
+        if _warmup is None:
+            _warmup = Warmup()
+            threading.Thread(target=_warmup.run, name="warmup", daemon=True).start()
+        return _warmup
+
+def warmup_status():
+    """Return the warm-up progress (see Warmup.status), or None when it has not started."""
+    return _warmup.status() if _warmup is not None else None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the warm-up steps and print their timings.")
+    parser.parse_args(argv)
+
+    warmup = Warmup()
+    warmup.run()
+    report = warmup.status()
+    for step in report["steps"]:
+        line = f"{step['step']:<16} {step['status']:<7} {step['ms']:>9.1f} ms"
+        if step["error"]:
+            line += f"  {step['error']}"
+        print(line)
+    print(f"{'total':<16} {'':<7} {report['elapsed_s'] * 1000:>9.1f} ms")
+    return 1 if any(step["status"] == "failed" for step in report["steps"]) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
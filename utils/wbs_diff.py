@@ -0,0 +1,101 @@
+# WBS fields compared between baseline and current versions of a task
+DIFF_FIELDS = [
+    "task",
+    "description",
+    "start_date",
+    "end_date",
+    "duration",
+    "assigned_to",
+    "dependencies",
+    "progress",
+]
+
+def index_wbs(wbs_data):
+    """
+    Index WBS tasks by their ID.
+
+    Args:
+        wbs_data: List of WBS task dictionaries
+
+    Returns:
+        dict: Task ID -> task dictionary (later duplicates win)
+    """
+    return {task["id"]: task for task in wbs_data}
+
+def _field_changed(field, baseline_value, current_value):
+    """Compare a single WBS field, ignoring the order of dependency lists."""
+    if baseline_value == current_value:
+        return False
+    if field == "dependencies":
+        return set(baseline_value or []) != set(current_value or [])
+    return True
+
+def diff_wbs(baseline_wbs, current_wbs, fields=None):
+    """
+    Compare two versions of a WBS field by field.
+
+    Both versions are indexed by task ID once, so the comparison is linear
+    in the number of tasks.
+
+    Args:
+        baseline_wbs: Original WBS tasks
+        current_wbs: Current WBS tasks
+        fields: Optional list of fields to compare (defaults to DIFF_FIELDS)
+
+    Returns:
+        dict: Diff with the keys
+            - added: IDs of tasks only in the current WBS
+            - removed: IDs of tasks only in the baseline WBS
+            - modified: IDs of tasks with at least one changed field
+            - unchanged: IDs of tasks present and identical in both
+            - changes: List of change rows (id, task, field, baseline, current)
+            - baseline_duration / current_duration: Total task durations
+    """
+    fields = fields or DIFF_FIELDS
+    baseline_index = index_wbs(baseline_wbs)
+    current_index = index_wbs(current_wbs)
+
+    added = []
+    modified = []
+    unchanged = []
+    changes = []
+
+    for task_id, current_task in current_index.items():
+        baseline_task = baseline_index.get(task_id)
+        if baseline_task is None:
+            added.append(task_id)
+            continue
+        if baseline_task == current_task:
+            unchanged.append(task_id)
+            continue
+
+        task_changed = False
+        for field in fields:
+            baseline_value = baseline_task.get(field)
+            current_value = current_task.get(field)
+            if _field_changed(field, baseline_value, current_value):
+                task_changed = True
+                changes.append({
+                    "id": task_id,
+                    "task": current_task.get("task", ""),
+                    "field": field,
+                    "baseline": baseline_value,
+                    "current": current_value
+                })
+
+        if task_changed:
+            modified.append(task_id)
+        else:
+            unchanged.append(task_id)
+
+    removed = [task_id for task_id in baseline_index if task_id not in current_index]
+
+    return {
+        "added": added,
+        "removed": removed,
+        "modified": modified,
+        "unchanged": unchanged,
+        "changes": changes,
+        "baseline_duration": sum(task.get("duration", 0) for task in baseline_index.values()),
+        "current_duration": sum(task.get("duration", 0) for task in current_index.values())
+    }